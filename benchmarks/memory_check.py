@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import resource
+
+# Renders run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Allow "python benchmarks/memory_check.py" from the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_dataset import generate_dataset, STYLES
+
+DATASET_NAME = "synthetic"
+# Checkpoints per check; the first one is the warm-up that fills the bounded caches
+CHECKPOINTS = 10
+
+
+def max_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return usage / (1024 * 1024) if platform.system() == "Darwin" else usage / 1024
+
+
+def current_rss_mb():
+    """Resident memory right now (Linux); falls back to the peak elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return max_rss_mb()
+
+
+def check_flat(label, frame_keys, process_chunk, bound_mb):
+    """
+    Runs process_chunk over frame_keys in CHECKPOINTS chunks and measures resident memory after
+    each. The first chunk is the warm-up; returns the largest growth over the warm-up level
+    seen afterwards, which must stay within bound_mb.
+    """
+    chunk_size = max(1, -(-len(frame_keys) // CHECKPOINTS))
+    print(f"\n {label}: {len(frame_keys):,} frames, bound {bound_mb:.0f} MB after warm-up")
+    warmup = None
+    growth = 0.0
+    start = time.perf_counter()
+    for done in range(0, len(frame_keys), chunk_size):
+        process_chunk(frame_keys[done:done + chunk_size])
+        rss = current_rss_mb()
+        if warmup is None:
+            warmup = rss
+        growth = max(growth, rss - warmup)
+        print(f"   {min(done + chunk_size, len(frame_keys)):>8,} frames: {rss:.1f} MB resident "
+              f"({time.perf_counter() - start:.0f}s)")
+    print(f"   growth after warm-up: {growth:.1f} MB")
+    return growth
+
+
+def check_view(frame_keys, bound_mb):
+    """Renders every frame through AppState, as a long viewing session in the GUI does."""
+    from utils.state import AppState
+    from utils.lru import memory_summary
+
+    state = AppState(initial_dataset=DATASET_NAME)
+
+    def view(chunk):
+        for frame_key in chunk:
+            state.render_frame(frame_key)
+
+    growth = check_flat("View", frame_keys, view, bound_mb)
+    for name, stats in memory_summary().items():
+        print(f"   cache {name}: {stats['items']:,} items, {stats['bytes'] / 2**20:.1f} MB, {stats['evictions']:,} evictions")
+    return growth
+
+
+def check_export(frame_keys, bound_mb, workers):
+    """Exports every frame with extract_anns.export_frames, as extract_anns.py does for a selection."""
+    import extract_anns
+    from datasets.panoptic_dataset import PanopticDataset
+
+    with open("config.json", "r") as f:
+        dataset_config = json.load(f)["datasets"][DATASET_NAME]
+    dataset = PanopticDataset(name=DATASET_NAME, **dataset_config)
+    dataset.load()
+    export_dir = os.path.join("exports", DATASET_NAME)
+    os.makedirs(export_dir, exist_ok=True)
+
+    def export(chunk):
+        extract_anns.export_frames(dataset, chunk, export_dir, workers, progress=False)
+        # The exported files are not what is measured; keep the disk usage bounded too
+        shutil.rmtree(export_dir, ignore_errors=True)
+        os.makedirs(export_dir, exist_ok=True)
+
+    return check_flat(f"Export ({workers} workers)" if workers else "Export", frame_keys, export, bound_mb)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that resident memory stays bounded while viewing and exporting a large synthetic dataset. "
+                    "Exits with code 1 if it grows by more than --bound-mb after warm-up."
+    )
+    parser.add_argument("--style", choices=STYLES, default="vipseg")
+    parser.add_argument("--frames", type=int, default=50000)
+    parser.add_argument("--videos", type=int, default=500)
+    # Small frames keep generation fast; the caches are bounded in bytes, so they still fill up
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=120)
+    parser.add_argument("--segments", type=int, default=12, help="Segments per frame.")
+    parser.add_argument("--bound-mb", type=float, default=64, help="Allowed resident memory growth after warm-up, per check.")
+    parser.add_argument("--workers", type=int, default=0, help="Render the export in this many worker processes.")
+    parser.add_argument("--only", choices=("view", "export"), help="Run only one of the checks.")
+    parser.add_argument("--data-dir", help="Generate the synthetic dataset here (and keep it) instead of in a temporary directory.")
+    args = parser.parse_args()
+
+    workdir = os.path.abspath(args.data_dir) if args.data_dir else tempfile.mkdtemp(prefix="annsel_memory_")
+    os.makedirs(workdir, exist_ok=True)
+    data_dir = os.path.join(workdir, "data")
+    print(f" Generating synthetic {args.style} dataset with {args.frames:,} frames in '{data_dir}'...")
+    dataset_config = generate_dataset(
+        data_dir, style=args.style, num_frames=args.frames, num_videos=args.videos,
+        width=args.width, height=args.height, segments_per_frame=args.segments,
+    )
+    # AppState and extract_anns.py read config.json and write relative to the working directory
+    with open(os.path.join(workdir, "config.json"), "w") as f:
+        json.dump({"datasets": {DATASET_NAME: dataset_config}}, f, indent=4)
+    os.chdir(workdir)
+
+    from datasets.panoptic_dataset import PanopticDataset
+    from utils.state import sort_frame_keys
+    dataset = PanopticDataset(name=DATASET_NAME, **dataset_config)
+    dataset.load()
+    sort_frame_keys(dataset.file_list, dataset.is_video_dataset)
+    frame_keys = list(dataset.file_list)
+    del dataset
+
+    failed = []
+    try:
+        if args.only in (None, "view") and check_view(frame_keys, args.bound_mb) > args.bound_mb:
+            failed.append("view")
+        if args.only in (None, "export") and check_export(frame_keys, args.bound_mb, args.workers) > args.bound_mb:
+            failed.append("export")
+    finally:
+        if not args.data_dir:
+            os.chdir(REPO_ROOT)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if failed:
+        sys.exit(f"\n Memory grew by more than {args.bound_mb:.0f} MB after warm-up: {', '.join(failed)}")
+    print(f"\n Memory stayed within {args.bound_mb:.0f} MB of the warm-up level.")
+
+
+if __name__ == "__main__":
+    main()
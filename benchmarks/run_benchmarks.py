@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+# Qt benchmarks run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Allow "python benchmarks/run_benchmarks.py" from the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_dataset import generate_dataset, STYLES
+from benchmarks.memory_check import max_rss_mb, check_view, check_export
+
+DATASET_NAME = "synthetic"
+
+
+class BenchmarkContext:
+    """Shared state for the benchmarks: the synthetic dataset, its config and a loaded copy."""
+
+    def __init__(self, workdir, dataset_config, args):
+        self.workdir = workdir
+        self.dataset_config = dataset_config
+        self.args = args
+        self._dataset = None
+        self._app = None
+
+    @property
+    def dataset(self):
+        """The synthetic dataset, loaded once and sorted like AppState does."""
+        if self._dataset is None:
+            from datasets.panoptic_dataset import PanopticDataset
+            from utils.state import sort_frame_keys
+            self._dataset = PanopticDataset(name=DATASET_NAME, **self.dataset_config)
+            self._dataset.load()
+            sort_frame_keys(self._dataset.file_list, self._dataset.is_video_dataset)
+        return self._dataset
+
+    def sample_keys(self, count, seed=0):
+        file_list = self.dataset.file_list
+        return random.Random(seed).sample(file_list, min(count, len(file_list)))
+
+    def qt_app(self):
+        if self._app is None:
+            from PyQt6.QtWidgets import QApplication
+            self._app = QApplication.instance() or QApplication([])
+        return self._app
+
+
+@contextmanager
+def suppressed_message_boxes():
+    """Modal message boxes would block an offscreen benchmark; answer them automatically."""
+    from PyQt6.QtWidgets import QMessageBox
+    originals = {name: getattr(QMessageBox, name) for name in ("information", "warning", "critical", "question")}
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Ok))
+    setattr(QMessageBox, "question", staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Yes))
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(QMessageBox, name, original)
+
+
+# Each benchmark takes the context and returns the callable to time.
+
+def bench_load(ctx):
+    from datasets.panoptic_dataset import PanopticDataset
+
+    def run():
+        PanopticDataset(name=DATASET_NAME, **ctx.dataset_config).load()
+    return run
+
+
+def bench_load_image(ctx):
+    keys = ctx.sample_keys(ctx.args.render_frames)
+    dataset = ctx.dataset
+
+    def run():
+        for frame_key in keys:
+            dataset.load_image(frame_key)
+    return run
+
+
+def bench_current_stats(ctx):
+    dataset = ctx.dataset
+    selected = set(dataset.file_list[::2])
+
+    def run():
+        dataset.get_current_stats(selected)
+    return run
+
+
+def bench_refresh_file_list(ctx):
+    ctx.qt_app()
+    from ui.annotation_selector import AnnotationSelector
+    with suppressed_message_boxes():
+        window = AnnotationSelector()
+    window.state.selected_files = set(window.state.dataset.file_list[::3])
+
+    def run():
+        with suppressed_message_boxes():
+            window.refresh_file_list()
+    return run
+
+
+def bench_export(ctx):
+    import extract_anns
+    from utils.selections import selection_file_path, write_selection_file
+
+    selection_file = selection_file_path(DATASET_NAME)
+    write_selection_file(selection_file, ctx.sample_keys(ctx.args.export_frames, seed=1))
+    config = {DATASET_NAME: ctx.dataset_config}
+
+    def run():
+        shutil.rmtree("exports", ignore_errors=True)
+        extract_anns.process_selection_file(selection_file, config)
+    return run
+
+
+BENCHMARKS = {
+    "load": bench_load,
+    "load_image": bench_load_image,
+    "get_current_stats": bench_current_stats,
+    "refresh_file_list": bench_refresh_file_list,
+    "export": bench_export,
+}
+
+
+def measure(run, repeats, with_memory):
+    """Returns (median seconds, best seconds, peak traced MB or None)."""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+
+    peak_mb = None
+    if with_memory:
+        # A separate run, since tracing slows Python code down considerably
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / (1024 * 1024)
+    return durations[len(durations) // 2], durations[0], peak_mb
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Prints the ratio to the baseline per benchmark. Returns the names of regressed benchmarks."""
+    regressions = []
+    print(f"\n Comparison with baseline (tolerance {tolerance:.0%}):")
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "seconds" not in result:
+            continue
+        ratio = result["seconds"] / previous["seconds"] if previous["seconds"] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  <-- slower"
+            regressions.append(name)
+        print(f"   {name:<20} {previous['seconds']:.4f}s -> {result['seconds']:.4f}s  ({ratio:.2f}x){flag}")
+
+        if result.get("peak_mb") is not None and previous.get("peak_mb"):
+            memory_ratio = result["peak_mb"] / previous["peak_mb"]
+            if memory_ratio > 1 + tolerance:
+                regressions.append(f"{name} (memory)")
+                print(f"   {'':<20} peak memory {previous['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB  <-- larger")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading, rendering, navigation, statistics and export on synthetic data.")
+    parser.add_argument("--style", choices=STYLES, default="coco")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--segments", type=int, default=20, help="Segments per frame.")
+    parser.add_argument("--render-frames", type=int, default=20, help="Frames rendered by the load_image benchmark.")
+    parser.add_argument("--export-frames", type=int, default=20, help="Frames exported by the export benchmark.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory runs.")
+    parser.add_argument("--data-dir", help="Generate the synthetic dataset here (and keep it) instead of in a temporary directory.")
+    parser.add_argument("--save-baseline", metavar="JSON", help="Write the results to this baseline file.")
+    parser.add_argument("--compare", metavar="JSON", help="Compare the results with this baseline file.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before a benchmark counts as regressed.")
+    parser.add_argument("--memory-check", action="store_true",
+                        help="Also view and export every frame (see benchmarks/memory_check.py) and fail if memory keeps growing.")
+    parser.add_argument("--memory-tolerance-mb", type=float, default=64,
+                        help="Allowed resident memory growth after warm-up for --memory-check.")
+    args = parser.parse_args()
+
+    # Resolve output paths before changing into the working directory
+    save_baseline = os.path.abspath(args.save_baseline) if args.save_baseline else None
+    compare = os.path.abspath(args.compare) if args.compare else None
+
+    workdir = os.path.abspath(args.data_dir) if args.data_dir else tempfile.mkdtemp(prefix="annsel_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    data_dir = os.path.join(workdir, "data")
+    params = {
+        "style": args.style, "num_frames": args.frames, "num_videos": args.videos,
+        "width": args.width, "height": args.height, "segments_per_frame": args.segments,
+    }
+
+    print(f" Generating synthetic {args.style} dataset with {args.frames} frames in '{data_dir}'...")
+    start = time.perf_counter()
+    dataset_config = generate_dataset(data_dir, **params)
+    print(f" Generated in {time.perf_counter() - start:.1f}s")
+
+    # AppState, the GUI and extract_anns.py read config.json and write relative to the working directory
+    with open(os.path.join(workdir, "config.json"), "w") as f:
+        json.dump({"datasets": {DATASET_NAME: dataset_config}}, f, indent=4)
+    os.chdir(workdir)
+
+    ctx = BenchmarkContext(workdir, dataset_config, args)
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"\n Running {name}...")
+        try:
+            run = bench(ctx)
+            rss_before = max_rss_mb()
+            seconds, best, peak_mb = measure(run, args.repeats, not args.no_memory)
+            results[name] = {
+                "seconds": seconds, "best_seconds": best, "peak_mb": peak_mb,
+                "max_rss_growth_mb": max(0.0, max_rss_mb() - rss_before),
+            }
+        except ImportError as e:
+            print(f" Skipping {name}: missing dependency ({e})")
+            results[name] = {"skipped": str(e)}
+
+    print("\n Results:")
+    print(f"   {'benchmark':<20} {'median':>10} {'best':>10} {'peak MB':>10}")
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"   {name:<20} {'skipped':>10}")
+            continue
+        peak = f"{result['peak_mb']:.1f}" if result["peak_mb"] is not None else "-"
+        print(f"   {name:<20} {result['seconds']:>9.4f}s {result['best_seconds']:>9.4f}s {peak:>10}")
+
+    report = {
+        "params": params,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if save_baseline:
+        with open(save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n Baseline written to '{save_baseline}'")
+
+    regressions = []
+    if compare:
+        with open(compare, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != params:
+            print(" Warning: the baseline was recorded with different dataset parameters.")
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+
+    if args.memory_check:
+        frame_keys = list(ctx.dataset.file_list)
+        if check_view(frame_keys, args.memory_tolerance_mb) > args.memory_tolerance_mb:
+            regressions.append("memory growth (view)")
+        if check_export(frame_keys, args.memory_tolerance_mb, workers=0) > args.memory_tolerance_mb:
+            regressions.append("memory growth (export)")
+
+    if not args.data_dir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if regressions:
+        print(f"\n Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import os
+import io
+import json
+import argparse
+import numpy as np
+from PIL import Image
+
+STYLES = ("coco", "vipseg")
+
+
+def id2rgb(id_map):
+    """Encodes panoptic segment ids as RGB, the inverse of panopticapi.utils.rgb2id."""
+    rgb = np.zeros(id_map.shape + (3,), dtype=np.uint8)
+    for channel in range(3):
+        rgb[..., channel] = id_map % 256
+        id_map = id_map // 256
+    return rgb
+
+
+def make_categories(num_categories):
+    """Alternating thing/stuff categories named class_<id>."""
+    return [
+        {"id": i + 1, "name": f"class_{i + 1}", "isthing": int(i % 2 == 0), "supercategory": "synthetic"}
+        for i in range(num_categories)
+    ]
+
+
+def make_frame_pattern(rng, width, height, segments_per_frame, unlabeled_fraction):
+    """
+    Builds one synthetic frame: a Voronoi partition into segments, some of them left
+    unlabeled (id 0). Returns (jpeg_bytes, png_bytes, [(segment_id, area, bbox), ...]).
+    """
+    num_cells = max(1, segments_per_frame)
+    seeds_x = rng.integers(0, width, num_cells)
+    seeds_y = rng.integers(0, height, num_cells)
+
+    # Nearest seed per pixel, one seed at a time to keep memory at O(width * height)
+    ys, xs = np.mgrid[0:height, 0:width]
+    best_distance = np.full((height, width), np.inf)
+    cell_map = np.zeros((height, width), dtype=np.int64)
+    for cell in range(num_cells):
+        distance = (xs - seeds_x[cell]) ** 2 + (ys - seeds_y[cell]) ** 2
+        closer = distance < best_distance
+        best_distance[closer] = distance[closer]
+        cell_map[closer] = cell
+
+    # Distinct non-zero 24-bit ids
+    segment_ids = np.unique(rng.integers(1, 2 ** 24, size=num_cells * 2))
+    while segment_ids.size < num_cells:
+        segment_ids = np.unique(np.concatenate([segment_ids, rng.integers(1, 2 ** 24, size=num_cells)]))
+    segment_ids = rng.permutation(segment_ids)[:num_cells]
+    labeled = rng.random(num_cells) >= unlabeled_fraction
+    labeled[0] = True  # Every frame has at least one segment
+    id_map = np.where(labeled[cell_map], segment_ids[cell_map], 0).astype(np.int64)
+
+    colors = rng.integers(0, 256, size=(num_cells, 3), dtype=np.uint8)
+    image = colors[cell_map]
+    image = np.clip(image.astype(np.int16) + rng.integers(-20, 20, image.shape), 0, 255).astype(np.uint8)
+
+    segments = []
+    for cell in np.flatnonzero(labeled):
+        cell_ys, cell_xs = np.nonzero(cell_map == cell)
+        if cell_ys.size == 0:
+            continue
+        x0, y0 = int(cell_xs.min()), int(cell_ys.min())
+        bbox = [x0, y0, int(cell_xs.max()) - x0 + 1, int(cell_ys.max()) - y0 + 1]
+        segments.append((int(segment_ids[cell]), int(cell_ys.size), bbox))
+
+    jpeg = io.BytesIO()
+    Image.fromarray(image).save(jpeg, format="JPEG", quality=90)
+    png = io.BytesIO()
+    Image.fromarray(id2rgb(id_map)).save(png, format="PNG")
+    return jpeg.getvalue(), png.getvalue(), segments
+
+
+def generate_dataset(output_dir, style="coco", num_frames=1000, num_videos=10,
+                     width=320, height=240, segments_per_frame=12, num_categories=40,
+                     unlabeled_fraction=0.1, pattern_pool=64, seed=0):
+    """
+    Writes a synthetic panoptic dataset (JPEG images, RGB-encoded PNG masks and annotation JSON)
+    in COCO panoptic ("coco") or VIPSeg ("vipseg", frames grouped into videos) layout.
+
+    Encoding every frame separately would dominate generation time, so pattern_pool distinct
+    image/mask pairs are encoded once and reused; every frame still gets its own category labels.
+
+    Returns the dataset config entry ({"image_dir", "mask_dir", "ann_file"}) for config.json.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown style '{style}'. Expected one of {STYLES}.")
+
+    rng = np.random.default_rng(seed)
+    image_dir = os.path.join(output_dir, "images")
+    mask_dir = os.path.join(output_dir, "panomasks")
+    ann_file = os.path.join(output_dir, "annotations.json")
+    os.makedirs(image_dir, exist_ok=True)
+    os.makedirs(mask_dir, exist_ok=True)
+
+    categories = make_categories(num_categories)
+    category_ids = np.array([c["id"] for c in categories])
+    patterns = [
+        make_frame_pattern(rng, width, height, segments_per_frame, unlabeled_fraction)
+        for _ in range(max(1, min(pattern_pool, num_frames)))
+    ]
+
+    def write_frame(frame_number, subdir):
+        jpeg, png, segments = patterns[frame_number % len(patterns)]
+        base_name = f"{frame_number:012d}" if style == "coco" else f"{frame_number:08d}"
+        for folder, data, ext in ((image_dir, jpeg, ".jpg"), (mask_dir, png, ".png")):
+            target_dir = os.path.join(folder, subdir) if subdir else folder
+            with open(os.path.join(target_dir, base_name + ext), "wb") as f:
+                f.write(data)
+
+        labels = rng.choice(category_ids, size=len(segments))
+        segments_info = [
+            {"id": seg_id, "category_id": int(cat_id), "area": area, "bbox": bbox, "iscrowd": 0}
+            for (seg_id, area, bbox), cat_id in zip(segments, labels)
+        ]
+        image_entry = {"id": frame_number, "file_name": base_name + ".jpg", "width": width, "height": height}
+        annotation = {"image_id": frame_number, "file_name": base_name + ".png", "segments_info": segments_info}
+        return image_entry, annotation
+
+    if style == "coco":
+        images, annotations = [], []
+        for frame_number in range(num_frames):
+            image_entry, annotation = write_frame(frame_number, None)
+            images.append(image_entry)
+            annotations.append(annotation)
+        data = {"images": images, "annotations": annotations, "categories": categories}
+    else:
+        num_videos = max(1, min(num_videos, num_frames))
+        videos, video_annotations = [], []
+        frames_per_video = np.array_split(np.arange(num_frames), num_videos)
+        for video_number, frame_numbers in enumerate(frames_per_video):
+            video_id = f"{video_number + 1}_synthetic"
+            os.makedirs(os.path.join(image_dir, video_id), exist_ok=True)
+            os.makedirs(os.path.join(mask_dir, video_id), exist_ok=True)
+            images, annotations = [], []
+            for frame_number in frame_numbers:
+                image_entry, annotation = write_frame(int(frame_number), video_id)
+                images.append(image_entry)
+                annotations.append(annotation)
+            videos.append({"video_id": video_id, "images": images})
+            video_annotations.append({"video_id": video_id, "annotations": annotations})
+        data = {"videos": videos, "annotations": video_annotations, "categories": categories}
+
+    with open(ann_file, "w") as f:
+        json.dump(data, f)
+
+    return {"image_dir": image_dir, "mask_dir": mask_dir, "ann_file": ann_file}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic panoptic segmentation dataset.")
+    parser.add_argument("output_dir", help="Directory to write images/, panomasks/ and annotations.json into.")
+    parser.add_argument("--style", choices=STYLES, default="coco", help="COCO panoptic (images) or VIPSeg (videos) layout.")
+    parser.add_argument("--frames", type=int, default=1000, help="Number of frames.")
+    parser.add_argument("--videos", type=int, default=10, help="Number of videos (vipseg style only).")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--segments", type=int, default=12, help="Segments per frame (segment density).")
+    parser.add_argument("--categories", type=int, default=40, help="Number of categories.")
+    parser.add_argument("--unlabeled", type=float, default=0.1, help="Fraction of segments left unlabeled (affects coverage).")
+    parser.add_argument("--pattern-pool", type=int, default=64, help="Number of distinct image/mask pairs to reuse.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--name", default=None, help="Also write a config.json in output_dir with this dataset name.")
+    args = parser.parse_args()
+
+    entry = generate_dataset(
+        args.output_dir, style=args.style, num_frames=args.frames, num_videos=args.videos,
+        width=args.width, height=args.height, segments_per_frame=args.segments,
+        num_categories=args.categories, unlabeled_fraction=args.unlabeled,
+        pattern_pool=args.pattern_pool, seed=args.seed
+    )
+    if args.name:
+        with open(os.path.join(args.output_dir, "config.json"), "w") as f:
+            json.dump({"datasets": {args.name: entry}}, f, indent=4)
+    print(f" Wrote {args.frames} synthetic {args.style} frames to '{args.output_dir}'")
+    print(json.dumps(entry, indent=4))
+
+
+if __name__ == "__main__":
+    main()
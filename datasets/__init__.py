@@ -1,5 +1,22 @@
-from .base_dataset import BaseDataset
-from .panoptic_dataset import PanopticDataset
+# The dataset classes are imported lazily so that tools which only need the lightweight
+# modules (e.g. datasets.storage in pack_shards.py) do not pull in detectron2/torch/PyQt6.
+__all__ = ["BaseDataset", "LoadCancelled", "PanopticDataset", "FrameIndex", "VideoIndex", "DatasetSummary"]
 
-__all__ = ["BaseDataset", "PanopticDataset"]
 
+def __getattr__(name):
+    if name in ("BaseDataset", "LoadCancelled"):
+        from . import base_dataset
+        return getattr(base_dataset, name)
+    if name == "PanopticDataset":
+        from .panoptic_dataset import PanopticDataset
+        return PanopticDataset
+    if name == "FrameIndex":
+        from .frame_index import FrameIndex
+        return FrameIndex
+    if name == "VideoIndex":
+        from .video_index import VideoIndex
+        return VideoIndex
+    if name == "DatasetSummary":
+        from .dataset_summary import DatasetSummary
+        return DatasetSummary
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
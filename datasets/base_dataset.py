@@ -1,12 +1,26 @@
+import sys
 from abc import ABC, abstractmethod
 from typing import List, Dict
 from collections import Counter
 from PyQt6.QtGui import QImage
+from datasets.frame_index import FrameIndex
+from datasets.redundancy import RedundancyIndex, compute_dhashes
+from datasets.video_index import VideoIndex
+
+
+class LoadCancelled(Exception):
+    """Raised by load() when the caller asked to stop. The dataset is left empty."""
 
 
 class BaseDataset(ABC):
     def __init__(self, name: str):
         self.name = name
+        self.reset()
+
+    def reset(self):
+        """Clears all loaded metadata so that load() starts from scratch."""
+        # Signature of the source files at the time of the last successful load (None if not loaded)
+        self.loaded_signature = None
         self.file_list: List[str] = []
         self.images: Dict[str, QImage] = {}
         self.masks: Dict[str, QImage] = {}
@@ -21,14 +35,99 @@ class BaseDataset(ABC):
         self.goal_mask_counts = []
         self.goal_unique_labels = []
 
+        self._frame_index = None
+        self._redundancy_index = None
+        self._image_hashes = None
+        self._video_index = None
+
     @abstractmethod
-    def load(self):
+    def load(self, progress_callback=None, should_cancel=None):
         pass
 
     @abstractmethod
     def get_goal_stats(self):
         pass
 
+    def source_signature(self):
+        """Identifies the on-disk state the dataset is loaded from. Subclasses override this."""
+        return None
+
+    def is_loaded(self) -> bool:
+        return self.loaded_signature is not None
+
+    def is_stale(self) -> bool:
+        """True if the dataset was loaded but its source files changed since."""
+        return self.is_loaded() and self.source_signature() != self.loaded_signature
+
+    def estimate_memory_bytes(self, sample_size: int = 256) -> int:
+        """
+        Rough estimate of the memory held by the loaded metadata, extrapolated from
+        the deep size of a sample of frames.
+        """
+        if not self.file_list:
+            return 0
+
+        def deep_size(obj):
+            size = sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                size += sum(deep_size(k) + deep_size(v) for k, v in obj.items())
+            elif isinstance(obj, (list, tuple, set)):
+                size += sum(deep_size(v) for v in obj)
+            return size
+
+        step = max(1, len(self.file_list) // sample_size)
+        sample = self.file_list[::step]
+        per_frame = sum(
+            deep_size(k) * 5  # key stored in file_list and four dictionaries
+            + deep_size(self.labels.get(k, []))
+            + deep_size(self.areas.get(k, {}))
+            + deep_size(self.segments_info.get(k, []))
+            + 64  # coverage float and dictionary slots
+            for k in sample
+        ) / len(sample)
+        return int(per_frame * len(self.file_list))
+
+    def get_frame_index(self) -> FrameIndex:
+        """Returns the columnar FrameIndex for the current file_list, building it on first use."""
+        if self._frame_index is None or self._frame_index.num_frames != len(self.file_list):
+            self._frame_index = FrameIndex(self)
+        return self._frame_index
+
+    def invalidate_frame_index(self):
+        """Must be called whenever file_list or the per-frame metadata changes."""
+        self._frame_index = None
+        self._redundancy_index = None
+        self._image_hashes = None
+        self._video_index = None
+
+    def get_video_index(self) -> VideoIndex:
+        """Returns the per-video aggregates of the current file_list, building them on first use."""
+        index = self.get_frame_index()
+        if self._video_index is None or self._video_index.index is not index:
+            self._video_index = VideoIndex(index)
+        return self._video_index
+
+    def get_redundancy_index(self, area_threshold=0.1, image_hash=False, hash_threshold=6, max_run_length=None) -> RedundancyIndex:
+        """
+        Returns the near-duplicate runs of the current file_list, building them on first use
+        or when the options change. Image hashes are computed once and kept with the index.
+        """
+        index = self.get_frame_index()
+        options = (area_threshold, image_hash, hash_threshold, max_run_length)
+        cached = self._redundancy_index
+        if cached is not None and cached[0] == options and cached[1].index is index:
+            return cached[1]
+
+        hashes = None
+        if image_hash and getattr(self, "is_video_dataset", False):
+            if self._image_hashes is None or self._image_hashes[0] is not index:
+                self._image_hashes = (index, compute_dhashes(self, index.frame_keys))
+            hashes = self._image_hashes[1]
+
+        redundancy = RedundancyIndex(index, area_threshold, hashes, hash_threshold, max_run_length)
+        self._redundancy_index = (options, redundancy)
+        return redundancy
+
     def get_current_stats(self, selected_files: List[str]):
         label_counter = Counter()
         area_counter = Counter()
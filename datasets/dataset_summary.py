@@ -0,0 +1,102 @@
+import numpy as np
+
+
+def category_key(name):
+    """Categories of different datasets are the same if their names match up to case and surrounding spaces."""
+    return name.strip().lower()
+
+
+class DatasetSummary:
+    """
+    The statistics-relevant part of a dataset's FrameIndex (frame keys, per-category segment
+    counts and areas, coverages) together with the category names, small enough to be kept
+    in the metadata cache. Lets a selection of a dataset be compared with the whole dataset
+    (as in StatsDialog) without loading the dataset.
+    """
+
+    def __init__(self, dataset):
+        index = dataset.get_frame_index()
+        self.name = dataset.name
+        self.frame_keys = index.frame_keys
+        self.category_names = [
+            dataset.categories[cat_id]["name"] if cat_id in dataset.categories else str(cat_id)
+            for cat_id in index.category_ids.tolist()
+        ]
+        self.entry_frame = index.entry_frame.astype(np.int32)
+        self.entry_cat = index.entry_cat.astype(np.int32)
+        self.entry_count = index.entry_count.astype(np.float32)
+        self.entry_area = index.entry_area.astype(np.float32)
+        self.coverages = index.coverages.astype(np.float32)
+        self.mask_counts = index.mask_counts.astype(np.int32)
+
+    @property
+    def num_frames(self):
+        return len(self.frame_keys)
+
+    def compare(self, selected_keys):
+        """SelectionComparison of the frames in selected_keys with all frames. Unknown keys are counted, not used."""
+        key_to_row = {frame_key: i for i, frame_key in enumerate(self.frame_keys)}
+        rows = np.fromiter((key_to_row[k] for k in selected_keys if k in key_to_row), dtype=np.int64)
+        mask = np.zeros(self.num_frames, dtype=bool)
+        mask[rows] = True
+        return SelectionComparison(self, mask, len(selected_keys) - rows.size)
+
+
+class SelectionComparison:
+    """Per-category segment counts and areas of a selection and of the whole dataset, plus per-frame averages."""
+
+    def __init__(self, summary: DatasetSummary, mask, unknown_keys=0):
+        self.name = summary.name
+        self.category_names = summary.category_names
+        self.num_frames = summary.num_frames
+        self.num_selected = int(mask.sum())
+        self.unknown_keys = unknown_keys
+
+        num_categories = len(summary.category_names)
+        selected_entries = mask[summary.entry_frame]
+        self.full_counts = np.bincount(summary.entry_cat, weights=summary.entry_count, minlength=num_categories)
+        self.full_areas = np.bincount(summary.entry_cat, weights=summary.entry_area, minlength=num_categories)
+        self.selected_counts = np.bincount(summary.entry_cat[selected_entries], weights=summary.entry_count[selected_entries],
+                                           minlength=num_categories)
+        self.selected_areas = np.bincount(summary.entry_cat[selected_entries], weights=summary.entry_area[selected_entries],
+                                          minlength=num_categories)
+
+        self.mean_coverage = float(summary.coverages.mean()) if self.num_frames else 0.0
+        self.selected_mean_coverage = float(summary.coverages[mask].mean()) if self.num_selected else 0.0
+        self.mean_masks = float(summary.mask_counts.mean()) if self.num_frames else 0.0
+        self.selected_mean_masks = float(summary.mask_counts[mask].mean()) if self.num_selected else 0.0
+
+    def values(self, metric="count"):
+        """(full, selected) per-category totals of "count" (segments) or "area"."""
+        if metric == "count":
+            return self.full_counts, self.selected_counts
+        return self.full_areas, self.selected_areas
+
+
+def align_categories(comparisons, metric="count"):
+    """
+    Lines up the categories of several SelectionComparisons by name (see category_key).
+    Returns (names, full, selected): the display names (first spelling seen) and two
+    (categories x comparisons) arrays of totals, zero where a dataset lacks the category.
+    """
+    column_of = {}
+    names = []
+    positions = []
+    for comparison in comparisons:
+        columns = []
+        for name in comparison.category_names:
+            key = category_key(name)
+            if key not in column_of:
+                column_of[key] = len(names)
+                names.append(name)
+            columns.append(column_of[key])
+        positions.append(np.asarray(columns, dtype=np.int64))
+
+    full = np.zeros((len(names), len(comparisons)), dtype=np.float64)
+    selected = np.zeros((len(names), len(comparisons)), dtype=np.float64)
+    for i, (comparison, columns) in enumerate(zip(comparisons, positions)):
+        full_values, selected_values = comparison.values(metric)
+        # A dataset may list the same name under several ids, so accumulate
+        np.add.at(full[:, i], columns, full_values)
+        np.add.at(selected[:, i], columns, selected_values)
+    return names, full, selected
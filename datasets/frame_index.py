@@ -0,0 +1,138 @@
+from itertools import chain
+import numpy as np
+
+
+class FrameIndex:
+    """
+    Columnar (numpy) view of a loaded dataset's per-frame metadata.
+
+    Row i describes dataset.file_list[i]. Per-category statistics are stored as sparse
+    (frame, category) entries so that rules and statistics can be evaluated over
+    millions of frames without Python loops:
+
+        entry_frame[j], entry_cat[j]  -> row and category column of entry j
+        entry_count[j]                -> number of segments of that category in the frame
+        entry_area[j]                 -> area of that category in the frame (as in dataset.areas)
+
+    Counts and areas follow the same definitions as get_goal_stats/get_current_stats.
+    """
+
+    def __init__(self, dataset):
+        file_list = dataset.file_list
+        self.frame_keys = list(file_list)
+        self.num_frames = len(file_list)
+        self.key_to_row = {frame_key: i for i, frame_key in enumerate(file_list)}
+
+        self.category_ids = np.asarray(dataset.all_labels, dtype=np.int64)
+        self.num_categories = len(self.category_ids)
+
+        self.coverages = np.fromiter(
+            (dataset.coverages.get(k, 0.0) for k in file_list), dtype=np.float64, count=self.num_frames
+        )
+        self.mask_counts = np.fromiter(
+            (len(dataset.segments_info.get(k, [])) for k in file_list), dtype=np.int64, count=self.num_frames
+        )
+
+        self._build_entries(dataset, file_list)
+        self._build_videos(dataset, file_list)
+
+    def _build_entries(self, dataset, file_list):
+        labels = [dataset.labels.get(k, []) for k in file_list]
+        label_lengths = np.fromiter((len(l) for l in labels), dtype=np.int64, count=self.num_frames)
+        seg_frame = np.repeat(np.arange(self.num_frames, dtype=np.int64), label_lengths)
+        seg_cat = self.category_columns(np.fromiter(chain.from_iterable(labels), dtype=np.int64, count=int(label_lengths.sum())))
+
+        # Collapse segments into one entry per (frame, category), counting repeats
+        combined = seg_frame * max(self.num_categories, 1) + seg_cat
+        entry_keys, entry_count = np.unique(combined, return_counts=True)
+        self.entry_frame = entry_keys // max(self.num_categories, 1)
+        self.entry_cat = entry_keys % max(self.num_categories, 1)
+        self.entry_count = entry_count.astype(np.float64)
+
+        # Areas come from dataset.areas, which holds one value per (frame, category)
+        areas = [dataset.areas.get(k, {}) for k in file_list]
+        area_lengths = np.fromiter((len(a) for a in areas), dtype=np.int64, count=self.num_frames)
+        area_frame = np.repeat(np.arange(self.num_frames, dtype=np.int64), area_lengths)
+        total = int(area_lengths.sum())
+        area_cat = self.category_columns(np.fromiter(chain.from_iterable(a.keys() for a in areas), dtype=np.int64, count=total))
+        area_val = np.fromiter(chain.from_iterable(a.values() for a in areas), dtype=np.float64, count=total)
+
+        self.entry_area = np.zeros(len(entry_keys), dtype=np.float64)
+        if total:
+            area_keys = area_frame * max(self.num_categories, 1) + area_cat
+            positions = np.searchsorted(entry_keys, area_keys)
+            positions = np.clip(positions, 0, max(len(entry_keys) - 1, 0))
+            valid = entry_keys[positions] == area_keys if len(entry_keys) else np.zeros(total, dtype=bool)
+            self.entry_area[positions[valid]] = area_val[valid]
+
+    def _build_videos(self, dataset, file_list):
+        """Assigns each row a video code. Frames of a video are contiguous in the sorted file_list."""
+        if not getattr(dataset, "is_video_dataset", False):
+            self.video_ids = []
+            self.video_codes = np.zeros(self.num_frames, dtype=np.int64)
+            return
+
+        code_of = {}
+        codes = np.empty(self.num_frames, dtype=np.int64)
+        for i, frame_key in enumerate(file_list):
+            video_id = frame_key.split('/', 1)[0]
+            codes[i] = code_of.setdefault(video_id, len(code_of))
+        self.video_ids = list(code_of)
+        self.video_codes = codes
+
+    def category_columns(self, category_ids):
+        """Maps category ids to column positions (all_labels order). Unknown ids map to -1."""
+        category_ids = np.asarray(category_ids, dtype=np.int64)
+        if not self.num_categories:
+            return np.full(category_ids.shape, -1, dtype=np.int64)
+        positions = np.clip(np.searchsorted(self.category_ids, category_ids), 0, self.num_categories - 1)
+        return np.where(self.category_ids[positions] == category_ids, positions, -1)
+
+    def rows_for_keys(self, frame_keys):
+        return np.fromiter((self.key_to_row[k] for k in frame_keys if k in self.key_to_row), dtype=np.int64)
+
+    def mask_for_keys(self, frame_keys):
+        mask = np.zeros(self.num_frames, dtype=bool)
+        mask[self.rows_for_keys(frame_keys)] = True
+        return mask
+
+    def keys_for_mask(self, mask):
+        return [self.frame_keys[i] for i in np.flatnonzero(mask)]
+
+    def frames_with_category(self, category_id):
+        """Boolean mask of frames containing at least one segment of category_id."""
+        mask = np.zeros(self.num_frames, dtype=bool)
+        column = self.category_columns([category_id])[0]
+        if column >= 0:
+            mask[self.entry_frame[self.entry_cat == column]] = True
+        return mask
+
+    def category_totals(self, mask=None, values="count"):
+        """Per-category sums of segment counts or areas over the frames in mask (all frames if None)."""
+        weights = self.entry_count if values == "count" else self.entry_area
+        if mask is not None:
+            weights = weights * mask[self.entry_frame]
+        return np.bincount(self.entry_cat, weights=weights, minlength=self.num_categories)
+
+    def rank_within_video(self, mask=None):
+        """
+        For each row, its 0-based rank among the rows of the same video that are set in mask
+        (file_list order). Rows outside mask get -1.
+        """
+        if mask is None:
+            mask = np.ones(self.num_frames, dtype=bool)
+        rows = np.flatnonzero(mask)
+        ranks = np.full(self.num_frames, -1, dtype=np.int64)
+        if rows.size == 0:
+            return ranks
+        codes = self.video_codes[rows]
+        # Rows are in file_list order, so members of each video are contiguous among them
+        group_start = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+        group_sizes = np.diff(np.r_[group_start, rows.size])
+        ranks[rows] = np.arange(rows.size) - np.repeat(group_start, group_sizes)
+        return ranks
+
+    def video_sizes(self, mask=None):
+        """Number of rows in mask (all rows if None) for each video code."""
+        weights = None if mask is None else mask.astype(np.int64)
+        return np.bincount(self.video_codes, weights=weights, minlength=max(len(self.video_ids), 1)).astype(np.int64)
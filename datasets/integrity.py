@@ -0,0 +1,90 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+from panopticapi.utils import rgb2id
+
+# Relative difference between annotated and actual area above which an area is reported
+AREA_TOLERANCE = 0.01
+
+# Storage of an integrity worker process
+_worker_storage = None
+
+
+def _init_worker(storage):
+    global _worker_storage
+    _worker_storage = storage
+
+
+def check_mask(panoptic_seg, segments):
+    """
+    Compares an id map with a frame's segments, given as (id, annotated area or None) pairs,
+    in one bincount pass over the pixels. Returns (coverage, {segment id: pixels}, issues), where
+    issues lists dicts with a "type" of "duplicate_id", "missing_segment", "unknown_id" or "area".
+    """
+    flat = panoptic_seg.ravel()
+    issues = []
+
+    annotated = {}
+    for segment_id, area in segments:
+        if segment_id in annotated:
+            issues.append({"type": "duplicate_id", "id": segment_id})
+        annotated[segment_id] = area
+
+    # Pixels of an annotated id count into that id's bin, everything else into the last bin
+    ids = np.array(sorted(annotated), dtype=flat.dtype)
+    positions = np.minimum(np.searchsorted(ids, flat), max(len(ids) - 1, 0))
+    known = ids[positions] == flat if len(ids) else np.zeros(flat.size, dtype=bool)
+    counts = np.bincount(np.where(known, positions, len(ids)), minlength=len(ids) + 1)
+
+    pixels = {int(segment_id): int(count) for segment_id, count in zip(ids, counts[:-1])}
+    for segment_id, count in pixels.items():
+        area = annotated[segment_id]
+        if count == 0:
+            issues.append({"type": "missing_segment", "id": segment_id})
+        elif area is not None and abs(area - count) > AREA_TOLERANCE * count:
+            issues.append({"type": "area", "id": segment_id, "annotated": area, "actual": count})
+
+    if counts[-1]:
+        unknown_ids, unknown_counts = np.unique(flat[~known], return_counts=True)
+        for segment_id, count in zip(unknown_ids, unknown_counts):
+            if segment_id == 0:
+                continue
+            pixels[int(segment_id)] = int(count)
+            issues.append({"type": "unknown_id", "id": int(segment_id), "actual": int(count)})
+
+    coverage = sum(pixels.values()) / flat.size * 100
+    return coverage, pixels, issues
+
+
+def _check_frame(frame_key, mask_rel, segments):
+    try:
+        mask = np.array(Image.open(_worker_storage.open("mask", mask_rel)))
+        panoptic_seg = rgb2id(mask).astype(np.int32)
+    except Exception as e:
+        return frame_key, None, None, [{"type": "unreadable", "error": str(e)}]
+    coverage, pixels, issues = check_mask(panoptic_seg, segments)
+    return frame_key, coverage, pixels, issues
+
+
+def scan_dataset(dataset, workers=None, chunksize=32):
+    """
+    Checks every loaded frame of a PanopticDataset against its mask in a pool of worker
+    processes. Yields (frame_key, coverage, {segment id: pixels}, issues) in file_list order;
+    coverage and pixels are None if the mask could not be read.
+    """
+    def tasks():
+        for frame_key in dataset.file_list:
+            _, mask_rel = dataset.frame_relpaths(frame_key)
+            segments = [(seg["id"], seg.get("area")) for seg in dataset.segments_info.get(frame_key, [])]
+            yield frame_key, mask_rel, segments
+
+    frame_keys, mask_rels, segments = zip(*tasks()) if dataset.file_list else ((), (), ())
+    # Workers only need the storage, so they start without detectron2/torch
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(dataset.storage,),
+    ) as pool:
+        yield from pool.map(_check_frame, frame_keys, mask_rels, segments, chunksize=chunksize)
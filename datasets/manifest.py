@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _list_directory(root, reldir, previous):
+    """
+    (mtime_ns, file names, subdirectory names) of root/reldir, reusing the previous listing if the
+    directory's mtime is unchanged. Returns None if the directory cannot be read.
+    """
+    path = os.path.join(root, reldir) if reldir else root
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        if previous is not None and previous[0] == mtime:
+            return previous, False
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # d_type from the directory listing; no per-entry stat on most filesystems
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                else:
+                    files.append(entry.name)
+    except OSError as e:
+        print(f"Warning: Could not list directory {path}. Error: {e}")
+        return None, True
+    return (mtime, frozenset(files), tuple(subdirs)), True
+
+
+class DirectoryManifest:
+    """
+    In-memory listing of all files below a root directory, so existence checks are set lookups
+    instead of a stat per file (a round trip each on network filesystems).
+
+    Built with one os.scandir per directory, with the directories of each level (e.g. the video
+    directories of a video dataset) listed in parallel. A rescan only lists directories whose
+    mtime changed, so a manifest loaded from the metadata cache is refreshed cheaply.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        # Relative directory ("" for the root, "/"-separated) -> (mtime_ns, file names, subdirectory names)
+        self.directories = {}
+
+    def scan(self, workers=8):
+        """Brings the listing up to date with the disk. Returns the number of directories that were (re)listed."""
+        previous = self.directories
+        directories = {}
+        listed = 0
+        level = [""]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while level:
+                results = pool.map(lambda reldir: _list_directory(self.root, reldir, previous.get(reldir)), level)
+                next_level = []
+                for reldir, (listing, relisted) in zip(level, results):
+                    listed += relisted
+                    if listing is None:
+                        continue
+                    directories[reldir] = listing
+                    next_level.extend(f"{reldir}/{name}" if reldir else name for name in listing[2])
+                level = next_level
+        self.directories = directories
+        return listed
+
+    def exists(self, relpath):
+        reldir, _, name = relpath.rpartition("/")
+        listing = self.directories.get(reldir)
+        return listing is not None and name in listing[1]
+
+    def directory_mtime(self, relpath):
+        """
+        mtime (ns) of the directory containing relpath when it was last listed, or None. It changes
+        when files are added, removed or renamed there, not when a file is rewritten in place.
+        """
+        listing = self.directories.get(relpath.rpartition("/")[0])
+        return listing[0] if listing is not None else None
+
+    def __len__(self):
+        return sum(len(listing[1]) for listing in self.directories.values())
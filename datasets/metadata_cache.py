@@ -0,0 +1,48 @@
+import os
+import pickle
+
+# Bumped when the format of a cached entry changes (3: mask versions in the integrity and segments entries)
+METADATA_CACHE_VERSION = 3
+
+
+class MetadataCache:
+    """
+    Derived metadata of one dataset (e.g. its file manifest) pickled to files below cache_dir,
+    so expensive scans are not repeated on every load.
+
+    Every entry is stored with a signature of the inputs it was computed from; load() returns
+    None if the stored signature differs, so stale entries are recomputed rather than used.
+    """
+
+    def __init__(self, cache_dir, dataset_name):
+        self.directory = os.path.join(cache_dir, dataset_name)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def load(self, key, signature=None):
+        try:
+            with open(self.path(key), "rb") as f:
+                version, stored_signature, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable metadata cache {self.path(key)}. Error: {e}")
+            return None
+        if version != METADATA_CACHE_VERSION or stored_signature != signature:
+            return None
+        return value
+
+    def store(self, key, value, signature=None):
+        """Writes atomically, so readers never see a partial file."""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.path(key)}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, "wb") as f:
+                pickle.dump((METADATA_CACHE_VERSION, signature, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path(key))
+        except OSError as e:
+            print(f"Warning: Could not write metadata cache {self.path(key)}. Error: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
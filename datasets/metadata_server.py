@@ -0,0 +1,132 @@
+import pickle
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import Listener
+from multiprocessing import AuthenticationError
+from datasets.remote_dataset import parse_address
+from utils.lru import LRUCache
+from utils.state import sort_frame_keys
+
+
+def rendered_arrays_size(rendered):
+    image, overlay, labels = rendered
+    return image.nbytes + overlay.nbytes + 100 * len(labels)
+
+
+class MetadataServer:
+    """
+    Holds loaded PanopticDatasets and a render cache for any number of RemoteDataset clients
+    connecting over a local socket (multiprocessing.connection, authenticated with authkey).
+
+    Each dataset is loaded on first request and refreshed incrementally when a client asks for
+    it after its files changed; refreshes build a snapshot and swap it in, so renders for other
+    clients continue meanwhile. The pickled metadata is built once per load and sent to every
+    client as is. Renders are cached by frame and frame record, and a frame requested by
+    several clients at once is rendered only once.
+    """
+
+    def __init__(self, datasets, address, authkey, render_cache_mb=1024):
+        self.datasets = datasets
+        self.address = address
+        self.authkey = authkey
+        self.render_cache = LRUCache("server_renders", render_cache_mb * 1024 * 1024, rendered_arrays_size)
+        # name -> (dataset object, its pickled metadata_state())
+        self._metadata = {}
+        self._load_locks = {name: threading.Lock() for name in datasets}
+        # (dataset name, frame_key, frame record) -> Future of a render in progress
+        self._rendering = {}
+        self._render_lock = threading.Lock()
+        self._handlers = {
+            "datasets": lambda: list(self.datasets),
+            "signature": self.signature,
+            "metadata": self.metadata,
+            "render": self.render,
+        }
+
+    def serve_forever(self):
+        with Listener(parse_address(self.address), authkey=self.authkey.encode()) as listener:
+            print(f"Metadata server listening on {self.address} ({len(self.datasets)} datasets).")
+            while True:
+                try:
+                    connection = listener.accept()
+                except (AuthenticationError, OSError) as e:
+                    print(f"Warning: Rejected a client connection. Error: {e}")
+                    continue
+                threading.Thread(target=self._serve_client, args=(connection,), daemon=True).start()
+
+    def _serve_client(self, connection):
+        with connection:
+            while True:
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+                handler = self._handlers.get(method)
+                try:
+                    if handler is None:
+                        raise ValueError(f"Unknown method '{method}'")
+                    response = ("ok", handler(*args))
+                except Exception as e:
+                    response = ("error", f"{type(e).__name__}: {e}")
+                try:
+                    connection.send(response)
+                except OSError:
+                    return
+
+    def signature(self, name):
+        return self.datasets[name].source_signature()
+
+    def current(self, name):
+        """The loaded dataset, (re)loading it first if it was never loaded or its files changed."""
+        with self._load_locks[name]:
+            dataset = self.datasets[name]
+            if dataset.is_loaded() and not dataset.is_stale():
+                return dataset
+            snapshot = dataset.snapshot()
+            if dataset.is_loaded():
+                snapshot.refresh()
+            else:
+                snapshot.load()
+            sort_frame_keys(snapshot.file_list, snapshot.is_video_dataset)
+            snapshot.invalidate_frame_index()
+            self.datasets[name] = snapshot
+            self._metadata.pop(name, None)
+            return snapshot
+
+    def metadata(self, name):
+        dataset = self.current(name)
+        with self._load_locks[name]:
+            cached = self._metadata.get(name)
+            if cached is None or cached[0] is not dataset:
+                cached = self._metadata[name] = (dataset, pickle.dumps(dataset.metadata_state(), protocol=pickle.HIGHEST_PROTOCOL))
+        return cached[1]
+
+    def render(self, name, frame_key):
+        """(image, overlay, labels) of a frame of the current dataset, from the shared cache if possible."""
+        dataset = self.datasets[name]
+        if not dataset.is_loaded():
+            dataset = self.current(name)
+        key = (name, frame_key, dataset.frame_records.get(frame_key))
+        with self._render_lock:
+            cached = self.render_cache.get(key)
+            if cached is not None:
+                return cached
+            pending = self._rendering.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._rendering[key] = Future()
+        if not owner:
+            return pending.result()
+
+        try:
+            rendered = dataset.render_arrays(frame_key)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            self.render_cache.put(key, rendered)
+            pending.set_result(rendered)
+            return rendered
+        finally:
+            with self._render_lock:
+                del self._rendering[key]
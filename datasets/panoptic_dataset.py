@@ -1,66 +1,280 @@
 import os
+import copy
 import json
+import zlib
 import numpy as np
 from PIL import Image
 from panopticapi.utils import rgb2id
 from detectron2.utils.visualizer import ColorMode, Visualizer
-from detectron2.data import MetadataCatalog
+from detectron2.data import Metadata
 from PyQt6.QtGui import QImage
-from datasets.base_dataset import BaseDataset
+from datasets.base_dataset import BaseDataset, LoadCancelled
+from datasets.storage import create_storage
+from datasets.metadata_cache import MetadataCache
+from datasets.dataset_summary import DatasetSummary
+from datasets.segment_index import SegmentIndex, compute_segment_geometry, find_segment, rle_decode
+from utils.profiling import timings, timed
+from utils.lru import LRUCache
 import torch
 from collections import Counter
 import random
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
 random.seed(42)
 np.random.seed(42)
 
+
+def render_state_size(state):
+    """Rough bytes held by a frame's (Metadata, visualizer segments): a few hundred per segment."""
+    _, segments = state
+    return 512 + 700 * len(segments)
+
+
 class PanopticDataset(BaseDataset):
-    def __init__(self, name, image_dir, ann_file, mask_dir):
+    # Progress is reported and cancellation checked every this many frames
+    PROGRESS_INTERVAL = 256
+    # Threads listing directories in parallel (see DirectoryManifest)
+    SCAN_WORKERS = 8
+    # Budget for the per-frame visualizer state kept for single-segment views
+    RENDER_STATE_MAX_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, name, image_dir=None, ann_file=None, mask_dir=None, shard_dir=None,
+                 coverage_source="annotations", verify_coverage=False, metadata_dir=None, segment_index=False):
+        """
+        Images and masks are read either from image_dir/mask_dir or, if shard_dir is given,
+        from packed shards created with pack_shards.py.
+
+        coverage_source "annotations" computes coverage from the segment areas and image sizes in
+        the annotation file (falling back to the mask for frames lacking them); "masks" decodes
+        every mask at load time. verify_coverage asks the GUI to check annotation-derived values
+        against the masks in the background after loading. Derived metadata such as the file
+        manifest is cached below metadata_dir, if given. segment_index builds the per-segment
+        bbox/RLE index (see get_segment_index) at load time instead of on first use.
+        """
         super().__init__(name)
+        if not ann_file:
+            raise ValueError(f"Dataset '{name}' has no 'ann_file' configured.")
+        if coverage_source not in ("annotations", "masks"):
+            raise ValueError(f"Dataset '{name}': 'coverage_source' must be 'annotations' or 'masks'.")
+        self.coverage_source = coverage_source
+        self.verify_coverage = verify_coverage
         self.image_dir = image_dir
         self.ann_file = ann_file
         self.mask_dir = mask_dir
+        self.shard_dir = shard_dir
+        self.storage = create_storage(image_dir, mask_dir, shard_dir)
+        self.metadata_cache = MetadataCache(metadata_dir, name) if metadata_dir else None
+        self.build_segment_index = segment_index
         self.is_video_dataset = False
-        self.visualizer_segments = {}
         self.font_size = 25 if "VIPSeg" in name else 10
 
-    def load(self):
+    @timed("load.total")
+    def load(self, progress_callback=None, should_cancel=None):
+        """
+        Loads the annotation file and computes per-frame metadata.
+
+        progress_callback(done, total) is called periodically with the number of processed frames.
+        should_cancel() is polled at the same interval; if it returns True the dataset is reset
+        and LoadCancelled is raised.
+        """
         print(f"Loading {self.name} dataset... This may take a few seconds.")
+        # Start from a clean state so that reloading never duplicates entries
+        self.reset()
+        signature = self.source_signature()
 
+        data = self._read_annotation_file()
+        if data is None:
+            return # Stop loading if the main annotation file is invalid
+
+        self.is_video_dataset, annotations_list = self._flatten_annotations(data)
+        print("Detected video dataset format." if self.is_video_dataset else "Detected image dataset format.")
+        self._load_categories(data)
+
+        self._scan_files()
+        image_sizes = self._image_sizes(data)
+        # {frame_key: (frame record, mask version, (coverage, {segment id: pixels}))} measured by scan_integrity.py
+        measured = self.metadata_cache.load("integrity", self.cache_signature()) if self.metadata_cache else None
+        measured = self._unchanged_masks(measured or {})
+        stats = Counter()
+        processed_items = set()
+
+        total_frames = len(annotations_list)
+        for frame_number, frame in enumerate(tqdm(annotations_list, desc=f"Processing {self.name}")):
+            if frame_number % self.PROGRESS_INTERVAL == 0:
+                if should_cancel is not None and should_cancel():
+                    self.reset()
+                    print(f"Loading {self.name} was cancelled.")
+                    raise LoadCancelled(self.name)
+                if progress_callback is not None:
+                    progress_callback(frame_number, total_frames)
+
+            frame_key, video_id = self._frame_key(frame)
+            if frame_key in processed_items:
+                # Avoid processing duplicate entries from the annotation file
+                stats["duplicates"] += 1
+                continue
+            processed_items.add(frame_key)
+
+            entry = self._process_frame(frame_key, frame, video_id, image_sizes, measured, stats)
+            if entry is not None:
+                self._add_frame(frame_key, entry)
+                self.file_list.append(frame_key)
+
+        if progress_callback is not None:
+            progress_callback(total_frames, total_frames)
+
+        self._update_goal_stats()
+        self.loaded_signature = signature
+        if self.build_segment_index:
+            self.get_segment_index(progress_callback, should_cancel)
+            if should_cancel is not None and should_cancel():
+                self.reset()
+                print(f"Loading {self.name} was cancelled.")
+                raise LoadCancelled(self.name)
+
+        print(f"{self.name} dataset loaded: {len(self.file_list)} files processed.")
+        if stats["measured"] > 0:
+            print(f"Areas and coverage of {stats['measured']} frames taken from the integrity scan.")
+        if self.coverage_source == "annotations" and stats["decoded"] > 0:
+            print(f"Coverage of {stats['decoded']} frames was computed from their masks (no image size or segment areas in the annotations).")
+        if stats["duplicates"] > 0:
+            print(f"Skipped {stats['duplicates']} duplicate entries.")
+        if stats["missing_files"] > 0:
+            print(f"Warning: Skipped {stats['missing_files']} entries due to missing image or mask files.")
+
+    @timed("refresh.total")
+    def refresh(self, progress_callback=None, should_cancel=None):
+        """
+        Brings a loaded dataset up to date with its annotation file and files on disk, processing
+        only frames that were added or changed and dropping removed ones. file_list, the per-frame
+        metadata and the goal statistics are patched in place. Falls back to load() if nothing is
+        loaded yet or the dataset switched between image and video format.
+
+        A frame changed if its segments_info did, or if it has data read from its mask (see
+        mask_versions) and the mask's file_version differs, which also catches masks rewritten in
+        place. Only those masks are stat'ed. The metadata of the other frames comes from the
+        annotation file alone and does not depend on the mask's contents.
+
+        Callbacks work like in load(); cancelling raises LoadCancelled and leaves the previously
+        loaded data untouched. Returns the numbers of (added, removed, changed) frames.
+        """
+        if not self.is_loaded():
+            self.load(progress_callback, should_cancel)
+            return len(self.file_list), 0, 0
+
+        print(f"Refreshing {self.name} dataset...")
+        signature = self.source_signature()
+        data = self._read_annotation_file()
+        if data is None:
+            return 0, 0, 0
+
+        is_video_dataset, annotations_list = self._flatten_annotations(data)
+        if is_video_dataset != self.is_video_dataset:
+            self.load(progress_callback, should_cancel)
+            return len(self.file_list), 0, 0
+
+        self._scan_files()
+        image_sizes = self._image_sizes(data)
+
+        # Phase 1 (cancellable, nothing modified): find and process the new and changed frames
+        order = []
+        present = set()
+        pending = []
+        # Unchanged annotations with data read from the mask: reprocessed if the mask changed since
+        to_check = []
+        # Unchanged frames whose record only has a new mask directory version
+        rerecorded = {}
+        for frame in annotations_list:
+            frame_key, video_id = self._frame_key(frame)
+            if frame_key in present:
+                continue
+            present.add(frame_key)
+            order.append(frame_key)
+            record = self._current_record(frame_key, frame)
+            if record is None:
+                pending.append((frame_key, frame, video_id))
+                continue
+            if record != self.frame_records[frame_key]:
+                rerecorded[frame_key] = record
+            if frame_key in self.mask_versions:
+                to_check.append((frame_key, frame, video_id))
+
+        versions = self.mask_file_versions([item[0] for item in to_check])
+        pending.extend(item for item in to_check if versions[item[0]] != self.mask_versions[item[0]])
+        measured = self.metadata_cache.load("integrity", self.cache_signature()) if self.metadata_cache else None
+        measured = self._unchanged_masks({k: measured[k] for k, _, _ in pending if k in measured} if measured else {})
+
+        stats = Counter()
+        processed = {}
+        for number, (frame_key, frame, video_id) in enumerate(pending):
+            if number % self.PROGRESS_INTERVAL == 0:
+                if should_cancel is not None and should_cancel():
+                    print(f"Refreshing {self.name} was cancelled.")
+                    raise LoadCancelled(self.name)
+                if progress_callback is not None:
+                    progress_callback(number, len(pending))
+            processed[frame_key] = self._process_frame(frame_key, frame, video_id, image_sizes, measured, stats)
+        if progress_callback is not None:
+            progress_callback(len(pending), len(pending))
+
+        # Phase 2: patch the loaded metadata
+        self._load_categories(data)
+        removed = [k for k in self.file_list if k not in present or processed.get(k, True) is None]
+        changed = [k for k in processed if k in self.segments_info and processed[k] is not None]
+        for frame_key in removed + changed:
+            self._remove_frame(frame_key)
+        for frame_key, entry in processed.items():
+            if entry is not None:
+                self._add_frame(frame_key, entry)
+        self.frame_records.update((k, record) for k, record in rerecorded.items() if k not in processed)
+        self.file_list[:] = [k for k in order if k in self.segments_info]
+
+        self._update_goal_stats()
+        self.invalidate_frame_index()
+        self.coverage_mismatches = None
+        self.loaded_signature = signature
+
+        added = sum(1 for k, entry in processed.items() if entry is not None) - len(changed)
+        print(f"{self.name} refreshed: {added} added, {len(removed)} removed, {len(changed)} changed frames.")
+        return added, len(removed), len(changed)
+
+    def _read_annotation_file(self):
+        """Parsed annotation file, or None (after printing why) if it cannot be read."""
         try:
-            with open(self.ann_file, 'r') as f:
-                data = json.load(f)
+            with open(self.ann_file, 'r') as f, timings.measure("load.parse_json"):
+                return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error: Failed to load or parse annotation file '{self.ann_file}'. {e}")
-            return # Stop loading if the main annotation file is invalid
+            return None
 
-        # Auto-detect dataset type and prepare a flat list of annotations
+    @staticmethod
+    def _flatten_annotations(data):
+        """Auto-detects the dataset type and returns (is_video_dataset, flat list of frame annotations)."""
         annotations_list = []
         # Check if 'annotations' key exists and is not empty
-        if data.get('annotations') and isinstance(data['annotations'], list) and data['annotations']:
-            # Check if the first annotation has a 'video_id', suggesting a video dataset
-            if 'video_id' in data['annotations'][0]:
-                self.is_video_dataset = True
-                print("Detected video dataset format.")
-                for video in data['annotations']:
-                    # Defensive checks for each video entry
-                    if 'video_id' not in video:
-                        print(f"Warning: Skipping an entry in annotations list because 'video_id' is missing.")
-                        continue
-                    if 'annotations' not in video or not video['annotations']:
-                        print(f"Warning: No frames found or 'annotations' key missing for video_id: {video['video_id']}. Skipping.")
-                        continue
-
-                    video_id = video['video_id']
-                    for frame in video['annotations']:
-                        frame['video_id'] = video_id  # Inject video_id for unified processing
-                        annotations_list.append(frame)
-            else: # Assumed to be an image dataset
-                self.is_video_dataset = False
-                print("Detected image dataset format.")
-                annotations_list = data.get('annotations', [])
-
-        # === Load categories and category mapping ===
+        if not (data.get('annotations') and isinstance(data['annotations'], list)):
+            return False, annotations_list
+
+        # Check if the first annotation has a 'video_id', suggesting a video dataset
+        if 'video_id' not in data['annotations'][0]:
+            return False, data['annotations']
+
+        for video in data['annotations']:
+            # Defensive checks for each video entry
+            if 'video_id' not in video:
+                print(f"Warning: Skipping an entry in annotations list because 'video_id' is missing.")
+                continue
+            if 'annotations' not in video or not video['annotations']:
+                print(f"Warning: No frames found or 'annotations' key missing for video_id: {video['video_id']}. Skipping.")
+                continue
+
+            video_id = video['video_id']
+            for frame in video['annotations']:
+                frame['video_id'] = video_id  # Inject video_id for unified processing
+                annotations_list.append(frame)
+        return True, annotations_list
+
+    def _load_categories(self, data):
         categories = data.get("categories")
         if not categories:
             raise ValueError(f"No 'categories' found in annotation file '{self.ann_file}'")
@@ -70,134 +284,475 @@ class PanopticDataset(BaseDataset):
         # Map category ID to isthing boolean
         self.category_id_isthing = {cat["id"]: cat.get("isthing", 0) for cat in categories}
 
-        all_labels_set = set()
-        label_counter = Counter()
-        area_counter = Counter()
-        mask_counts = []
-        unique_label_counts = []
-        processed_items = set()
-        skipped_duplicates = 0
-        skipped_missing_files = 0
-
-        for frame in tqdm(annotations_list, desc=f"Processing {self.name}"):
-            fname = frame['file_name']
-            # Create a unique key for each frame to handle cases where file names
-            # are repeated across different videos.
-            if self.is_video_dataset:
-                video_id = frame['video_id']
-                frame_key = f"{video_id}/{fname}"
-            else:
-                video_id = None
-                frame_key = fname
-
-            if frame_key in processed_items:
-                # Avoid processing duplicate entries from the annotation file
-                skipped_duplicates += 1
-                continue
-
-            processed_items.add(frame_key)
-            base_name, _ = os.path.splitext(fname)
-
-            # Construct paths based on dataset type
-            if self.is_video_dataset:
-                image_path = os.path.join(self.image_dir, video_id, f"{base_name}.jpg")
-                mask_path = os.path.join(self.mask_dir, video_id, f"{base_name}.png")
-            else:
-                image_path = os.path.join(self.image_dir, f"{base_name}.jpg")
-                mask_path = os.path.join(self.mask_dir, f"{base_name}.png")
-
-            # Check for file existence and provide specific feedback for debugging
-            image_exists = os.path.exists(image_path)
-            mask_exists = os.path.exists(mask_path)
-            if not image_exists or not mask_exists:
-                if not image_exists:
-                    print(f"Warning: Image file not found, skipping frame. Path: {image_path}")
-                if not mask_exists:
-                    print(f"Warning: Mask file not found, skipping frame. Path: {mask_path}")
-                skipped_missing_files += 1
-                continue
+    def _frame_key(self, frame):
+        """(frame_key, video_id) of a frame annotation."""
+        # Create a unique key for each frame to handle cases where file names
+        # are repeated across different videos.
+        if self.is_video_dataset:
+            return f"{frame['video_id']}/{frame['file_name']}", frame['video_id']
+        return frame['file_name'], None
 
-            segments_info = frame.get('segments_info', [])
-            if not segments_info:
-                print(f"Warning: Frame '{frame_key}' has no 'segments_info'. It will be processed but may appear empty.")
+    def frame_record(self, segments_info, mask_rel):
+        """
+        What a frame's metadata was derived from: a hash of its segments_info and the version of
+        its mask in the storage (cheap, see storage version). Derived data is reused while this is
+        unchanged; data read from the mask itself is also checked against mask_versions.
+        """
+        return zlib.crc32(repr(segments_info).encode()), self.storage.version("mask", mask_rel)
+
+    def _current_record(self, frame_key, frame):
+        """The frame_record() of a loaded frame whose segments_info and files are unchanged, otherwise None."""
+        record = self.frame_records.get(frame_key)
+        if record is None or frame_key not in self.segments_info:
+            return None
+        image_rel, mask_rel = self.frame_relpaths(frame_key)
+        if not (self.storage.exists("image", image_rel) and self.storage.exists("mask", mask_rel)):
+            return None
+        current = self.frame_record(frame.get('segments_info', []), mask_rel)
+        return current if current[0] == record[0] else None
+
+    def mask_file_versions(self, frame_keys):
+        """{frame_key: storage file_version of its mask}, stat'ing the masks in parallel."""
+        def version(frame_key):
+            return self.storage.file_version("mask", self.frame_relpaths(frame_key)[1])
+
+        with ThreadPoolExecutor(max_workers=self.SCAN_WORKERS) as pool:
+            return dict(zip(frame_keys, pool.map(version, frame_keys)))
+
+    def _unchanged_masks(self, entries):
+        """The cached {frame_key: (frame record, mask version, ...)} entries whose mask still has that version."""
+        versions = self.mask_file_versions(list(entries))
+        return {k: entry for k, entry in entries.items() if entry[1] is not None and entry[1] == versions[k]}
+
+    def _process_frame(self, frame_key, frame, video_id, image_sizes, measured, stats):
+        """
+        Per-frame metadata of an annotation entry as a dict, or None if its files are missing or
+        its mask cannot be read. Counts what happened in stats.
+        """
+        image_rel, mask_rel = self.frame_relpaths(frame_key)
+
+        # Check for file existence and provide specific feedback for debugging
+        image_exists = self.storage.exists("image", image_rel)
+        mask_exists = self.storage.exists("mask", mask_rel)
+        if not image_exists or not mask_exists:
+            if not image_exists:
+                print(f"Warning: Image file not found, skipping frame. Path: {self.storage.describe('image', image_rel)}")
+            if not mask_exists:
+                print(f"Warning: Mask file not found, skipping frame. Path: {self.storage.describe('mask', mask_rel)}")
+            stats["missing_files"] += 1
+            return None
+
+        segments_info = frame.get('segments_info', [])
+        if not segments_info:
+            print(f"Warning: Frame '{frame_key}' has no 'segments_info'. It will be processed but may appear empty.")
+
+        record = self.frame_record(segments_info, mask_rel)
+        # measured only holds entries whose mask is unchanged (see _unchanged_masks)
+        measured_frame = measured.get(frame_key)
+        if measured_frame is not None and measured_frame[0] == record:
+            coverage, pixels = measured_frame[2]
+            area_map = {seg['category_id']: pixels.get(seg['id'], 0) for seg in segments_info}
+            stats["measured"] += 1
+            return self._frame_entry(segments_info, area_map, coverage, record, measured_frame[1])
+
+        area_map = {seg['category_id']: seg.get('area', 0) for seg in segments_info}
+        coverage = None
+        if self.coverage_source == "annotations":
+            coverage = self._annotated_coverage(frame, video_id, segments_info, image_sizes)
+        if coverage is not None:
+            return self._frame_entry(segments_info, area_map, coverage, record, None)
+
+        # Taken before decoding, so a mask rewritten meanwhile is noticed by the next refresh
+        mask_version = self.storage.file_version("mask", mask_rel)
+        try:
+            coverage = self._decoded_coverage(mask_rel)
+        except Exception as e:
+            print(f"Warning: Could not process mask file {self.storage.describe('mask', mask_rel)}. Error: {e}")
+            return None
+        stats["decoded"] += 1
+        return self._frame_entry(segments_info, area_map, coverage, record, mask_version)
+
+    @staticmethod
+    def _frame_entry(segments_info, area_map, coverage, record, mask_version):
+        """mask_version is the file_version of the mask the coverage was read from, None if it came from the annotations."""
+        return {
+            "segments_info": segments_info,
+            "labels": [seg['category_id'] for seg in segments_info],
+            "areas": area_map,
+            "coverage": coverage,
+            "record": record,
+            "mask_version": mask_version,
+        }
+
+    def _add_frame(self, frame_key, entry):
+        """Stores a _process_frame() entry (file_list is left to the caller)."""
+        self.segments_info[frame_key] = entry["segments_info"]
+        self.labels[frame_key] = entry["labels"]
+        self.areas[frame_key] = entry["areas"]
+        self.coverages[frame_key] = entry["coverage"]
+        self.frame_records[frame_key] = entry["record"]
+        if entry["mask_version"] is None:
+            self.annotated_coverage_keys.add(frame_key)
+        else:
+            self.mask_versions[frame_key] = entry["mask_version"]
+        self._label_counter.update(entry["labels"])
+        self._area_counter.update(entry["areas"])
+
+    def _remove_frame(self, frame_key):
+        """Drops a frame's metadata and everything derived from it (file_list is left to the caller)."""
+        self._label_counter.subtract(self.labels.pop(frame_key, []))
+        self._area_counter.subtract(self.areas.pop(frame_key, {}))
+        for per_frame in (self.segments_info, self.coverages, self.frame_records, self.mask_versions, self._segment_geometry):
+            per_frame.pop(frame_key, None)
+        self.annotated_coverage_keys.discard(frame_key)
+        self.render_state.pop(frame_key)
+
+    def _update_goal_stats(self):
+        """Recomputes the full-dataset statistics from the running label and area totals."""
+        self.all_labels = sorted(label for label, count in self._label_counter.items() if count > 0)
+        self.goal_freqs = [self._label_counter[label] for label in self.all_labels]
+        self.goal_areas = [self._area_counter[label] for label in self.all_labels]
+        self.goal_mask_counts = [len(self.segments_info[k]) for k in self.file_list]
+        self.goal_unique_labels = [len(set(self.labels[k])) for k in self.file_list]
+
+    @timed("load.scan_files")
+    def _scan_files(self):
+        """
+        Lists the image and mask directories up front, so the existence checks of load(), rendering
+        and the video player are answered from memory. The listing is kept in the metadata cache and
+        only changed directories are listed again on the next load. Files added or removed while
+        the dataset is loaded are noticed on the next load.
+        """
+        signature = self.cache_signature()
+        # A reload refreshes the listing of the previous load; a fresh start tries the cache
+        previous = getattr(self.storage, "manifests", None)
+        if previous is None and self.metadata_cache is not None:
+            previous = self.metadata_cache.load("manifest", signature)
+        listed = self.storage.scan(self.SCAN_WORKERS, previous)
+        if listed and self.metadata_cache is not None:
+            self.metadata_cache.store("manifest", self.storage.manifests, signature)
+
+    def cache_signature(self):
+        """Identifies the configured sources in the metadata cache; per-frame entries are checked with frame_record."""
+        return (self.ann_file, self.image_dir, self.mask_dir, self.shard_dir)
+
+    def store_summary(self):
+        """Keeps the DatasetSummary of the loaded dataset in the metadata cache, for cached_summary()."""
+        if self.metadata_cache is None or not self.is_loaded():
+            return
+        with timings.measure("summary.store"):
+            self.metadata_cache.store("summary", DatasetSummary(self), (self.cache_signature(), self.loaded_signature))
+
+    def cached_summary(self):
+        """
+        The DatasetSummary stored by the last load, or None if there is none or the source files
+        changed since. Does not load the dataset.
+        """
+        if self.metadata_cache is None:
+            return None
+        return self.metadata_cache.load("summary", (self.cache_signature(), self.source_signature()))
 
-            labels = [seg['category_id'] for seg in segments_info]
-            area_map = {seg['category_id']: seg.get('area', 0) for seg in segments_info}
+    def _image_sizes(self, data):
+        """
+        (width, height) of the frames from the "images" entries (inside "videos" for video datasets),
+        keyed by (video_id, "id", image id) and by (video_id, file name without extension).
+        """
+        if self.is_video_dataset:
+            groups = [(video.get('video_id'), video.get('images', [])) for video in data.get('videos', [])]
+        else:
+            groups = [(None, data.get('images', []))]
+
+        sizes = {}
+        for video_id, images in groups:
+            for image in images:
+                if not image.get('width') or not image.get('height'):
+                    continue
+                size = (image['width'], image['height'])
+                if 'id' in image:
+                    sizes[(video_id, "id", image['id'])] = size
+                if 'file_name' in image:
+                    sizes[(video_id, os.path.splitext(image['file_name'])[0])] = size
+        return sizes
+
+    @staticmethod
+    def _annotated_coverage(frame, video_id, segments_info, image_sizes):
+        """Coverage (%) as the summed segment areas over the image size, or None if either is unknown."""
+        size = image_sizes.get((video_id, "id", frame.get('image_id')))
+        if size is None:
+            size = image_sizes.get((video_id, os.path.splitext(frame['file_name'])[0]))
+        if size is None or any('area' not in seg for seg in segments_info):
+            return None
+        return sum(seg['area'] for seg in segments_info) / (size[0] * size[1]) * 100
+
+    def _decode_mask(self, mask_rel, stage):
+        """Panoptic id map of a mask."""
+        with timings.measure(f"{stage}.decode_mask"):
+            mask = np.array(Image.open(self.storage.open("mask", mask_rel)))
+        with timings.measure(f"{stage}.rgb2id"):
+            return rgb2id(mask).astype(np.int32)
+
+    def decode_mask(self, frame_key):
+        """Panoptic id map of a frame's mask, e.g. for compute_segment_geometry."""
+        _, mask_rel = self.frame_relpaths(frame_key)
+        return self._decode_mask(mask_rel, "segments")
+
+    def _decoded_coverage(self, mask_rel):
+        """Coverage (%) as the share of non-zero segment ids in the decoded mask."""
+        panoptic_seg = self._decode_mask(mask_rel, "load")
+        labeled_pixels = np.sum(panoptic_seg != 0)
+        total_pixels = panoptic_seg.shape[0] * panoptic_seg.shape[1]
+        return (labeled_pixels / total_pixels) * 100
+
+    def verify_coverages(self, tolerance=0.5, workers=4, progress_callback=None, should_cancel=None):
+        """
+        Decodes the masks of frames whose coverage came from the annotations and returns
+        {frame_key: (annotated coverage, decoded coverage)} for those differing by more than
+        tolerance percentage points, also kept as coverage_mismatches. Callbacks work like in
+        load(); cancelling returns the mismatches found so far.
+        """
+        frame_keys = [k for k in self.file_list if k in self.annotated_coverage_keys]
+        mismatches = {}
 
+        def decode(frame_key):
+            _, mask_rel = self.frame_relpaths(frame_key)
             try:
-                panoptic_seg = np.array(Image.open(mask_path))
-                panoptic_seg = rgb2id(panoptic_seg).astype(np.int32)
-                labeled_pixels = np.sum(panoptic_seg != 0)
-                total_pixels = panoptic_seg.shape[0] * panoptic_seg.shape[1]
-                coverage = (labeled_pixels / total_pixels) * 100
-
-                self.segments_info[frame_key] = segments_info
-                self.file_list.append(frame_key)
-                self.labels[frame_key] = labels
-                self.areas[frame_key] = area_map
-                self.coverages[frame_key] = coverage
-
-                all_labels_set.update(labels)
-                label_counter.update(labels)
-                area_counter.update(area_map)
-                mask_counts.append(len(segments_info))
-                unique_label_counts.append(len(set(labels)))
+                return self._decoded_coverage(mask_rel)
             except Exception as e:
-                print(f"Warning: Could not process mask file {mask_path}. Error: {e}")
-                continue
+                print(f"Warning: Could not verify coverage of {frame_key}. Error: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(frame_keys), self.PROGRESS_INTERVAL):
+                if should_cancel is not None and should_cancel():
+                    break
+                chunk = frame_keys[start:start + self.PROGRESS_INTERVAL]
+                for frame_key, decoded in zip(chunk, pool.map(decode, chunk)):
+                    annotated = self.coverages.get(frame_key)
+                    if decoded is not None and annotated is not None and abs(decoded - annotated) > tolerance:
+                        mismatches[frame_key] = (annotated, decoded)
+                if progress_callback is not None:
+                    progress_callback(min(start + len(chunk), len(frame_keys)), len(frame_keys))
+            else:
+                self.coverage_mismatches = mismatches
+        return mismatches
 
-        self.all_labels = sorted(list(all_labels_set))
-        self.goal_freqs = [label_counter[label] for label in self.all_labels]
-        self.goal_areas = [area_counter[label] for label in self.all_labels]
-        self.goal_mask_counts = mask_counts
-        self.goal_unique_labels = unique_label_counts
+    def get_segment_index(self, progress_callback=None, should_cancel=None) -> SegmentIndex:
+        """
+        Returns the per-segment bboxes, pixel areas and RLE masks of the loaded frames, decoding
+        the masks of frames not yet indexed in parallel. Kept in the metadata cache per frame
+        record, so later loads only decode new or changed frames. Callbacks work like in load(); a cancelled build returns
+        an index of the frames done so far.
+        """
+        if self._segment_index is not None:
+            return self._segment_index
+
+        if not self._segment_geometry and self.metadata_cache is not None:
+            # {frame_key: (frame record, mask version, geometry)}
+            cached = self.metadata_cache.load("segments", self.cache_signature()) or {}
+            cached = self._unchanged_masks({
+                k: cached[k] for k in self.file_list if k in cached and cached[k][0] == self.frame_records.get(k)
+            })
+            self._segment_geometry = {k: entry[2] for k, entry in cached.items()}
+            for k, entry in cached.items():
+                self.mask_versions.setdefault(k, entry[1])
+
+        missing = [k for k in self.file_list if k not in self._segment_geometry]
+        if missing:
+            print(f"Indexing segments of {len(missing)} frames of {self.name}...")
+            versions = self.mask_file_versions(missing)
+            with timings.measure("segments.build_index"):
+                computed = compute_segment_geometry(self, missing, self.SCAN_WORKERS, progress_callback, should_cancel)
+            self._segment_geometry.update(computed)
+            for k in computed:
+                # A coverage read from an older mask keeps its version, so refresh() still reprocesses the frame
+                self.mask_versions.setdefault(k, versions[k])
+            if self.metadata_cache is not None:
+                self.metadata_cache.store("segments", {
+                    k: (self.frame_records[k], self.mask_versions.get(k), geometry)
+                    for k, geometry in self._segment_geometry.items() if k in self.frame_records
+                }, self.cache_signature())
+
+        index = SegmentIndex(self, self._segment_geometry)
+        if len(self._segment_geometry) == len(self.file_list):
+            self._segment_index = index
+        return index
+
+    def invalidate_frame_index(self):
+        super().invalidate_frame_index()
+        self._segment_index = None
+
+    def reset(self):
+        super().reset()
+        # frame_key -> segment geometry (see frame_segment_geometry) and the SegmentIndex over it
+        self._segment_geometry = {}
+        self._segment_index = None
+        self.is_video_dataset = False
+        # Frames whose coverage was computed from annotation areas rather than the decoded mask
+        self.annotated_coverage_keys = set()
+        # frame_key -> frame_record() of the loaded frames, and running totals for the goal statistics
+        self.frame_records = {}
+        # frame_key -> storage file_version of the mask that the frame's decoded or measured coverage
+        # and segment geometry were read from; these are checked against the mask before reuse
+        self.mask_versions = {}
+        self._label_counter = Counter()
+        self._area_counter = Counter()
+        # Result of the last complete verify_coverages(), None if not verified
+        self.coverage_mismatches = None
+        self.categories = {}
+        self.category_id_isthing = {}
+        # frame_key -> (Metadata, visualizer segments) of recently rendered frames, needed by
+        # get_single_segment_visualization. Bounded, unlike a MetadataCatalog registration per frame.
+        if getattr(self, "render_state", None) is None:
+            self.render_state = LRUCache(f"render_state.{self.name}", self.RENDER_STATE_MAX_BYTES, render_state_size)
+        else:
+            self.render_state.clear()
 
-        print(f"{self.name} dataset loaded: {len(self.file_list)} files processed.")
-        if skipped_duplicates > 0:
-            print(f"Skipped {skipped_duplicates} duplicate entries.")
-        if skipped_missing_files > 0:
-            print(f"Warning: Skipped {skipped_missing_files} entries due to missing image or mask files.")
+    def source_signature(self):
+        """Modification times and sizes of the annotation file and data directories, used to detect stale loads."""
+        signature = []
+        for path in (self.ann_file, self.image_dir, self.mask_dir, self.shard_dir):
+            if path is None:
+                continue
+            try:
+                st = os.stat(path)
+                signature.append((path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
 
     def _get_label_name(self, cat_id):  
         cat = self.categories.get(cat_id)
         return f"{cat_id}: {cat['name']}" if cat else str(cat_id)
 
-    def _get_paths_and_key(self, frame_key):
-        """Helper to construct paths and metadata key for a given filename."""
-
+    def frame_relpaths(self, frame_key):
+        """Image and mask paths of a frame relative to image_dir/mask_dir (or inside the shards)."""
         if self.is_video_dataset:
             # For video datasets, frame_key is "video_id/fname.ext"
             video_id, fname = frame_key.split('/', 1)
             base_name, _ = os.path.splitext(fname)
-            image_path = os.path.join(self.image_dir, video_id, f"{base_name}.jpg")
-            mask_path = os.path.join(self.mask_dir, video_id, f"{base_name}.png")
-            metadata_key = f"{self.name}_{video_id}_{base_name}"
-        else:
-            # For image datasets, frame_key is "fname.ext"
-            fname = frame_key
-            base_name, _ = os.path.splitext(fname)
-            image_path = os.path.join(self.image_dir, f"{base_name}.jpg")
-            mask_path = os.path.join(self.mask_dir, f"{base_name}.png")
-            metadata_key = f"{self.name}_{base_name}"
+            return f"{video_id}/{base_name}.jpg", f"{video_id}/{base_name}.png"
+        # For image datasets, frame_key is "fname.ext"
+        base_name, _ = os.path.splitext(frame_key)
+        return f"{base_name}.jpg", f"{base_name}.png"
 
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found: {image_path}")
-        if not os.path.exists(mask_path):
-            raise FileNotFoundError(f"Mask not found: {mask_path}")
+    def _get_paths_and_key(self, frame_key):
+        """Helper to construct relative paths and metadata name for a given frame, checking that both files exist."""
+        image_rel, mask_rel = self.frame_relpaths(frame_key)
+        metadata_key = self._metadata_key(frame_key)
+
+        if not self.storage.exists("image", image_rel):
+            raise FileNotFoundError(f"Image not found: {self.storage.describe('image', image_rel)}")
+        if not self.storage.exists("mask", mask_rel):
+            raise FileNotFoundError(f"Mask not found: {self.storage.describe('mask', mask_rel)}")
 
-        return image_path, mask_path, metadata_key
+        return image_rel, mask_rel, metadata_key
+
+    def _metadata_key(self, frame_key):
+        """Name of the visualizer Metadata of a frame."""
+        if self.is_video_dataset:
+            video_id, fname = frame_key.split('/', 1)
+            base_name, _ = os.path.splitext(fname)
+            return f"{self.name}_{video_id}_{base_name}"
+        base_name, _ = os.path.splitext(frame_key)
+        return f"{self.name}_{base_name}"
+
+    def has_image(self, frame_key):
+        image_rel, _ = self.frame_relpaths(frame_key)
+        return self.storage.exists("image", image_rel)
+
+    def read_image_bytes(self, frame_key):
+        """Encoded (JPEG) bytes of the original image, from files or shards alike."""
+        image_rel, _ = self.frame_relpaths(frame_key)
+        return self.storage.read_bytes("image", image_rel)
+
+    def _decode_frame(self, image_rel, mask_rel, stage):
+        """Decodes the RGB image and the panoptic id map of a frame."""
+        with timings.measure(f"{stage}.decode_jpeg"):
+            image = np.array(Image.open(self.storage.open("image", image_rel)).convert("RGB"))
+        with timings.measure(f"{stage}.decode_mask"):
+            mask = np.array(Image.open(self.storage.open("mask", mask_rel)))
+        with timings.measure(f"{stage}.rgb2id"):
+            panoptic_seg = rgb2id(mask).astype(np.int32)
+        return image, panoptic_seg
+
+    def category_color(self, cat_id):
+        """RGB color of a category: its "color" entry in the annotation file, or a fixed pseudo-random one."""
+        color = self.categories.get(cat_id, {}).get("color")
+        if color:
+            return tuple(color)
+        return tuple(int(c) for c in np.random.default_rng(cat_id).integers(0, 256, 3))
+
+    @timed("thumbnail.total")
+    def render_thumbnail(self, frame_key, max_size=160, alpha=0.5):
+        """
+        Small RGB array (at most max_size on the longer side) of the image with segments tinted in
+        their category colors. Much cheaper than load_image: the JPEG is decoded at reduced
+        resolution, the mask is downsampled before decoding ids, and no Visualizer is involved,
+        so it is safe to call from worker threads.
+        """
+        image_rel, mask_rel = self.frame_relpaths(frame_key)
+        with timings.measure("thumbnail.decode"):
+            image = Image.open(self.storage.open("image", image_rel))
+            image.draft("RGB", (max_size * 2, max_size * 2))
+            image = image.convert("RGB")
+            image.thumbnail((max_size, max_size))
+            mask = Image.open(self.storage.open("mask", mask_rel)).convert("RGB")
+            mask = mask.resize(image.size, Image.Resampling.NEAREST)
+
+        pixels = np.asarray(image, dtype=np.float32)
+        segment_ids = rgb2id(np.asarray(mask))
+        unique_ids, inverse = np.unique(segment_ids, return_inverse=True)
+        category_of = {seg["id"]: seg["category_id"] for seg in self.segments_info.get(frame_key, [])}
+        palette = np.array(
+            [self.category_color(category_of[i]) if i in category_of else (0, 0, 0) for i in unique_ids],
+            dtype=np.float32
+        )
+        colors = palette[inverse.reshape(segment_ids.shape)]
+        labeled = (segment_ids != 0)[..., None]
+        blended = np.where(labeled, pixels * (1 - alpha) + colors * alpha, pixels)
+        return np.ascontiguousarray(blended.astype(np.uint8))
 
+    @timed("load_image.total")
     def load_image(self, frame_key):
-        image_path, mask_path, metadata_key = self._get_paths_and_key(frame_key)
+        image, vis_img, id_to_label = self.render_arrays(frame_key)
+        with timings.measure("load_image.to_qimage"):
+            qimage = QImage(vis_img.data, vis_img.shape[1], vis_img.shape[0], vis_img.strides[0], QImage.Format.Format_RGB888)
+            # Reuse the decoded image instead of decoding the JPEG a second time; copy() detaches it from the array
+            original_qimage = QImage(image.data, image.shape[1], image.shape[0], image.strides[0], QImage.Format.Format_RGB888).copy()
 
-        image = Image.open(image_path).convert("RGB")
-        mask = np.array(Image.open(mask_path))
-        panoptic_seg = rgb2id(mask).astype(np.int32)
+        return original_qimage, qimage, id_to_label
 
-        segments_info = self.segments_info.get(frame_key)
+    def render_arrays(self, frame_key, segments_info=None):
+        """
+        Decodes a frame and draws its panoptic overlay. Returns (image, overlay, labels) with
+        RGB uint8 arrays. segments_info defaults to the loaded annotations of the frame, so a
+        render_copy() in a worker process can be handed the frame's segments directly.
+        """
+        image_rel, mask_rel, metadata_key = self._get_paths_and_key(frame_key)
+        image, panoptic_seg = self._decode_frame(image_rel, mask_rel, "load_image")
+
+        if segments_info is None:
+            segments_info = self.segments_info.get(frame_key)
         if segments_info is None:
             raise ValueError(f"No segments found for {frame_key}")
-
+        metadata, viz_segments, id_to_label = self._visualizer_segments(metadata_key, segments_info)
+
+        with timings.measure("load_image.visualizer"):
+            visualizer = Visualizer(image, metadata, instance_mode=ColorMode.IMAGE)
+            visualizer._default_font_size = self.font_size
+            vis_output = visualizer.draw_panoptic_seg_predictions(
+                panoptic_seg=torch.from_numpy(panoptic_seg),
+                segments_info=viz_segments
+            )
+            vis_img = vis_output.get_image()
+        self.render_state.put(frame_key, (metadata, viz_segments))
+        return image, np.ascontiguousarray(vis_img), id_to_label
+
+    def _visualizer_segments(self, metadata_key, segments_info):
+        """
+        (Metadata, visualizer segments, labels) of a frame: segments get category ids remapped
+        to per-frame thing/stuff classes named by their segment order, which the labels list.
+        """
         id_to_label = []  # Indexed by segment order
         viz_segments = []  # Segments with category_id remapped for Visualizer
 
@@ -230,51 +785,91 @@ class PanopticDataset(BaseDataset):
 
             viz_segments.append(seg_copy)
 
-        if metadata_key not in MetadataCatalog.list():
-            meta = MetadataCatalog.get(metadata_key)
-            meta.thing_classes = thing_classes
-            meta.stuff_classes = stuff_classes
-
-        visualizer = Visualizer(np.array(image), MetadataCatalog.get(metadata_key), instance_mode=ColorMode.IMAGE)
-        visualizer._default_font_size = self.font_size
-        vis_output = visualizer.draw_panoptic_seg_predictions(
-            panoptic_seg=torch.from_numpy(panoptic_seg),
-            segments_info=viz_segments
-        )
-        self.visualizer_segments[frame_key] = viz_segments
-        vis_img = vis_output.get_image()
-        qimage = QImage(vis_img.data, vis_img.shape[1], vis_img.shape[0], vis_img.strides[0], QImage.Format.Format_RGB888)
-
-        return QImage(image_path), qimage, id_to_label
+        # A standalone Metadata object: registering one per frame in the global MetadataCatalog
+        # would keep every viewed or exported frame's classes alive for the whole process
+        metadata = Metadata(name=metadata_key, thing_classes=thing_classes, stuff_classes=stuff_classes)
+        return metadata, viz_segments, id_to_label
 
+    def render_copy(self):
+        """
+        A picklable copy with only what rendering needs (categories, storage, flags) and none of
+        the per-frame metadata, e.g. to initialize render worker processes cheaply.
+        """
+        clone = copy.copy(self)
+        # Clears the per-frame metadata; render_state is still shared but pickles as an empty cache
+        BaseDataset.reset(clone)
+        clone._segment_geometry = {}
+        clone._segment_index = None
+        return clone
+
+    def snapshot(self):
+        """
+        A copy to load() or refresh() in a background thread while this one stays in use, e.g. by
+        the GUI. The per-frame containers are copied (refresh replaces their values and never
+        mutates them), and the copy gets its own storage (see the storage snapshot()) and an empty
+        render state cache, so neither is changed under this one. Categories are shared; load()
+        and refresh() replace them rather than modifying them.
+        """
+        clone = copy.copy(self)
+        clone.storage = self.storage.snapshot()
+        clone.render_state = LRUCache(self.render_state.name, self.render_state.max_bytes, render_state_size)
+        clone.file_list = list(self.file_list)
+        for name in ("segments_info", "labels", "areas", "coverages", "frame_records", "mask_versions", "_segment_geometry"):
+            setattr(clone, name, dict(getattr(self, name)))
+        clone.annotated_coverage_keys = set(self.annotated_coverage_keys)
+        clone._label_counter = Counter(self._label_counter)
+        clone._area_counter = Counter(self._area_counter)
+        clone.invalidate_frame_index()
+        return clone
+
+    # Attributes making up the loaded metadata, as transferred by metadata_state()
+    METADATA_FIELDS = (
+        "loaded_signature", "file_list", "labels", "areas", "coverages", "segments_info",
+        "all_labels", "goal_freqs", "goal_areas", "goal_mask_counts", "goal_unique_labels",
+        "is_video_dataset", "annotated_coverage_keys", "frame_records", "mask_versions", "_label_counter", "_area_counter",
+        "coverage_mismatches", "categories", "category_id_isthing",
+    )
+
+    def metadata_state(self):
+        """The loaded metadata as a picklable dict, e.g. to hand a loaded dataset to another process."""
+        return {name: getattr(self, name) for name in self.METADATA_FIELDS}
+
+    def set_metadata_state(self, state):
+        """Replaces the loaded metadata by a metadata_state() of a dataset with the same configuration."""
+        self.reset()
+        for name in self.METADATA_FIELDS:
+            setattr(self, name, state[name])
+        self.invalidate_frame_index()
+
+    @timed("segment.total")
     def get_single_segment_visualization(self, frame_key, segment_index):
         """
         Visualizes a single panoptic segment using per-image metadata.
-        Assumes load_image(frame_key) was called beforehand to register metadata.
+        Uses the metadata and segments of the last load_image(frame_key), which is repeated
+        if they were evicted since.
         """
-        image_path, mask_path, metadata_key = self._get_paths_and_key(frame_key)
+        image_rel, mask_rel, _ = self._get_paths_and_key(frame_key)
 
-        image = np.array(Image.open(image_path).convert("RGB"))
-        mask = np.array(Image.open(mask_path))
-        panoptic_seg = torch.from_numpy(rgb2id(mask).astype(np.int32))
-
-        vis_segments = self.visualizer_segments.get(frame_key)
-        if vis_segments is None:
-            raise RuntimeError(f"Visualizer segments not cached for {frame_key}. Call load_image() first.")
+        state = self.render_state.get(frame_key)
+        if state is None:
+            self.load_image(frame_key)
+            state = self.render_state.get(frame_key)
+        metadata, vis_segments = state
 
         if not (0 <= segment_index < len(vis_segments)):
             raise IndexError(f"Invalid segment index {segment_index} for '{frame_key}'")
 
-        if metadata_key not in MetadataCatalog.list():
-            raise KeyError(f"Metadata '{metadata_key}' not registered. Call load_image() first.")
+        image, panoptic_seg = self._decode_frame(image_rel, mask_rel, "segment")
+        panoptic_seg = torch.from_numpy(panoptic_seg)
 
-        visualizer = Visualizer(image, MetadataCatalog.get(metadata_key), instance_mode=ColorMode.IMAGE)
-        visualizer._default_font_size  = self.font_size
-        vis_output = visualizer.draw_panoptic_seg_predictions(
-            panoptic_seg=panoptic_seg,
-            segments_info=[vis_segments[segment_index]]
-        )
-        vis_img = vis_output.get_image()
+        with timings.measure("segment.visualizer"):
+            visualizer = Visualizer(image, metadata, instance_mode=ColorMode.IMAGE)
+            visualizer._default_font_size  = self.font_size
+            vis_output = visualizer.draw_panoptic_seg_predictions(
+                panoptic_seg=panoptic_seg,
+                segments_info=[vis_segments[segment_index]]
+            )
+            vis_img = vis_output.get_image()
 
         return QImage(
             vis_img.data,
@@ -283,3 +878,61 @@ class PanopticDataset(BaseDataset):
             vis_img.strides[0],
             QImage.Format.Format_RGB888
         )
+
+    def segment_geometry(self, frame_key, segment_index):
+        """
+        (bbox, rle) of the segment at segment_index of a frame's segments_info, from the segment
+        index if it covers the frame, otherwise by decoding the frame's mask once.
+        """
+        segments_info = self.segments_info.get(frame_key, [])
+        if not (0 <= segment_index < len(segments_info)):
+            raise IndexError(f"Invalid segment index {segment_index} for '{frame_key}'")
+
+        if frame_key not in self._segment_geometry:
+            self._segment_geometry.update(compute_segment_geometry(self, [frame_key], workers=1))
+        frame_geometry = self._segment_geometry.get(frame_key)
+        found = None if frame_geometry is None else find_segment(frame_geometry, segments_info[segment_index]["id"])
+        if found is None:
+            raise ValueError(f"Segment {segment_index} of '{frame_key}' has no pixels in its mask")
+        bbox, _, rle = found
+        return bbox, rle
+
+    @timed("zoom.total")
+    def render_segment_zoom(self, frame_key, segment_index, padding=0.25, target_size=640):
+        """
+        Renders only the region around one segment: the image is cropped to the segment's bbox
+        (plus padding on each side) and the segment's mask is rebuilt from its RLE, so no mask is
+        decoded once the frame is indexed. The crop is upscaled to about target_size pixels.
+        """
+        bbox, rle = self.segment_geometry(frame_key, segment_index)
+        x, y, width, height = (int(v) for v in bbox)
+        image_rel, _ = self.frame_relpaths(frame_key)
+        with timings.measure("zoom.decode_jpeg"):
+            image = Image.open(self.storage.open("image", image_rel)).convert("RGB")
+
+        pad_x, pad_y = max(2, int(width * padding)), max(2, int(height * padding))
+        left, top = max(0, x - pad_x), max(0, y - pad_y)
+        right, bottom = min(image.width, x + width + pad_x), min(image.height, y + height + pad_y)
+        crop = np.array(image.crop((left, top, right, bottom)))
+
+        seg = self.segments_info[frame_key][segment_index]
+        panoptic_seg = np.zeros(crop.shape[:2], dtype=np.int32)
+        segment_mask = rle_decode(rle, height, width)
+        panoptic_seg[y - top:y - top + height, x - left:x - left + width][segment_mask] = seg["id"]
+
+        is_thing = self.category_id_isthing.get(seg["category_id"], 0) == 1
+        classes = [f"{segment_index}"]
+        metadata = Metadata(
+            name=f"{self.name}_zoom", thing_classes=classes if is_thing else [], stuff_classes=[] if is_thing else classes
+        )
+        scale = max(1.0, min(8.0, target_size / max(crop.shape[:2])))
+
+        with timings.measure("zoom.visualizer"):
+            visualizer = Visualizer(crop, metadata, scale=scale, instance_mode=ColorMode.IMAGE)
+            vis_output = visualizer.draw_panoptic_seg_predictions(
+                panoptic_seg=torch.from_numpy(panoptic_seg),
+                segments_info=[dict(seg, category_id=0, isthing=is_thing)]
+            )
+            vis_img = np.ascontiguousarray(vis_output.get_image())
+
+        return QImage(vis_img.data, vis_img.shape[1], vis_img.shape[0], vis_img.strides[0], QImage.Format.Format_RGB888).copy()
@@ -0,0 +1,142 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+
+
+def category_area_distances(index):
+    """
+    Distance of every frame to the previous row of the FrameIndex: half the L1 distance
+    between their normalized category-area vectors (0 = same label composition, 1 = disjoint).
+
+    Frames without area information fall back to their segment counts. The sparse
+    (frame, category) entries of both frames are merged with np.unique, so the cost is
+    linear in the number of entries.
+    """
+    n = index.num_frames
+    num_cols = max(index.num_categories, 1)
+    distances = np.zeros(n, dtype=np.float64)
+    if n == 0 or index.entry_frame.size == 0:
+        return distances
+
+    area_totals = np.bincount(index.entry_frame, weights=index.entry_area, minlength=n)
+    count_totals = np.bincount(index.entry_frame, weights=index.entry_count, minlength=n)
+    use_area = area_totals[index.entry_frame] > 0
+    values = np.where(
+        use_area,
+        index.entry_area / np.maximum(area_totals[index.entry_frame], 1e-12),
+        index.entry_count / np.maximum(count_totals[index.entry_frame], 1e-12),
+    )
+
+    # Entry (f, c) counts positively for the pair (f - 1, f) and negatively for (f, f + 1),
+    # both keyed by the later frame of the pair
+    pair_frame = np.concatenate([index.entry_frame, index.entry_frame + 1])
+    pair_cat = np.concatenate([index.entry_cat, index.entry_cat])
+    pair_value = np.concatenate([values, -values])
+    keep = pair_frame < n
+    keys, inverse = np.unique(pair_frame[keep] * num_cols + pair_cat[keep], return_inverse=True)
+    differences = np.abs(np.bincount(inverse, weights=pair_value[keep], minlength=keys.size))
+    distances = 0.5 * np.bincount(keys // num_cols, weights=differences, minlength=n)
+    distances[0] = 0.0
+    return distances
+
+
+def dhash(image_bytes, hash_size=8):
+    """Difference hash of an encoded image as a 64-bit integer (hash_size * hash_size bits, hash_size <= 8)."""
+    image = Image.open(io.BytesIO(image_bytes))
+    # JPEG draft mode decodes at a fraction of the resolution, which is all a tiny hash needs
+    image.draft("L", (hash_size * 8, hash_size * 8))
+    pixels = np.asarray(image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR), dtype=np.int16)
+    bits = np.zeros(64, dtype=bool)
+    bits[:hash_size * hash_size] = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int(np.packbits(bits, bitorder="little").view(np.uint64)[0])
+
+
+def compute_dhashes(dataset, frame_keys, hash_size=8, workers=8):
+    """Difference hashes of the frames' original images, read through dataset.read_image_bytes."""
+    def hash_frame(frame_key):
+        try:
+            return dhash(dataset.read_image_bytes(frame_key), hash_size)
+        except Exception as e:
+            print(f"Warning: Could not hash image of {frame_key}. Error: {e}")
+            return 0
+
+    # Decoding releases the GIL, so threads overlap the reads and decodes
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        hashes = list(pool.map(hash_frame, frame_keys, chunksize=64))
+    return np.array(hashes, dtype=np.uint64)
+
+
+def hamming_to_previous(hashes):
+    """Number of differing bits between each hash and the previous one (0 for the first)."""
+    distances = np.zeros(hashes.size, dtype=np.int64)
+    if hashes.size > 1:
+        differing = np.bitwise_xor(hashes[1:], hashes[:-1])
+        distances[1:] = np.unpackbits(differing.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+    return distances
+
+
+class RedundancyIndex:
+    """
+    Groups consecutive frames of each video into runs of near-duplicates.
+
+    A frame continues the run of the previous frame in its video when the category-area
+    distance between them is at most area_threshold and, if image hashes are given, their
+    hashes differ in at most hash_threshold bits. Because only neighbours are compared,
+    slow changes can chain into long runs; max_run_length splits those into pieces.
+
+    Image datasets have no temporal order, so every frame is its own run there.
+    """
+
+    def __init__(self, index, area_threshold=0.1, hashes=None, hash_threshold=6, max_run_length=None):
+        self.index = index
+        self.area_threshold = area_threshold
+        self.hash_threshold = hash_threshold
+        self.max_run_length = max_run_length
+        n = index.num_frames
+
+        self.area_distances = category_area_distances(index)
+        self.hash_distances = hamming_to_previous(hashes) if hashes is not None else None
+
+        if not index.video_ids:
+            starts = np.ones(n, dtype=bool)
+        else:
+            starts = np.r_[True, np.diff(index.video_codes) != 0] if n else np.zeros(0, dtype=bool)
+            starts |= self.area_distances > area_threshold
+            if self.hash_distances is not None:
+                starts |= self.hash_distances > hash_threshold
+            if max_run_length and n:
+                start_rows = np.flatnonzero(starts)
+                run_start = start_rows[np.cumsum(starts) - 1]
+                starts |= (np.arange(n) - run_start) % max_run_length == 0
+
+        self.run_starts = starts
+        self.run_ids = np.cumsum(starts) - 1
+        self.num_runs = int(starts.sum())
+        start_rows = np.flatnonzero(starts)
+        self.run_lengths = np.diff(np.r_[start_rows, n])
+        self.representative_mask = np.zeros(n, dtype=bool)
+        self.representative_mask[start_rows + self.run_lengths // 2] = True
+
+    def representatives(self, mask=None):
+        """
+        One frame per run among the rows set in mask (all rows if None): the middle one of
+        the run's rows in mask. Runs without rows in mask get no representative.
+        """
+        if mask is None:
+            return self.representative_mask.copy()
+        rows = np.flatnonzero(mask)
+        result = np.zeros(self.index.num_frames, dtype=bool)
+        if rows.size == 0:
+            return result
+        run_ids = self.run_ids[rows]
+        group_start = np.r_[0, np.flatnonzero(np.diff(run_ids)) + 1]
+        group_sizes = np.diff(np.r_[group_start, rows.size])
+        result[rows[group_start + group_sizes // 2]] = True
+        return result
+
+    def duplicate_count(self, mask=None):
+        """Number of rows in mask that are not representatives of their run."""
+        representatives = self.representatives(mask)
+        total = self.index.num_frames if mask is None else int(mask.sum())
+        return total - int(representatives.sum())
@@ -0,0 +1,170 @@
+import os
+import pickle
+import secrets
+import threading
+import time
+from multiprocessing.connection import Client
+from datasets.base_dataset import LoadCancelled
+from datasets.panoptic_dataset import PanopticDataset
+
+# Loopback only; requests and replies are pickles, so never expose the server to other hosts
+DEFAULT_ADDRESS = "127.0.0.1:6150"
+# Created by serve_metadata.py with a random secret unless the config sets "authkey" or "authkey_file"
+DEFAULT_AUTHKEY_FILE = "metadata_server.key"
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def parse_address(address):
+    """
+    "host:port" for a TCP socket (keep the host on 127.0.0.1 for local use), anything else is
+    the path of a Unix domain socket.
+    """
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def is_loopback(address):
+    """True for Unix socket paths and TCP addresses on the local host only."""
+    parsed = parse_address(address)
+    return not isinstance(parsed, tuple) or parsed[0] in LOOPBACK_HOSTS
+
+
+def read_authkey(server_config, create=False):
+    """
+    The shared secret of the metadata server: the config's "authkey", or else the contents of
+    its "authkey_file" (default DEFAULT_AUTHKEY_FILE). With create (the server), a missing key
+    file is created with a random secret, readable only by the current user. Raises ValueError
+    if there is no secret or the key file is readable by other users.
+    """
+    authkey = server_config.get("authkey")
+    if authkey:
+        return authkey
+
+    path = server_config.get("authkey_file", DEFAULT_AUTHKEY_FILE)
+    if create and not os.path.exists(path):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        print(f"Created a new metadata server key in {path}.")
+    try:
+        if os.name == "posix" and os.stat(path).st_mode & 0o077:
+            raise ValueError(f"Metadata server key file {path} is accessible by other users; run 'chmod 600 {path}'.")
+        with open(path, "r") as f:
+            authkey = f.read().strip()
+    except FileNotFoundError:
+        raise ValueError(
+            f"No metadata server key: set 'authkey' in the 'server' section of config.json, or start "
+            f"serve_metadata.py once to create {path}."
+        ) from None
+    if not authkey:
+        raise ValueError(f"Metadata server key file {path} is empty.")
+    return authkey
+
+
+class MetadataClient:
+    """
+    Connection to a MetadataServer (see serve_metadata.py). Every thread gets its own
+    connection, so a long request (e.g. the server loading a dataset) does not hold up renders
+    requested by other threads. Picklable, so render worker processes reconnect on their own.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return {"address": self.address, "authkey": self.authkey}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def call(self, method, *args):
+        """Runs method on the server and returns its result. Raises ConnectionError if the server is unreachable."""
+        connection = getattr(self._local, "connection", None)
+        try:
+            if connection is None:
+                connection = Client(parse_address(self.address), authkey=self.authkey.encode())
+                self._local.connection = connection
+            connection.send((method, args))
+            status, value = connection.recv()
+        except (EOFError, OSError) as e:
+            self._local.connection = None
+            raise ConnectionError(f"Metadata server at {self.address} is not reachable: {e}") from e
+        if status == "error":
+            raise RuntimeError(f"Metadata server could not run '{method}': {value}")
+        return value
+
+
+class RemoteDataset(PanopticDataset):
+    """
+    A PanopticDataset whose metadata is loaded once by a MetadataServer and copied from it, and
+    whose overlays are rendered by the server into a render cache shared by all its clients.
+    Selections and everything built from the metadata (frame index, filters) stay local.
+
+    Images and masks remain readable through the dataset's own storage, so thumbnails and
+    segment views work as usual; the server only needs to run on the same machine.
+    """
+
+    # The server's source signature is asked for again after this many seconds
+    SIGNATURE_MAX_AGE = 2.0
+
+    def __init__(self, name, client: MetadataClient, **params):
+        super().__init__(name, **params)
+        self.client = client
+        # (time.monotonic() of the fetch, signature) of the last successful fetch or load
+        self._signature = None
+
+    def load(self, progress_callback=None, should_cancel=None):
+        """Copies the metadata from the server, which loads or refreshes the dataset first if needed."""
+        print(f"Fetching {self.name} from the metadata server at {self.client.address}...")
+        if progress_callback is not None:
+            progress_callback(0, 1)
+        state = pickle.loads(self.client.call("metadata", self.name))
+        if should_cancel is not None and should_cancel():
+            self.reset()
+            print(f"Loading {self.name} was cancelled.")
+            raise LoadCancelled(self.name)
+        self.set_metadata_state(state)
+        self._signature = (time.monotonic(), self.loaded_signature)
+        if progress_callback is not None:
+            progress_callback(1, 1)
+        print(f"{self.name} dataset loaded from the server: {len(self.file_list)} files.")
+
+    def refresh(self, progress_callback=None, should_cancel=None):
+        """The server refreshes incrementally; this only copies its result. Returns (added, removed, changed)."""
+        previous = self.frame_records
+        self.load(progress_callback, should_cancel)
+        added = sum(1 for frame_key in self.frame_records if frame_key not in previous)
+        removed = sum(1 for frame_key in previous if frame_key not in self.frame_records)
+        changed = sum(1 for frame_key, record in self.frame_records.items() if frame_key in previous and previous[frame_key] != record)
+        return added, removed, changed
+
+    def source_signature(self):
+        """
+        The server's view of the source files, so a client sees the dataset as stale exactly when
+        the server would reload it. Called from the GUI thread (is_dataset_ready), so a recent
+        value is reused rather than asked for again, and an unreachable server gives None: the
+        dataset then counts as not ready instead of raising.
+        """
+        cached = self._signature
+        if cached is not None and time.monotonic() - cached[0] < self.SIGNATURE_MAX_AGE:
+            return cached[1]
+        try:
+            signature = self.client.call("signature", self.name)
+        except (ConnectionError, RuntimeError) as e:
+            print(f"Warning: Could not get the source signature of {self.name}. Error: {e}")
+            return None
+        self._signature = (time.monotonic(), signature)
+        return signature
+
+    def render_arrays(self, frame_key, segments_info=None):
+        image, overlay, labels = self.client.call("render", self.name, frame_key)
+        if segments_info is None:
+            segments_info = self.segments_info.get(frame_key, [])
+        # The visualizer state for single-segment views is cheap to rebuild locally
+        metadata, viz_segments, _ = self._visualizer_segments(self._metadata_key(frame_key), segments_info)
+        self.render_state.put(frame_key, (metadata, viz_segments))
+        return image, overlay, labels
@@ -0,0 +1,191 @@
+import os
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+from PyQt6.QtGui import QImage
+
+# Enough for an original and an overlay of up to ~2.9k x 1.9k pixels
+DEFAULT_SLOT_BYTES = 32 * 1024 * 1024
+
+
+def attach_shared_memory(name):
+    """Attaches to an existing block without letting this process's resource tracker unlink it at exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        block = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+
+# State of a render worker process
+_worker_dataset = None
+_worker_blocks = {}
+
+
+def _init_worker(dataset):
+    global _worker_dataset
+    _worker_dataset = dataset
+
+
+def _render_into_slot(frame_key, segments_info, slot_name, slot_bytes):
+    """Runs in a worker process: renders a frame and writes original and overlay back to back into the slot."""
+    image, overlay, labels = _worker_dataset.render_arrays(frame_key, segments_info)
+    needed = image.nbytes + overlay.nbytes
+    if needed > slot_bytes:
+        raise ValueError(f"Rendered {frame_key} needs {needed} bytes, more than a slot holds ({slot_bytes}).")
+
+    block = _worker_blocks.get(slot_name)
+    if block is None:
+        block = _worker_blocks[slot_name] = attach_shared_memory(slot_name)
+    buffer = np.frombuffer(block.buf, dtype=np.uint8, count=needed)
+    buffer[:image.nbytes] = np.ascontiguousarray(image).reshape(-1)
+    buffer[image.nbytes:] = overlay.reshape(-1)
+    return image.shape, overlay.shape, labels
+
+
+def wrap_qimage(array):
+    """QImage over an RGB uint8 array without copying. The array must outlive the QImage."""
+    return QImage(array.data, array.shape[1], array.shape[0], array.strides[0], QImage.Format.Format_RGB888)
+
+
+class RenderedFrame:
+    """
+    A frame rendered by a RenderService. image and overlay are views into a shared-memory slot:
+    they (and QImages wrapping them) are valid until release() hands the slot back.
+    """
+
+    def __init__(self, service, slot, frame_key, image_shape, overlay_shape, labels):
+        self.service = service
+        self.frame_key = frame_key
+        self.labels = labels
+        self._slot = slot
+        buffer = service._blocks[slot].buf
+        image_bytes = int(np.prod(image_shape))
+        self.image = np.frombuffer(buffer, dtype=np.uint8, count=image_bytes).reshape(image_shape)
+        self.overlay = np.frombuffer(
+            buffer, dtype=np.uint8, count=int(np.prod(overlay_shape)), offset=image_bytes
+        ).reshape(overlay_shape)
+
+    def qimages(self):
+        """(original, overlay) QImages wrapping the shared buffers directly. Valid until release()."""
+        return wrap_qimage(self.image), wrap_qimage(self.overlay)
+
+    def detached(self):
+        """(original, overlay, labels) like PanopticDataset.load_image, copied out of the slot."""
+        original, overlay = self.qimages()
+        return original.copy(), overlay.copy(), self.labels
+
+    def release(self):
+        if self._slot is not None:
+            # Drop the views first: a block cannot be closed while arrays still export its buffer
+            self.image = self.overlay = None
+            self.service._release_slot(self._slot)
+            self._slot = None
+
+
+class RenderService:
+    """
+    Renders frames of a loaded PanopticDataset in a pool of worker processes, so the CPU-bound
+    detectron2/matplotlib drawing scales across cores instead of contending for the GIL.
+
+    Results are written into a fixed set of shared-memory slots allocated here; the number of
+    slots bounds the frames in flight plus the frames held by callers. Workers start with a
+    render_copy() of the dataset and receive each frame's segments with the request.
+    """
+
+    def __init__(self, dataset, workers=None, slots=None, slot_bytes=DEFAULT_SLOT_BYTES):
+        self.dataset = dataset
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.num_slots = slots or 2 * self.workers
+        self.slot_bytes = slot_bytes
+        self._blocks = [shared_memory.SharedMemory(create=True, size=slot_bytes) for _ in range(self.num_slots)]
+        self._free_slots = list(range(self.num_slots))
+        self._slots_available = threading.Condition()
+
+        # Forking a process that runs Qt and threads is unsafe, so workers are spawned
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(dataset.render_copy(),),
+        )
+
+    def _acquire_slot(self, block):
+        with self._slots_available:
+            while not self._free_slots:
+                if not block:
+                    return None
+                self._slots_available.wait()
+            return self._free_slots.pop()
+
+    def _release_slot(self, slot):
+        with self._slots_available:
+            self._free_slots.append(slot)
+            self._slots_available.notify()
+
+    def submit(self, frame_key, block=True):
+        """
+        Queues a frame for rendering. Returns a Future resolving to a RenderedFrame, or None if
+        block is False and all slots are in use.
+        """
+        slot = self._acquire_slot(block)
+        if slot is None:
+            return None
+
+        result = Future()
+
+        def on_done(future):
+            try:
+                image_shape, overlay_shape, labels = future.result()
+                result.set_result(RenderedFrame(self, slot, frame_key, image_shape, overlay_shape, labels))
+            except BaseException as e:
+                self._release_slot(slot)
+                result.set_exception(e)
+
+        try:
+            future = self._executor.submit(
+                _render_into_slot, frame_key, self.dataset.segments_info.get(frame_key),
+                self._blocks[slot].name, self.slot_bytes
+            )
+        except BaseException:
+            self._release_slot(slot)
+            raise
+        future.add_done_callback(on_done)
+        return result
+
+    def render_many(self, frame_keys):
+        """
+        Renders frames in parallel and yields (frame_key, RenderedFrame or None, error or None)
+        in input order. Release each frame before advancing the generator: the next submissions
+        wait for free slots.
+        """
+        pending = deque()
+        for frame_key in frame_keys:
+            if len(pending) == self.num_slots:
+                yield self._collect(*pending.popleft())
+            pending.append((frame_key, self.submit(frame_key)))
+        while pending:
+            yield self._collect(*pending.popleft())
+
+    @staticmethod
+    def _collect(frame_key, future):
+        try:
+            return frame_key, future.result(), None
+        except Exception as e:
+            return frame_key, None, e
+
+    def shutdown(self):
+        """Stops the workers and frees the shared memory. Frames not yet released become invalid."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                # A RenderedFrame still references this block; it is freed when that goes away
+                pass
+            block.unlink()
+        self._blocks = []
@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+def frame_segment_geometry(panoptic_seg):
+    """
+    Geometry of every non-zero segment id in an id map, as (ids, bboxes, areas, rles):
+    bboxes[i] is (x, y, width, height), areas[i] the pixel count and rles[i] the segment's mask
+    inside its bbox (see rle_decode). One sort of the id map serves all segments.
+    """
+    height, width = panoptic_seg.shape
+    flat = panoptic_seg.ravel()
+    order = np.argsort(flat, kind="stable")
+    ids, starts, counts = np.unique(flat[order], return_index=True, return_counts=True)
+
+    keep = ids != 0
+    ids, starts, counts = ids[keep], starts[keep], counts[keep]
+    bboxes = np.empty((len(ids), 4), dtype=np.int32)
+    rles = []
+    for i, (start, count) in enumerate(zip(starts, counts)):
+        # The stable sort keeps each segment's pixels in row-major order
+        ys, xs = np.divmod(order[start:start + count], width)
+        x0, y0 = xs.min(), ys[0]
+        box_width = xs.max() - x0 + 1
+        bboxes[i] = (x0, y0, box_width, ys[-1] - y0 + 1)
+        rles.append(rle_encode((ys - y0) * box_width + (xs - x0)))
+    return ids.astype(np.int64), bboxes, counts.astype(np.int64), rles
+
+
+def rle_encode(positions):
+    """
+    Run-length encodes ascending flat pixel positions (row-major inside a bbox) as alternating
+    background and foreground run lengths, starting with background (possibly 0), as in COCO RLE.
+    """
+    breaks = np.flatnonzero(np.diff(positions) != 1)
+    run_starts = np.concatenate(([positions[0]], positions[breaks + 1]))
+    run_ends = np.concatenate((positions[breaks], [positions[-1]])) + 1
+    rle = np.empty(2 * len(run_starts), dtype=np.uint32)
+    rle[0::2] = run_starts - np.concatenate(([0], run_ends[:-1]))
+    rle[1::2] = run_ends - run_starts
+    return rle
+
+
+def rle_decode(rle, height, width):
+    """Boolean (height, width) mask of an rle_encode() run-length encoding."""
+    ends = np.cumsum(rle, dtype=np.int64)
+    delta = np.zeros(height * width + 1, dtype=np.int32)
+    delta[ends[0::2]] += 1
+    delta[ends[1::2]] -= 1
+    return (np.cumsum(delta[:-1]) > 0).reshape(height, width)
+
+
+def find_segment(frame_geometry, segment_id):
+    """(bbox, area, rle) of a segment id in a frame_segment_geometry result, or None if it has no pixels."""
+    ids, bboxes, areas, rles = frame_geometry
+    position = np.flatnonzero(ids == segment_id)
+    if position.size == 0:
+        return None
+    i = position[0]
+    return bboxes[i], int(areas[i]), rles[i]
+
+
+def compute_segment_geometry(dataset, frame_keys, workers=8, progress_callback=None, should_cancel=None):
+    """
+    {frame_key: frame_segment_geometry} of the given frames, decoding their masks in parallel
+    through dataset.decode_mask. Callbacks work like in PanopticDataset.load(); cancelling
+    returns the frames done so far.
+    """
+    def geometry(frame_key):
+        try:
+            return frame_segment_geometry(dataset.decode_mask(frame_key))
+        except Exception as e:
+            print(f"Warning: Could not index segments of {frame_key}. Error: {e}")
+            return None
+
+    results = {}
+    chunk_size = 256
+    # Decoding and sorting release the GIL, so threads overlap them
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(frame_keys), chunk_size):
+            if should_cancel is not None and should_cancel():
+                break
+            chunk = frame_keys[start:start + chunk_size]
+            for frame_key, frame_geometry in zip(chunk, pool.map(geometry, chunk)):
+                if frame_geometry is not None:
+                    results[frame_key] = frame_geometry
+            if progress_callback is not None:
+                progress_callback(min(start + len(chunk), len(frame_keys)), len(frame_keys))
+    return results
+
+
+class SegmentIndex:
+    """
+    Columnar (numpy) per-segment geometry of a loaded dataset, aligned with its FrameIndex:
+    segment j belongs to row segment_row[j] and has category segment_category[j] (-1 for ids
+    without an entry in segments_info), pixel area segment_area[j] and bbox segment_bbox[j].
+    Queries are answered without decoding any masks.
+    """
+
+    def __init__(self, dataset, geometry):
+        self.index = dataset.get_frame_index()
+        self.geometry = geometry
+
+        rows, categories, areas, bboxes = [], [], [], []
+        for row, frame_key in enumerate(self.index.frame_keys):
+            frame_geometry = geometry.get(frame_key)
+            if frame_geometry is None:
+                continue
+            ids, frame_bboxes, frame_areas, _ = frame_geometry
+            category_of = {seg["id"]: seg["category_id"] for seg in dataset.segments_info.get(frame_key, [])}
+            rows.append(np.full(len(ids), row, dtype=np.int64))
+            categories.append(np.fromiter((category_of.get(int(i), -1) for i in ids), dtype=np.int64, count=len(ids)))
+            areas.append(frame_areas)
+            bboxes.append(frame_bboxes)
+
+        self.segment_row = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        self.segment_category = np.concatenate(categories) if categories else np.zeros(0, dtype=np.int64)
+        self.segment_area = np.concatenate(areas) if areas else np.zeros(0, dtype=np.int64)
+        self.segment_bbox = np.concatenate(bboxes) if bboxes else np.zeros((0, 4), dtype=np.int32)
+
+    def segment(self, frame_key, segment_id):
+        """(bbox, area, rle) of one segment, or None if the frame or segment is not indexed."""
+        frame_geometry = self.geometry.get(frame_key)
+        return None if frame_geometry is None else find_segment(frame_geometry, segment_id)
+
+    def frames_with_small_segment(self, category_id, max_area):
+        """Boolean mask over index rows of frames with a segment of category_id smaller than max_area pixels."""
+        match = (self.segment_category == category_id) & (self.segment_area < max_area)
+        mask = np.zeros(self.index.num_frames, dtype=bool)
+        mask[self.segment_row[match]] = True
+        return mask
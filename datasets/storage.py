@@ -0,0 +1,263 @@
+import os
+import io
+import copy
+import json
+import mmap
+import struct
+import tarfile
+import zipfile
+import threading
+from datasets.manifest import DirectoryManifest
+
+SHARD_INDEX_FILE = "index.json"
+SHARD_INDEX_VERSION = 1
+
+# Entry names inside shards are "<kind>/<relative path>", kind being "image" or "mask"
+KINDS = ("image", "mask")
+
+
+class DirectoryStorage:
+    """Reads images and masks as individual files below image_dir and mask_dir (the original layout)."""
+
+    def __init__(self, image_dir, mask_dir):
+        self.image_dir = image_dir
+        self.mask_dir = mask_dir
+        # kind -> DirectoryManifest once scan() ran; until then exists() asks the filesystem
+        self.manifests = None
+
+    def local_path(self, kind, relpath):
+        root = self.image_dir if kind == "image" else self.mask_dir
+        return os.path.join(root, relpath)
+
+    def scan(self, workers=8, previous=None):
+        """
+        Lists image_dir and mask_dir into manifests, so exists() is answered from memory.
+        previous is the manifests of an earlier scan (e.g. from the metadata cache); only its
+        directories that changed since are listed again. Returns the number of directories listed.
+        """
+        manifests = {}
+        listed = 0
+        for kind in KINDS:
+            root = self.image_dir if kind == "image" else self.mask_dir
+            manifest = (previous or {}).get(kind)
+            if manifest is None or manifest.root != root:
+                manifest = DirectoryManifest(root)
+            listed += manifest.scan(workers)
+            manifests[kind] = manifest
+        self.manifests = manifests
+        return listed
+
+    def exists(self, kind, relpath):
+        if self.manifests is not None:
+            return self.manifests[kind].exists(relpath)
+        return os.path.exists(self.local_path(kind, relpath))
+
+    def snapshot(self):
+        """A copy with its own manifests, so rescanning it leaves this one as it is."""
+        clone = copy.copy(self)
+        if self.manifests is not None:
+            # scan() replaces a manifest's listing rather than modifying it, so shallow copies suffice
+            clone.manifests = {kind: copy.copy(manifest) for kind, manifest in self.manifests.items()}
+        return clone
+
+    def version(self, kind, relpath):
+        """
+        Changes when the file may have changed: the mtime of its directory from the manifest
+        (files are typically replaced by writing and renaming, which updates it), or the file's
+        own mtime before scan(). Costs no filesystem access after scan(); see file_version().
+        """
+        if self.manifests is not None:
+            return self.manifests[kind].directory_mtime(relpath)
+        try:
+            return os.stat(self.local_path(kind, relpath)).st_mtime_ns
+        except OSError:
+            return None
+
+    def file_version(self, kind, relpath):
+        """
+        The file's current (mtime_ns, size), or None if it is missing. One stat, so it also
+        notices files rewritten in place or copied over with their original mtime (cp -p) as
+        long as the mtime or size differs from the file they replace.
+        """
+        try:
+            st = os.stat(self.local_path(kind, relpath))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def open(self, kind, relpath):
+        return open(self.local_path(kind, relpath), "rb")
+
+    def read_bytes(self, kind, relpath):
+        with self.open(kind, relpath) as f:
+            return f.read()
+
+    def describe(self, kind, relpath):
+        return self.local_path(kind, relpath)
+
+
+class ShardStorage:
+    """
+    Reads images and masks packed into uncompressed tar or zip shards.
+
+    An index (index.json in shard_dir) maps every "<kind>/<relative path>" to
+    (shard number, data offset, size). Shards are memory-mapped on first use, so a
+    read is a dictionary lookup plus a slice of the mapping: no per-file open or stat,
+    which is what makes millions of small files slow on network filesystems.
+    """
+
+    def __init__(self, shard_dir):
+        self.shard_dir = shard_dir
+        self.index_path = os.path.join(shard_dir, SHARD_INDEX_FILE)
+        self._maps = {}
+        self._lock = threading.Lock()
+        # (mtime_ns, size) of index.json when it was read
+        self.index_version = None
+        self._read_index()
+
+    def _index_stat(self):
+        st = os.stat(self.index_path)
+        return st.st_mtime_ns, st.st_size
+
+    def _read_index(self):
+        index_version = self._index_stat()
+        with open(self.index_path, "r") as f:
+            index = json.load(f)
+        if index.get("version") != SHARD_INDEX_VERSION:
+            raise ValueError(f"Unsupported shard index version {index.get('version')} in '{self.index_path}'.")
+
+        with self._lock:
+            old_maps = self._maps
+            self.shards = index["shards"]
+            self.entries = index["entries"]
+            self._maps = {}
+            self.index_version = index_version
+        for shard_map in old_maps.values():
+            try:
+                shard_map.close()
+            except BufferError:
+                # A reader still holds a view of the old shard; the mapping closes once it is released
+                pass
+
+    def _map(self, shard_number):
+        shard_map = self._maps.get(shard_number)
+        if shard_map is None:
+            with self._lock:
+                shard_map = self._maps.get(shard_number)
+                if shard_map is None:
+                    with open(os.path.join(self.shard_dir, self.shards[shard_number]), "rb") as f:
+                        shard_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._maps[shard_number] = shard_map
+        return shard_map
+
+    def scan(self, workers=8, previous=None):
+        """
+        Rereads index.json (and reopens the shards) if it changed since it was read, e.g. because
+        the shards were re-packed, so refresh() sees the new entries. There are no directories to
+        list, so this always returns 0.
+        """
+        if self._index_stat() != self.index_version:
+            self._read_index()
+        return 0
+
+    def snapshot(self):
+        """
+        A copy with its own shard mappings, so rescanning it (which may reread the index and close
+        its mappings) leaves this one readable. The index is shared until either rereads it.
+        """
+        clone = copy.copy(self)
+        clone._maps = {}
+        clone._lock = threading.Lock()
+        return clone
+
+    def exists(self, kind, relpath):
+        return f"{kind}/{relpath}" in self.entries
+
+    def version(self, kind, relpath):
+        """The file's (shard, offset, size) entry, which changes whenever the shards are rebuilt with a new file (after scan())."""
+        entry = self.entries.get(f"{kind}/{relpath}")
+        return tuple(entry) if entry is not None else None
+
+    def file_version(self, kind, relpath):
+        """The file's entry together with the version of index.json it is from, as re-packing can reuse an entry for new data."""
+        entry = self.entries.get(f"{kind}/{relpath}")
+        return (tuple(entry), self.index_version) if entry is not None else None
+
+    def read_view(self, kind, relpath):
+        """Zero-copy memoryview of the file's bytes inside the mapped shard."""
+        entry = self.entries.get(f"{kind}/{relpath}")
+        if entry is None:
+            raise FileNotFoundError(f"'{kind}/{relpath}' is not in the shards of {self.shard_dir}")
+        shard_number, offset, size = entry
+        return memoryview(self._map(shard_number))[offset:offset + size]
+
+    def open(self, kind, relpath):
+        return io.BytesIO(self.read_view(kind, relpath))
+
+    def read_bytes(self, kind, relpath):
+        return self.read_view(kind, relpath).tobytes()
+
+    def describe(self, kind, relpath):
+        return f"{self.shard_dir}::{kind}/{relpath}"
+
+    def __getstate__(self):
+        # Memory maps cannot be pickled (e.g. when sent to worker processes); they are reopened lazily
+        state = self.__dict__.copy()
+        state["_maps"] = {}
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def _zip_data_offset(shard_file, info):
+    """Offset of a zip member's data: its local header offset plus the local header length."""
+    shard_file.seek(info.header_offset)
+    header = shard_file.read(30)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return info.header_offset + 30 + name_length + extra_length
+
+
+def index_shard(shard_path):
+    """Lists (entry name, data offset, size) of the uncompressed members of a tar or zip shard."""
+    members = []
+    if zipfile.is_zipfile(shard_path):
+        with zipfile.ZipFile(shard_path) as archive, open(shard_path, "rb") as shard_file:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"'{info.filename}' in '{shard_path}' is compressed; shards must be stored uncompressed.")
+                members.append((info.filename, _zip_data_offset(shard_file, info), info.file_size))
+    else:
+        with tarfile.open(shard_path, "r:") as archive:
+            for info in archive:
+                if info.isfile():
+                    members.append((info.name, info.offset_data, info.size))
+    return members
+
+
+def write_shard_index(shard_dir, shard_names):
+    """Scans the given shards and writes index.json for ShardStorage. Returns the number of entries."""
+    entries = {}
+    for shard_number, shard_name in enumerate(shard_names):
+        for name, offset, size in index_shard(os.path.join(shard_dir, shard_name)):
+            kind = name.split("/", 1)[0]
+            if kind not in KINDS:
+                continue
+            entries[name] = [shard_number, offset, size]
+
+    with open(os.path.join(shard_dir, SHARD_INDEX_FILE), "w") as f:
+        json.dump({"version": SHARD_INDEX_VERSION, "shards": list(shard_names), "entries": entries}, f)
+    return len(entries)
+
+
+def create_storage(image_dir=None, mask_dir=None, shard_dir=None):
+    """Returns the storage backend for a dataset config entry."""
+    if shard_dir:
+        return ShardStorage(shard_dir)
+    if not image_dir or not mask_dir:
+        raise ValueError("A dataset needs either 'shard_dir' or both 'image_dir' and 'mask_dir'.")
+    return DirectoryStorage(image_dir, mask_dir)
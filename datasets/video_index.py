@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class VideoIndex:
+    """
+    Per-video aggregates of a video dataset's FrameIndex, computed in a few vectorized passes:
+
+        frame_counts[v]            -> number of frames of video v
+        mean_coverage[v]           -> mean frame coverage (%)
+        min_coverage[v]            -> lowest frame coverage (%)
+        category_frames[v, c]      -> number of frames containing category column c
+        category_areas[v, c]       -> total area of category column c over the video's frames
+        total_areas[v]             -> total annotated area over the video's frames
+
+    Video v is index.video_ids[v]; its frames are the rows with index.video_codes == v.
+    """
+
+    SORT_KEYS = ("name", "frames", "mean_coverage", "min_coverage", "total_area")
+
+    def __init__(self, index):
+        self.index = index
+        self.video_ids = index.video_ids
+        self.code_of = {video_id: code for code, video_id in enumerate(index.video_ids)}
+        self.num_videos = len(index.video_ids)
+        num_videos = max(self.num_videos, 1)
+        num_categories = max(index.num_categories, 1)
+        codes = index.video_codes
+
+        self.frame_counts = np.bincount(codes, minlength=num_videos).astype(np.int64)[:self.num_videos]
+        # Codes are assigned in file_list order and videos are contiguous, so video v starts here
+        self.starts = np.r_[0, np.cumsum(self.frame_counts)[:-1]].astype(np.int64)[:self.num_videos]
+        coverage_sums = np.bincount(codes, weights=index.coverages, minlength=num_videos)[:self.num_videos]
+        self.mean_coverage = coverage_sums / np.maximum(self.frame_counts, 1)
+        self.min_coverage = np.zeros(self.num_videos, dtype=np.float64)
+        if index.num_frames:
+            # Each video is one reduceat segment
+            self.min_coverage = np.minimum.reduceat(index.coverages, self.starts)
+
+        # Entries are unique per (frame, category), so counting them counts frames
+        entry_keys = codes[index.entry_frame] * num_categories + index.entry_cat
+        size = num_videos * num_categories
+        self.category_frames = np.bincount(entry_keys, minlength=size).reshape(num_videos, num_categories)[:self.num_videos]
+        self.category_areas = np.bincount(entry_keys, weights=index.entry_area, minlength=size).reshape(num_videos, num_categories)[:self.num_videos]
+        self.total_areas = self.category_areas.sum(axis=1)
+
+    def videos_with_category(self, category_id):
+        """Boolean mask over videos with at least one frame containing category_id."""
+        column = self.index.category_columns([category_id])[0]
+        if column < 0:
+            return np.zeros(self.num_videos, dtype=bool)
+        return self.category_frames[:, column] > 0
+
+    def frame_mask(self, video_mask):
+        """Expands a boolean mask over videos to a mask over index rows."""
+        return video_mask[self.index.video_codes] if self.num_videos else np.ones(self.index.num_frames, dtype=bool)
+
+    def video_keys(self, video_code):
+        """Frame keys of one video, in file_list order."""
+        start = self.starts[video_code]
+        return self.index.frame_keys[start:start + self.frame_counts[video_code]]
+
+    def rows_in_order(self, order):
+        """Index rows of the videos in order (e.g. from order()), each video's rows in file_list order."""
+        order = np.asarray(order, dtype=np.int64)
+        counts = self.frame_counts[order]
+        offsets = self.starts[order] - (np.cumsum(counts) - counts)
+        return np.arange(int(counts.sum()), dtype=np.int64) + np.repeat(offsets, counts)
+
+    def order(self, key="name", descending=False):
+        """Video codes sorted by one of SORT_KEYS; ties keep file_list order."""
+        if key == "name":
+            order = np.arange(self.num_videos)
+            return order[::-1] if descending else order
+        values = {
+            "frames": self.frame_counts,
+            "mean_coverage": self.mean_coverage,
+            "min_coverage": self.min_coverage,
+            "total_area": self.total_areas,
+        }[key]
+        return np.argsort(-values if descending else values, kind="stable")
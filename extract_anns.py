@@ -1,13 +1,95 @@
 import os
 import json
 import argparse
-import shutil
 import sys
 from tqdm import tqdm
 from datasets.panoptic_dataset import PanopticDataset
+from utils.selections import read_selection_file
+
+
+def export_item_dir(dataset, frame_key, dataset_export_dir):
+    """Creates and returns the output folder of a frame, or None if the frame_key is invalid."""
+    if dataset.is_video_dataset:
+        if '/' not in frame_key:
+            print(f"\nWarning: Skipping invalid frame_key '{frame_key}' for video dataset (missing 'video_id/').")
+            return None
+        video_id, fname = frame_key.split('/', 1)
+        base_name, _ = os.path.splitext(fname)
+        image_id = f"{video_id}_{base_name}"
+    else:
+        base_name, _ = os.path.splitext(frame_key)
+        image_id = base_name
+
+    output_item_dir = os.path.join(dataset_export_dir, image_id)
+    os.makedirs(output_item_dir, exist_ok=True)
+    return output_item_dir
+
+
+def write_export_item(dataset, frame_key, output_item_dir, mask_qimg, labels):
+    # a) Save original image (read through the dataset so shards work too)
+    with open(os.path.join(output_item_dir, "original.jpg"), "wb") as f:
+        f.write(dataset.read_image_bytes(frame_key))
+
+    # b) Save overlay image
+    mask_output_path = os.path.join(output_item_dir, "overlay.png")
+    if not mask_qimg.save(mask_output_path):
+        raise IOError(f"Failed to save mask overlay to {mask_output_path}")
+
+    # c) Save label list
+    labels_txt_path = os.path.join(output_item_dir, "labels.txt")
+    with open(labels_txt_path, "w") as f:
+        f.write("\n".join(labels[:-1]))  # Exclude coverage
+
+
+def export_with_render_service(dataset, selected_files, dataset_export_dir, workers, progress=True):
+    """Renders the overlays in worker processes and saves them straight from the shared-memory buffers."""
+    from datasets.render_service import RenderService
+
+    item_dirs = {}
+    for frame_key in selected_files:
+        output_item_dir = export_item_dir(dataset, frame_key, dataset_export_dir)
+        if output_item_dir is not None:
+            item_dirs[frame_key] = output_item_dir
+
+    service = RenderService(dataset, workers=workers)
+    try:
+        results = service.render_many(list(item_dirs))
+        for frame_key, frame, error in tqdm(results, total=len(item_dirs), desc=f"Exporting {dataset.name} ({workers} workers)",
+                                            disable=not progress):
+            if error is not None:
+                print(f"\nWarning: Could not process '{frame_key}'. Skipping. Error: {error}")
+                continue
+            try:
+                _, overlay_qimg = frame.qimages()
+                write_export_item(dataset, frame_key, item_dirs[frame_key], overlay_qimg, frame.labels)
+                del overlay_qimg
+            except Exception as e:
+                print(f"\nWarning: Could not process '{frame_key}'. Skipping. Error: {e}")
+            finally:
+                frame.release()
+    finally:
+        service.shutdown()
+
+
+def export_frames(dataset, frame_keys, dataset_export_dir, workers=0, progress=True):
+    """Writes the export folder of every frame in frame_keys, rendering in worker processes if workers > 0."""
+    if workers > 0:
+        export_with_render_service(dataset, frame_keys, dataset_export_dir, workers, progress)
+        return
+    for frame_key in tqdm(frame_keys, desc=f"Exporting {dataset.name}", disable=not progress):
+        output_item_dir = export_item_dir(dataset, frame_key, dataset_export_dir)
+        if output_item_dir is None:
+            continue
+        try:
+            # Load visualized data using the unique frame_key
+            original_qimg, mask_qimg, labels = dataset.load_image(frame_key)
+            write_export_item(dataset, frame_key, output_item_dir, mask_qimg, labels)
+        except Exception as e:
+            print(f"\nWarning: Could not process '{frame_key}'. Skipping. Error: {e}")
+            continue
 
 
-def process_selection_file(selection_file, all_datasets_config):
+def process_selection_file(selection_file, all_datasets_config, workers=0):
     print(f"\n Processing: {selection_file}")
 
     # 1. Parse dataset name
@@ -27,24 +109,12 @@ def process_selection_file(selection_file, all_datasets_config):
     dataset = PanopticDataset(name=dataset_name, **dataset_config)
     dataset.load()
 
-    # 4. Load selected file list
+    # 4. Load selected file list (both the GUI's dictionary format and the old plain list)
     try:
-        with open(selection_file, "r") as f:
-            selection_data = json.load(f)
+        selected_files, _ = read_selection_file(selection_file)
     except Exception as e:
         raise RuntimeError(f"Failed to load or parse selection file '{selection_file}': {e}")
 
-    if isinstance(selection_data, list):
-        selected_files = selection_data
-    elif isinstance(selection_data, dict):
-        raise TypeError(
-            f"Selection file '{selection_file}' is in an outdated dictionary format "
-            "which is not supported. Please re-save your selections from the "
-            "Annotation Selector UI to update the file to the new list-based format."
-        )
-    else:
-        raise ValueError(f"Unsupported format in selection file '{selection_file}'")
-
     if not selected_files:
         print(f"Warning: No files found in selection file: {selection_file}. Skipping.")
         return
@@ -56,52 +126,7 @@ def process_selection_file(selection_file, all_datasets_config):
     dataset_export_dir = os.path.join(output_base_dir, dataset_name)
     os.makedirs(dataset_export_dir, exist_ok=True)
 
-    for frame_key in tqdm(selected_files, desc=f"Exporting {dataset_name}"):
-        try:
-            if dataset.is_video_dataset:
-                if '/' not in frame_key:
-                    print(f"\nWarning: Skipping invalid frame_key '{frame_key}' for video dataset (missing 'video_id/').")
-                    continue
-                video_id, fname = frame_key.split('/', 1)
-                base_name, _ = os.path.splitext(fname)
-                image_id = f"{video_id}_{base_name}"
-            else:
-                fname = frame_key
-                video_id = None
-                base_name, _ = os.path.splitext(fname)
-                image_id = base_name
-
-            output_item_dir = os.path.join(dataset_export_dir, image_id)
-            os.makedirs(output_item_dir, exist_ok=True)
-
-            # Load visualized data using the unique frame_key
-            original_qimg, mask_qimg, labels = dataset.load_image(frame_key)
-
-            # a) Save original image by reconstructing its path
-            jpg_fname = f"{base_name}.jpg"
-            if dataset.is_video_dataset:
-                original_image_path = os.path.join(dataset.image_dir, video_id, jpg_fname)
-            else:
-                original_image_path = os.path.join(dataset.image_dir, jpg_fname)
-
-            if not os.path.isfile(original_image_path):
-                raise FileNotFoundError(f"Original image not found: {original_image_path}")
-
-            shutil.copy(original_image_path, os.path.join(output_item_dir, "original.jpg"))
-
-            # b) Save overlay image
-            mask_output_path = os.path.join(output_item_dir, "overlay.png")
-            if not mask_qimg.save(mask_output_path):
-                raise IOError(f"Failed to save mask overlay to {mask_output_path}")
-
-            # c) Save label list
-            labels_txt_path = os.path.join(output_item_dir, "labels.txt")
-            with open(labels_txt_path, "w") as f:
-                f.write("\n".join(labels[:-1]))  # Exclude coverage
-
-        except Exception as e:
-            print(f"\nWarning: Could not process '{frame_key}'. Skipping. Error: {e}")
-            continue
+    export_frames(dataset, selected_files, dataset_export_dir, workers)
 
     print(f" Finished exporting {len(selected_files)} items to '{dataset_export_dir}'")
 
@@ -115,6 +140,12 @@ def main():
         nargs="*",
         help="Optional path(s) to selection JSON files. If empty, scans the selected_annotations/ folder."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Render overlays in this many worker processes (default: 0, render in this process)."
+    )
     args = parser.parse_args()
 
     # Load config.json
@@ -144,7 +175,7 @@ def main():
     # Process each selection file
     for selection_file in files_to_process:
         try:
-            process_selection_file(selection_file, all_datasets_config)
+            process_selection_file(selection_file, all_datasets_config, args.workers)
         except Exception as e:
             print(f" Error processing {selection_file}: {e}")
             sys.exit(1)
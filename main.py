@@ -1,15 +1,22 @@
 # main.py
 
 from PyQt6.QtWidgets import QApplication, QMessageBox
+import os
 import sys
 from ui.annotation_selector import AnnotationSelector
+from utils.profiling import timings, profiler
 
 if __name__ == "__main__":
+    # ANNSEL_PROFILE=1 records a cProfile of the whole session into profiles/.
+    # ANNSEL_TIMINGS_JSON=<path> writes the per-stage timing summary on exit.
+    if os.environ.get("ANNSEL_PROFILE") == "1":
+        profiler.start()
+
     app = QApplication(sys.argv)
     try:
         window = AnnotationSelector()
         window.show()
-        sys.exit(app.exec())
+        exit_code = app.exec()
     except ValueError as e:
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Icon.Critical)
@@ -18,3 +25,9 @@ if __name__ == "__main__":
         msg.setWindowTitle("Error")
         msg.exec()
         sys.exit(1)
+
+    if profiler.is_running():
+        print(f"cProfile results written to {profiler.stop()}")
+    if os.environ.get("ANNSEL_TIMINGS_JSON"):
+        print(f"Stage timings written to {timings.dump_json(os.environ['ANNSEL_TIMINGS_JSON'])}")
+    sys.exit(exit_code)
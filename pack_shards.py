@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import time
+import tarfile
+import zipfile
+import argparse
+from tqdm import tqdm
+from datasets.storage import write_shard_index, SHARD_INDEX_FILE
+
+
+def collect_files(root, extension):
+    """Relative paths (with "/" separators) of all files with the given extension below root."""
+    relpaths = []
+    for dirpath, _, filenames in os.walk(root):
+        for fname in filenames:
+            if fname.lower().endswith(extension):
+                relpaths.append(os.path.relpath(os.path.join(dirpath, fname), root).replace(os.sep, "/"))
+    return relpaths
+
+
+def pack(image_dir, mask_dir, output_dir, shard_size_mb=1024, shard_format="tar"):
+    """
+    Packs image_dir/**/*.jpg and mask_dir/**/*.png into uncompressed shards in output_dir and
+    writes the offset index. Each frame's image and mask are stored next to each other.
+    Returns (number of shards, number of files).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    images = {os.path.splitext(p)[0]: p for p in collect_files(image_dir, ".jpg")}
+    masks = {os.path.splitext(p)[0]: p for p in collect_files(mask_dir, ".png")}
+
+    members = []
+    for stem in sorted(set(images) | set(masks)):
+        if stem in images:
+            members.append(("image", os.path.join(image_dir, images[stem]), images[stem]))
+        if stem in masks:
+            members.append(("mask", os.path.join(mask_dir, masks[stem]), masks[stem]))
+
+    shard_names = []
+    archive = None
+    shard_bytes = 0
+    limit = shard_size_mb * 1024 * 1024
+
+    def open_shard():
+        name = f"shard_{len(shard_names):05d}.{shard_format}"
+        shard_names.append(name)
+        path = os.path.join(output_dir, name)
+        if shard_format == "zip":
+            return zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+        return tarfile.open(path, "w")
+
+    for kind, source, relpath in tqdm(members, desc="Packing"):
+        size = os.path.getsize(source)
+        if archive is None or (shard_bytes > 0 and shard_bytes + size > limit):
+            if archive is not None:
+                archive.close()
+            archive = open_shard()
+            shard_bytes = 0
+
+        arcname = f"{kind}/{relpath}"
+        if shard_format == "zip":
+            archive.write(source, arcname)
+        else:
+            archive.add(source, arcname, recursive=False)
+        shard_bytes += size
+
+    if archive is not None:
+        archive.close()
+
+    write_shard_index(output_dir, shard_names)
+    return len(shard_names), len(members)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack a dataset's image_dir/mask_dir into a few large shards with an offset index."
+    )
+    parser.add_argument("dataset", help="Dataset name from config.json (its image_dir and mask_dir are packed).")
+    parser.add_argument("output_dir", help="Directory for the shards and index.json.")
+    parser.add_argument("--shard-size-mb", type=int, default=1024, help="Target size of each shard (default: 1024 MB).")
+    parser.add_argument("--format", choices=("tar", "zip"), default="tar", help="Shard container format (stored uncompressed).")
+    parser.add_argument("--reindex", action="store_true",
+                        help="Only rebuild index.json for existing shard_*.tar/zip files in output_dir.")
+    args = parser.parse_args()
+
+    if args.reindex:
+        shard_names = sorted(f for f in os.listdir(args.output_dir)
+                             if f.startswith("shard_") and f.endswith((".tar", ".zip")))
+        count = write_shard_index(args.output_dir, shard_names)
+        print(f" Indexed {count} files in {len(shard_names)} shards.")
+        return
+
+    try:
+        with open("config.json", "r") as f:
+            config = json.load(f)
+    except Exception as e:
+        sys.exit(f" Failed to load config.json: {e}")
+
+    dataset_config = config.get("datasets", {}).get(args.dataset)
+    if not dataset_config or not dataset_config.get("image_dir") or not dataset_config.get("mask_dir"):
+        sys.exit(f" Dataset '{args.dataset}' with 'image_dir' and 'mask_dir' not found in config.json.")
+
+    start = time.perf_counter()
+    num_shards, num_files = pack(
+        dataset_config["image_dir"], dataset_config["mask_dir"], args.output_dir, args.shard_size_mb, args.format
+    )
+    print(f" Packed {num_files} files into {num_shards} shards in {time.perf_counter() - start:.1f}s.")
+    print(f" Add \"shard_dir\": \"{os.path.abspath(args.output_dir)}\" to the '{args.dataset}' entry in config.json "
+          f"to read from the shards ({SHARD_INDEX_FILE} must stay next to them).")
+
+
+if __name__ == "__main__":
+    main()
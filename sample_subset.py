@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+# The tool never opens a window, so make sure Qt does not look for a display.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from utils.state import AppState
+from utils.selection_rules import resolve_category
+from utils.subset_sampler import DistributionSampler
+from utils.selections import selection_file_path, read_selection_file, write_selection_file
+
+
+def load_target(dataset, path):
+    """Reads a {category (id or name): weight} JSON file into {category_id: weight}."""
+    with open(path, "r") as f:
+        raw_target = json.load(f)
+    if not isinstance(raw_target, dict):
+        raise ValueError("Target file must contain a JSON object mapping categories to weights.")
+    return {resolve_category(dataset, token): float(weight) for token, weight in raw_target.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pick K frames whose category frequency/area distribution matches the full dataset or a target."
+    )
+    parser.add_argument("dataset", help="Dataset name as configured in config.json.")
+    parser.add_argument("k", type=int, help="Number of frames in the resulting selection.")
+    parser.add_argument("--seed-from-selection", action="store_true",
+                        help="Keep the frames of the existing selection file and fill up to K around them.")
+    parser.add_argument("--area-weight", type=float, default=0.5,
+                        help="0 matches only category frequencies, 1 only category areas (default: 0.5).")
+    target_group = parser.add_mutually_exclusive_group()
+    target_group.add_argument("--target", metavar="JSON", help="JSON file mapping categories (ids or names) to relative weights.")
+    target_group.add_argument("--uniform", action="store_true", help="Match a uniform distribution over all categories.")
+    parser.add_argument("-o", "--output", help="Output selection file. Defaults to selected_annotations/selected_<dataset>.json.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the result, do not write a file.")
+    args = parser.parse_args()
+
+    if args.k <= 0:
+        sys.exit(" K must be positive.")
+
+    try:
+        state = AppState(initial_dataset=args.dataset)
+    except ValueError as e:
+        sys.exit(f" {e}")
+    dataset = state.dataset
+    index = dataset.get_frame_index()
+
+    target = None
+    try:
+        if args.target:
+            target = load_target(dataset, args.target)
+        elif args.uniform:
+            target = {cat_id: 1.0 for cat_id in dataset.all_labels}
+        sampler = DistributionSampler(index, area_weight=args.area_weight, target=target)
+    except (OSError, ValueError) as e:
+        sys.exit(f" {e}")
+
+    output = args.output or selection_file_path(state.current_dataset_name)
+    seed = None
+    last_viewed = None
+    if args.seed_from_selection:
+        try:
+            existing, last_viewed = read_selection_file(output)
+        except FileNotFoundError:
+            existing = []
+        except (OSError, ValueError) as e:
+            sys.exit(f" Could not read existing selection file '{output}': {e}")
+        seed = index.mask_for_keys(existing)
+        print(f" Seeding with {int(seed.sum())} existing selections. Divergence: {sampler.divergence(seed):.4f}")
+
+    start = time.perf_counter()
+    result = sampler.sample(args.k, seed=seed)
+    elapsed = time.perf_counter() - start
+    print(f" Sampled {int(result.sum())} / {index.num_frames} frames in {elapsed:.2f} s. "
+          f"Divergence from target: {sampler.divergence(result):.4f}")
+
+    if args.dry_run:
+        return
+
+    state.selected_files = set(index.keys_for_mask(result))
+    write_selection_file(output, state.selected_files, last_viewed)
+    print(f" Wrote {len(state.selected_files)} selections to '{output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from tqdm import tqdm
+from datasets.panoptic_dataset import PanopticDataset
+from datasets.metadata_cache import MetadataCache
+from datasets.integrity import scan_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decode every mask of a dataset and report mismatches with its segments_info "
+                    "(missing or unknown segment ids, wrong areas, unreadable masks)."
+    )
+    parser.add_argument("dataset", help="Dataset name from config.json.")
+    parser.add_argument("-o", "--output", help="Report file (default: integrity_<dataset>.json).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--metadata-dir",
+                        help="Store the measured areas and coverages in this metadata cache directory "
+                             "(default: the dataset's metadata_dir, if configured).")
+    args = parser.parse_args()
+
+    try:
+        with open("config.json", "r") as f:
+            config = json.load(f)
+    except Exception as e:
+        sys.exit(f" Failed to load config.json: {e}")
+
+    dataset_config = config.get("datasets", {}).get(args.dataset)
+    if not dataset_config:
+        sys.exit(f" Dataset '{args.dataset}' not found in config.json.")
+    dataset = PanopticDataset(name=args.dataset, **dataset_config)
+    dataset.load()
+    if not dataset.is_loaded():
+        sys.exit(f" Could not load dataset '{args.dataset}'.")
+
+    start = time.perf_counter()
+    issue_counts = Counter()
+    frame_issues = {}
+    measured = {}
+    # Taken before the scan, so masks rewritten during it are measured again on the next load
+    versions = dataset.mask_file_versions(dataset.file_list)
+    results = scan_dataset(dataset, args.workers)
+    for frame_key, coverage, pixels, issues in tqdm(results, total=len(dataset.file_list), desc=f"Scanning {dataset.name}"):
+        if coverage is not None and versions[frame_key] is not None:
+            measured[frame_key] = (dataset.frame_records[frame_key], versions[frame_key], (coverage, pixels))
+        if issues:
+            frame_issues[frame_key] = issues
+            issue_counts.update(issue["type"] for issue in issues)
+    elapsed = time.perf_counter() - start
+
+    output = args.output or f"integrity_{dataset.name}.json"
+    report = {
+        "dataset": dataset.name,
+        "frames": len(dataset.file_list),
+        "frames_with_issues": len(frame_issues),
+        "issue_counts": dict(issue_counts),
+        "issues": frame_issues,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f" Scanned {len(dataset.file_list)} frames in {elapsed:.1f}s: {len(frame_issues)} with issues.")
+    for issue_type, count in issue_counts.most_common():
+        print(f"   {issue_type}: {count}")
+    print(f" Report written to '{output}'")
+
+    cache = MetadataCache(args.metadata_dir, dataset.name) if args.metadata_dir else dataset.metadata_cache
+    if cache is None:
+        print(" Set 'metadata_dir' for the dataset (or pass --metadata-dir) to reuse the measured areas and coverages when loading.")
+        return
+    cache.store("integrity", measured, dataset.cache_signature())
+    print(f" Measured areas and coverages stored in '{cache.path('integrity')}'; loads use them for unchanged frames.")
+
+
+if __name__ == "__main__":
+    main()
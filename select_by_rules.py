@@ -0,0 +1,113 @@
+import os
+import sys
+import time
+import argparse
+
+# The tool never opens a window, so make sure Qt does not look for a display.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from utils.state import AppState
+from utils.selection_rules import SelectionRules, resolve_category
+from utils.selections import selection_file_path, read_selection_file, write_selection_file
+
+
+def parse_categories(dataset, tokens):
+    return [resolve_category(dataset, token) for token in tokens or []]
+
+
+def parse_small_segments(dataset, pairs):
+    small_segments = []
+    for token, max_area in pairs or []:
+        if not max_area.isdigit():
+            raise ValueError(f"--small-segment expects a pixel count, got '{max_area}'.")
+        small_segments.append((resolve_category(dataset, token), int(max_area)))
+    return small_segments
+
+
+def build_rules(args, dataset):
+    return SelectionRules(
+        min_coverage=args.min_coverage,
+        max_coverage=args.max_coverage,
+        require_all=parse_categories(dataset, args.require),
+        require_any=parse_categories(dataset, args.any),
+        exclude=parse_categories(dataset, args.exclude),
+        min_segments=args.min_segments,
+        max_segments=args.max_segments,
+        small_segments=parse_small_segments(dataset, args.small_segment),
+        per_video=args.per_video,
+        per_video_strategy=args.per_video_strategy,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Select frames by simple metadata rules and write a selection file, without opening the GUI."
+    )
+    parser.add_argument("dataset", help="Dataset name as configured in config.json.")
+    parser.add_argument("--min-coverage", type=float, help="Keep frames whose labeled-pixel coverage (%%) is at least this value.")
+    parser.add_argument("--max-coverage", type=float, help="Keep frames whose coverage (%%) is at most this value.")
+    parser.add_argument("--require", nargs="+", metavar="CATEGORY", help="Keep frames containing ALL of these categories (ids or names).")
+    parser.add_argument("--any", nargs="+", metavar="CATEGORY", help="Keep frames containing AT LEAST ONE of these categories.")
+    parser.add_argument("--exclude", nargs="+", metavar="CATEGORY", help="Drop frames containing any of these categories.")
+    parser.add_argument("--min-segments", type=int, help="Keep frames with at least this many segments.")
+    parser.add_argument("--max-segments", type=int, help="Keep frames with at most this many segments.")
+    parser.add_argument("--small-segment", nargs=2, action="append", metavar=("CATEGORY", "MAX_PIXELS"),
+                        help="Keep frames with a segment of CATEGORY smaller than MAX_PIXELS pixels. May be repeated. "
+                             "Builds the segment index (decoding every mask once) unless it is cached.")
+    parser.add_argument("--per-video", type=int, metavar="K", help="Keep at most K matching frames per video (per dataset for image datasets).")
+    parser.add_argument("--per-video-strategy", choices=SelectionRules.PER_VIDEO_STRATEGIES, default="first",
+                        help="Which frames to keep under --per-video: the first K, or K spread evenly over the video.")
+    parser.add_argument("--combine", choices=("replace", "union", "intersect", "subtract"), default="replace",
+                        help="How to combine the matches with the existing selection file.")
+    parser.add_argument("-o", "--output", help="Output selection file. Defaults to selected_annotations/selected_<dataset>.json.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many frames match.")
+    args = parser.parse_args()
+
+    try:
+        state = AppState(initial_dataset=args.dataset)
+    except ValueError as e:
+        sys.exit(f" {e}")
+    dataset = state.dataset
+
+    try:
+        rules = build_rules(args, dataset)
+    except ValueError as e:
+        sys.exit(f" {e}")
+
+    segments = dataset.get_segment_index() if rules.small_segments else None
+
+    start = time.perf_counter()
+    index = dataset.get_frame_index()
+    mask = rules.evaluate(index, segments=segments)
+    matched = set(index.keys_for_mask(mask))
+    elapsed = time.perf_counter() - start
+
+    print(f" Rules: {rules.describe(dataset)}")
+    print(f" {len(matched)} / {index.num_frames} frames match ({elapsed * 1000:.0f} ms).")
+
+    output = args.output or selection_file_path(state.current_dataset_name)
+    last_viewed = None
+    if args.combine != "replace" and os.path.exists(output):
+        try:
+            existing, last_viewed = read_selection_file(output)
+        except (OSError, ValueError) as e:
+            sys.exit(f" Could not read existing selection file '{output}': {e}")
+        existing = set(existing) & set(index.key_to_row)
+        if args.combine == "union":
+            matched = existing | matched
+        elif args.combine == "intersect":
+            matched = existing & matched
+        else:
+            matched = existing - matched
+        print(f" Combined with {len(existing)} existing selections ({args.combine}): {len(matched)} frames.")
+
+    if args.dry_run:
+        return
+
+    state.selected_files = matched
+    write_selection_file(output, state.selected_files, last_viewed)
+    print(f" Wrote {len(matched)} selections to '{output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import argparse
+from utils.selections import SelectionBitmap, BITMAP_EXTENSION, read_selection_file, write_selection_file
+
+
+def load_sorted_dataset(dataset_name, config_path="config.json"):
+    """Loads a dataset from config.json and sorts its file_list into the stable UI ordering."""
+    # Imported here so that set operations on bitmaps never pay for the dataset imports.
+    from datasets.panoptic_dataset import PanopticDataset
+    from utils.state import sort_frame_keys
+
+    try:
+        with open(config_path, "r") as f:
+            config = json.load(f)
+    except Exception as e:
+        sys.exit(f" Failed to load {config_path}: {e}")
+
+    datasets_config = {k.lower(): (k, v) for k, v in config.get("datasets", {}).items()}
+    if dataset_name.lower() not in datasets_config:
+        sys.exit(f" Dataset '{dataset_name}' not found in {config_path}.")
+
+    name, params = datasets_config[dataset_name.lower()]
+    dataset = PanopticDataset(name=name, **params)
+    dataset.load()
+    sort_frame_keys(dataset.file_list, dataset.is_video_dataset)
+    return dataset
+
+
+def dataset_name_from_path(path):
+    """Guesses the dataset name from a 'selected_<dataset>.json' file name."""
+    base_name = os.path.basename(path)
+    stem, _ = os.path.splitext(base_name)
+    if stem.startswith("selected_"):
+        return stem[len("selected_"):]
+    return None
+
+
+def to_bitmap(args):
+    dataset_name = args.dataset or dataset_name_from_path(args.input)
+    if not dataset_name:
+        sys.exit(" Could not infer the dataset name, please pass --dataset.")
+
+    selected_files, _ = read_selection_file(args.input)
+    dataset = load_sorted_dataset(dataset_name)
+    bitmap, ignored = SelectionBitmap.from_keys(dataset.file_list, selected_files, dataset.name)
+    if ignored:
+        print(f"Warning: {ignored} selections in '{args.input}' do not match the dataset and were dropped.")
+
+    output = args.output or os.path.splitext(args.input)[0] + BITMAP_EXTENSION
+    bitmap.save(output)
+    print(f" Wrote {bitmap.count()} / {bitmap.num_frames} selected frames to '{output}'")
+
+
+def to_json(args):
+    header = SelectionBitmap.read_header(args.input)
+    dataset_name = args.dataset or header.get("dataset")
+    if not dataset_name:
+        sys.exit(" Bitmap does not record a dataset name, please pass --dataset.")
+
+    bitmap = SelectionBitmap.load(args.input)
+    dataset = load_sorted_dataset(dataset_name)
+    try:
+        selected_files = bitmap.to_keys(dataset.file_list)
+    except ValueError as e:
+        sys.exit(f" {e}")
+
+    output = args.output or os.path.splitext(args.input)[0] + ".json"
+    write_selection_file(output, selected_files)
+    print(f" Wrote {len(selected_files)} selections to '{output}'")
+
+
+def combine(args):
+    bitmaps = [SelectionBitmap.load(path) for path in args.inputs]
+    result = bitmaps[0]
+    try:
+        for other in bitmaps[1:]:
+            if args.command == "union":
+                result = result.union(other)
+            elif args.command == "intersect":
+                result = result.intersection(other)
+            else:
+                result = result.difference(other)
+    except ValueError as e:
+        sys.exit(f" {e}")
+
+    if args.output:
+        result.save(args.output)
+        print(f" {args.command}: {result.count()} frames written to '{args.output}'")
+    else:
+        print(result.count())
+
+
+def count(args):
+    # The count is stored in the header, so no payload has to be decompressed.
+    for path in args.inputs:
+        header = SelectionBitmap.read_header(path)
+        print(f"{path}\t{header['count']} / {header['num_frames']}\t{header.get('dataset', '')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert selection files to compact bitmaps and combine bitmaps with set operations."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("to-bitmap", help="Convert a JSON selection file into a bitmap (loads the dataset once).")
+    p.add_argument("input", help="Selection JSON file, e.g. selected_annotations/selected_vipseg_val.json")
+    p.add_argument("-d", "--dataset", help="Dataset name from config.json. Inferred from the file name if omitted.")
+    p.add_argument("-o", "--output", help=f"Output path. Defaults to the input path with a {BITMAP_EXTENSION} extension.")
+    p.set_defaults(func=to_bitmap)
+
+    p = subparsers.add_parser("to-json", help="Convert a bitmap back into a JSON selection file (loads the dataset once).")
+    p.add_argument("input", help=f"Bitmap file ({BITMAP_EXTENSION})")
+    p.add_argument("-d", "--dataset", help="Dataset name from config.json. Read from the bitmap header if omitted.")
+    p.add_argument("-o", "--output", help="Output path. Defaults to the input path with a .json extension.")
+    p.set_defaults(func=to_json)
+
+    for command, help_text in (
+        ("union", "Frames selected in any of the inputs."),
+        ("intersect", "Frames selected in all of the inputs."),
+        ("difference", "Frames selected in the first input but in none of the others."),
+    ):
+        p = subparsers.add_parser(command, help=help_text)
+        p.add_argument("inputs", nargs="+", help=f"Bitmap files ({BITMAP_EXTENSION})")
+        p.add_argument("-o", "--output", help="Write the result to this bitmap file. If omitted, only the count is printed.")
+        p.set_defaults(func=combine)
+
+    p = subparsers.add_parser("count", help="Print the number of selected frames in each bitmap.")
+    p.add_argument("inputs", nargs="+", help=f"Bitmap files ({BITMAP_EXTENSION})")
+    p.set_defaults(func=count)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except (OSError, ValueError) as e:
+        sys.exit(f" Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
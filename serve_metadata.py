@@ -0,0 +1,62 @@
+import sys
+import json
+import argparse
+from datasets.panoptic_dataset import PanopticDataset
+from datasets.remote_dataset import DEFAULT_ADDRESS, read_authkey, is_loopback
+from datasets.metadata_server import MetadataServer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve the datasets of config.json to several annotation selector instances on this machine: "
+                    "metadata is loaded once and overlays are rendered into one shared cache."
+    )
+    parser.add_argument("--address", help=f"'host:port' or a Unix socket path (default: the config's server.address or {DEFAULT_ADDRESS}).")
+    parser.add_argument("--preload", nargs="*", metavar="DATASET",
+                        help="Load these datasets (all if none are given) before accepting clients.")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Allow listening on an address other than the local host (only on trusted networks).")
+    parser.add_argument("--render-cache-mb", type=int, default=None, help="Budget of the shared render cache (default: 1024).")
+    args = parser.parse_args()
+
+    try:
+        with open("config.json", "r") as f:
+            config = json.load(f)
+    except Exception as e:
+        sys.exit(f" Failed to load config.json: {e}")
+
+    server_config = config.get("server", {})
+    datasets = {name: PanopticDataset(name=name, **params) for name, params in config.get("datasets", {}).items()}
+    if not datasets:
+        sys.exit(" No datasets found in config.json.")
+
+    address = args.address or server_config.get("address", DEFAULT_ADDRESS)
+    if not is_loopback(address) and not args.allow_remote:
+        sys.exit(f" Refusing to listen on {address}: clients can run code through the pickled requests. "
+                 f"Use 127.0.0.1 or a Unix socket, or pass --allow-remote on a trusted network.")
+    try:
+        authkey = read_authkey(server_config, create=True)
+    except (ValueError, OSError) as e:
+        sys.exit(f" {e}")
+
+    server = MetadataServer(
+        datasets,
+        address,
+        authkey,
+        args.render_cache_mb or server_config.get("render_cache_mb", 1024),
+    )
+    if args.preload is not None:
+        for name in args.preload or list(datasets):
+            if name not in datasets:
+                sys.exit(f" Dataset '{name}' not found in config.json.")
+            print(f" Preloading {name}...")
+            server.current(name)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(" Metadata server stopped.")
+
+
+if __name__ == "__main__":
+    main()
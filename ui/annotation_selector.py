@@ -1,21 +1,39 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QLabel, QPushButton, QListWidget, QListWidgetItem, QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator,
     QVBoxLayout, QHBoxLayout, QComboBox, QMessageBox,
-    QProgressBar, QToolButton, QAbstractItemView,
+    QProgressBar, QToolButton, QAbstractItemView, QDialog, QMenu, QInputDialog,
 )
-from PyQt6.QtGui import QPixmap, QKeyEvent, QGuiApplication
+from PyQt6.QtGui import QPixmap, QKeyEvent, QGuiApplication, QShortcut, QKeySequence, QActionGroup
 from PyQt6.QtCore import Qt, QThread
 from typing import Optional
-from utils.state import AppState, natural_sort_key
+from utils.state import AppState
+from utils.selections import selection_file_path, read_selection_file, write_selection_file
 import os
 import re
 import json
-from collections import defaultdict
+import numpy as np
 
 from ui.workers.dataset_loader import DatasetLoader
+from ui.workers.dataset_preloader import DatasetPreloader
+from ui.workers.frame_renderer import FrameRenderer
+from ui.workers.render_prefetcher import RenderPrefetcher
+from ui.workers.coverage_verifier import CoverageVerifier
+from ui.workers.snapshot_builder import SnapshotBuilder
+from ui.workers.dashboard_builder import DashboardBuilder
 from ui.widgets.clickable_label import ClickableLabel
 from ui.dialogs.stats_dialog import StatsDialog
+from ui.dialogs.dashboard_dialog import DatasetDashboardDialog
 from ui.dialogs.video_player_dialog import VideoPlayerDialog
+from ui.dialogs.sampler_dialog import SamplerDialog
+from ui.dialogs.timing_dialog import TimingDialog
+from ui.dialogs.thumbnail_grid_dialog import ThumbnailGridDialog
+from ui.dialogs.deep_zoom_dialog import DeepZoomDialog
+from ui.widgets.deep_zoom_view import TileCache
+from ui.widgets.thumbnail_grid import ThumbnailCache
+from utils.profiling import timings, timed, profiler
+from utils.review_queue import ReviewQueue
+from utils.subset_sampler import DistributionSampler
+from datasets.render_service import RenderService
 
 class AnnotationSelector(QMainWindow):
     def __init__(self):
@@ -23,11 +41,53 @@ class AnnotationSelector(QMainWindow):
         self.setWindowTitle("Annotation Selector")
         self.state = AppState()
         self.thread = None
+        self.worker = None
+        self._previous_session = None
+        self.timing_dialog = None
+        self.preload_thread = None
+        self.preload_worker = None
+        # Grid thumbnails survive closing and reopening the grid
+        self.thumbnail_cache = ThumbnailCache()
+        # Zoom tiles stay cached between openings of the zoom view
+        self.tile_cache = TileCache()
+        # Incremented for every displayed frame; renders finishing for older generations are discarded
+        self.render_generation = 0
+        self.start_frame_renderer()
+        # Optional worker processes rendering the next frames ahead of navigation ("render" config section)
+        self.prefetcher = None
+        self._prefetch_signature = None
+        self._awaiting_prefetch = None
+        self._navigation_direction = 1
+        # Background check of annotation-derived coverages against the masks
+        self.verify_thread = None
+        self.verify_worker = None
+        # Background reload of a dataset into a new snapshot while the current one stays in use
+        self.reload_thread = None
+        self.reload_worker = None
+        # Set by restore_previous_session when the restored dataset is stale: reload it once the load thread is gone
+        self._reload_after_load = False
+        # Background computation of the cross-dataset dashboard
+        self.dashboard_thread = None
+        self.dashboard_worker = None
 
         # State for single-mask view
         self.full_panoptic_mask = None
         self.selected_label_item = None
         self.high_coverage_filter_active = False
+        self.skip_duplicates_active = False
+        # (key, descending) of VideoIndex.order() for the video folders of the file list
+        self.video_sort = ("name", False)
+        # None, ("mean_coverage", threshold) or ("category", category id)
+        self.video_filter = None
+        # (frame index, filter flags) and the visibility mask computed for them
+        self._visible_mask_cache = None
+        # (frame index, video sort) and the display order of the file list for them
+        self._display_order_cache = None
+        # Frame key where a range selection starts (Ctrl+M)
+        self.range_anchor = None
+        # ReviewQueue while the rarity review mode is active, and the rows it showed so far
+        self.review_queue = None
+        self.review_history = []
         self.frame_key_to_item_map = {}
         self.coverage_label = None
 
@@ -38,12 +98,222 @@ class AnnotationSelector(QMainWindow):
 
         self.init_ui()
 
+        # Debug shortcuts: stage timing panel and on-demand cProfile recording
+        QShortcut(QKeySequence("Ctrl+Shift+T"), self).activated.connect(self.show_timings)
+        QShortcut(QKeySequence("Ctrl+Shift+P"), self).activated.connect(self.toggle_profiler)
+        QShortcut(QKeySequence("Ctrl+Shift+V"), self).activated.connect(self.start_coverage_verification)
+        QShortcut(QKeySequence("F5"), self).activated.connect(self.start_background_reload)
+        QShortcut(QKeySequence("Ctrl+F5"), self).activated.connect(lambda: self.start_background_reload(full=True))
+
+        if self.state.cache_options.get("preload"):
+            self.start_preloading()
+        self.maybe_verify_coverage()
+
+    def start_frame_renderer(self):
+        """Starts the worker thread that renders frames so navigation never blocks the GUI."""
+        self.render_thread = QThread()
+        self.frame_renderer = FrameRenderer(self.state)
+        self.frame_renderer.moveToThread(self.render_thread)
+        self.frame_renderer.rendered.connect(self.on_frame_rendered)
+        self.frame_renderer.failed.connect(self.on_frame_failed)
+        self.render_thread.finished.connect(self.frame_renderer.deleteLater)
+        self.render_thread.start()
+
+    def start_preloading(self):
+        """Loads all other configured datasets in a background thread so switching to them is instant."""
+        pending = [name for name in self.state.datasets if not self.state.is_dataset_ready(name)]
+        if not pending:
+            return
+
+        self.preload_thread = QThread()
+        self.preload_worker = DatasetPreloader(self.state, pending)
+        self.preload_worker.moveToThread(self.preload_thread)
+
+        self.preload_thread.started.connect(self.preload_worker.run)
+        # Bound methods (not lambdas) so the slots run in the GUI thread
+        self.preload_worker.dataset_loaded.connect(self.on_dataset_preloaded)
+        self.preload_worker.snapshot_ready.connect(self.on_reload_finished)
+        self.preload_worker.error.connect(self.on_preload_error)
+
+        self.preload_worker.finished.connect(self.preload_thread.quit)
+        self.preload_worker.finished.connect(self.preload_worker.deleteLater)
+        self.preload_thread.finished.connect(self.preload_thread.deleteLater)
+        self.preload_thread.finished.connect(self.clear_preload_thread_reference)
+
+        self.preload_thread.start()
+
+    def on_dataset_preloaded(self, dataset_name):
+        self.statusBar().showMessage(f"Preloaded dataset {dataset_name}", 3000)
+
+    def on_preload_error(self, dataset_name, error_message):
+        # Not fatal: the dataset will be loaded again when the user switches to it
+        print(f"Warning: {dataset_name}: {error_message}")
+
+    def show_timings(self):
+        """Opens the (non-modal) stage timing panel."""
+        if self.timing_dialog is None:
+            self.timing_dialog = TimingDialog(self)
+        self.timing_dialog.show()
+        self.timing_dialog.raise_()
+
+    def toggle_profiler(self):
+        path = profiler.toggle()
+        if path:
+            self.statusBar().showMessage(f"cProfile results written to {path}", 8000)
+        else:
+            self.statusBar().showMessage("cProfile recording... press Ctrl+Shift+P again to stop.", 8000)
+
+    def maybe_verify_coverage(self):
+        """Starts the coverage verification for datasets configured with verify_coverage."""
+        dataset = self.state.dataset
+        if dataset is not None and dataset.verify_coverage and dataset.coverage_mismatches is None:
+            self.start_coverage_verification()
+
+    def start_coverage_verification(self):
+        """Decodes the masks of the current dataset in the background to check its annotation-derived coverages."""
+        dataset = self.state.dataset
+        if self.verify_thread and self.verify_thread.isRunning():
+            self.statusBar().showMessage("Coverage verification is already running.", 3000)
+            return
+        if dataset is None or not dataset.annotated_coverage_keys:
+            self.statusBar().showMessage("No annotation-derived coverages to verify.", 3000)
+            return
+
+        self.verify_thread = QThread()
+        self.verify_worker = CoverageVerifier(dataset)
+        self.verify_worker.moveToThread(self.verify_thread)
+
+        self.verify_thread.started.connect(self.verify_worker.run)
+        self.verify_worker.progress.connect(self.on_verification_progress)
+        self.verify_worker.finished.connect(self.on_verification_finished)
+
+        for signal in (self.verify_worker.finished, self.verify_worker.cancelled):
+            signal.connect(self.verify_thread.quit)
+            signal.connect(self.verify_worker.deleteLater)
+        self.verify_thread.finished.connect(self.verify_thread.deleteLater)
+        self.verify_thread.finished.connect(self.clear_verify_thread_reference)
+
+        self.verify_thread.start()
+
+    def on_verification_progress(self, done, total):
+        self.statusBar().showMessage(f"Verifying coverage against masks: {done:,} / {total:,} frames")
+
+    def on_verification_finished(self, dataset_name, mismatches):
+        if not mismatches:
+            self.statusBar().showMessage(f"Coverage of {dataset_name} verified: annotations match the masks.", 5000)
+            return
+
+        self.statusBar().showMessage(f"Coverage of {dataset_name}: {len(mismatches)} frames differ from their masks.", 5000)
+        examples = "\n".join(
+            f"{frame_key}: {annotated:.1f}% annotated, {decoded:.1f}% in mask"
+            for frame_key, (annotated, decoded) in list(mismatches.items())[:10]
+        )
+        more = f"\n... and {len(mismatches) - 10} more" if len(mismatches) > 10 else ""
+        reply = QMessageBox.question(
+            self, "Coverage Mismatch",
+            f"The annotated segment areas of {len(mismatches)} frames in {dataset_name} do not match their masks:\n\n"
+            f"{examples}{more}\n\nUse the coverage computed from the masks for these frames?",
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.state.apply_decoded_coverages(dataset_name, mismatches)
+            self._visible_mask_cache = None
+            self.refresh_file_list()
+            self.update_display()
+
+    def start_background_reload(self, full=False):
+        """
+        Reloads the active dataset into a new snapshot in the background; reviewing continues on
+        the current data until on_reload_finished swaps the snapshot in.
+        """
+        if self.reload_thread and self.reload_thread.isRunning():
+            self.statusBar().showMessage("A reload is already running.", 3000)
+            return
+        if self.thread and self.thread.isRunning():
+            self.statusBar().showMessage("A dataset is being loaded. Please wait.", 3000)
+            return
+
+        self.reload_thread = QThread()
+        self.reload_worker = SnapshotBuilder(self.state, self.state.current_dataset_name, full)
+        self.reload_worker.moveToThread(self.reload_thread)
+
+        self.reload_thread.started.connect(self.reload_worker.run)
+        self.reload_worker.progress.connect(self.on_reload_progress)
+        self.reload_worker.finished.connect(self.on_reload_finished)
+        self.reload_worker.error.connect(self.on_reload_error)
+
+        for signal in (self.reload_worker.finished, self.reload_worker.error, self.reload_worker.cancelled):
+            signal.connect(self.reload_thread.quit)
+            signal.connect(self.reload_worker.deleteLater)
+        self.reload_thread.finished.connect(self.reload_thread.deleteLater)
+        self.reload_thread.finished.connect(self.clear_reload_thread_reference)
+
+        self.reload_button.setEnabled(False)
+        self.statusBar().showMessage(f"Reloading {self.state.current_dataset_name} in the background...")
+        self.reload_thread.start()
+
+    def on_reload_progress(self, done, total, rate):
+        if total > 0:
+            self.statusBar().showMessage(f"Reloading in the background: {done:,} / {total:,} frames ({rate:,.0f} frames/s)")
+
+    def on_reload_finished(self, dataset_name, snapshot):
+        """Swaps the new snapshot in; selections and the current frame carry over by key."""
+        self.state.publish_snapshot(dataset_name, snapshot)
+        if dataset_name == self.state.current_dataset_name:
+            self.render_generation += 1
+            self._visible_mask_cache = None
+            self.update_video_controls()
+            self.refresh_file_list()
+            self.update_display()
+        self.statusBar().showMessage(f"Reloaded {dataset_name}: {len(snapshot.file_list):,} frames.", 5000)
+
+    def on_reload_error(self, dataset_name, error_message):
+        # The previous snapshot stays in use
+        self.statusBar().showMessage(f"Reloading {dataset_name} failed.", 5000)
+        QMessageBox.warning(self, "Reload Error", error_message)
+
+    def clear_reload_thread_reference(self):
+        self.reload_thread = None
+        self.reload_worker = None
+        self.reload_button.setEnabled(True)
+
+    def clear_verify_thread_reference(self):
+        self.verify_thread = None
+        self.verify_worker = None
+
+    def clear_preload_thread_reference(self):
+        self.preload_thread = None
+        self.preload_worker = None
+
+    def closeEvent(self, event):
+        """Lets a running preload and render finish before the window goes away."""
+        if self.preload_thread and self.preload_thread.isRunning():
+            self.preload_worker.stop()
+            self.preload_thread.quit()
+            self.preload_thread.wait()
+        if self.verify_thread and self.verify_thread.isRunning():
+            self.verify_worker.cancel()
+            self.verify_thread.quit()
+            self.verify_thread.wait()
+        if self.reload_thread and self.reload_thread.isRunning():
+            self.reload_worker.cancel()
+            self.reload_thread.quit()
+            self.reload_thread.wait()
+        if self.dashboard_thread and self.dashboard_thread.isRunning():
+            self.dashboard_worker.cancel()
+            self.dashboard_thread.quit()
+            self.dashboard_thread.wait()
+        self.render_thread.quit()
+        self.render_thread.wait()
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         """ Handle window resize to keep overlay centered. """
         super().resizeEvent(event)
-        if hasattr(self, 'loading_label'):
-            # Center the label within the central widget's area
-            self.loading_label.setGeometry(self.centralWidget().rect())
+        if hasattr(self, 'loading_overlay'):
+            # Center the overlay within the central widget's area
+            self.loading_overlay.setGeometry(self.centralWidget().rect())
 
     def init_ui(self):
         central_widget = QWidget()
@@ -54,6 +324,10 @@ class AnnotationSelector(QMainWindow):
         self.dataset_selector = QComboBox()
         self.dataset_selector.addItems(self.state.datasets.keys())
         self.dataset_selector.currentTextChanged.connect(self.on_dataset_changed)
+        self.reload_button = QToolButton()
+        self.reload_button.setText("⟳")
+        self.reload_button.setToolTip("Reload the dataset in the background (F5; Ctrl+F5 rebuilds all metadata)")
+        self.reload_button.clicked.connect(lambda: self.start_background_reload())
         self.count_label = QLabel("Selected: 0")
 
         self.viewed_label = QLabel("Viewed:")
@@ -65,6 +339,7 @@ class AnnotationSelector(QMainWindow):
 
         top_layout.addWidget(QLabel("Dataset:"))
         top_layout.addWidget(self.dataset_selector)
+        top_layout.addWidget(self.reload_button)
         top_layout.addStretch()
         top_layout.addWidget(self.count_label)
         top_layout.addSpacing(20)  # Optional spacing
@@ -100,6 +375,8 @@ class AnnotationSelector(QMainWindow):
 
         self.original_image = ClickableLabel("Original Image")
         self.mask_image = ClickableLabel("Mask")
+        self.original_image.clicked.connect(self.show_deep_zoom)
+        self.mask_image.clicked.connect(self.show_deep_zoom)
         # self.label_panel = QLabel()
         self.label_panel = QListWidget()
         self.label_panel.setFixedWidth(170)
@@ -116,16 +393,46 @@ class AnnotationSelector(QMainWindow):
         # Add a top border for visual separation
         self.coverage_label.setStyleSheet("border-top: 1px solid #c0c0c0; padding-top: 5px; margin-top: 5px;")
 
+        self.zoom_segment_button = QPushButton("Zoom to Segment 🔍")
+        self.zoom_segment_button.setCheckable(True)
+        self.zoom_segment_button.setFixedWidth(170)
+        self.zoom_segment_button.setToolTip("Show a clicked label cropped to its segment instead of the whole frame")
+        self.zoom_segment_button.toggled.connect(self.toggle_segment_zoom)
+
         self.select_button = QPushButton("Select ✓")
         self.deselect_button = QPushButton("Deselect ✗")
         self.save_button = QPushButton("Save 💾")
         self.load_button = QPushButton("Load 📂")
         self.clear_button = QPushButton("Clear ✖")
         self.stats_button = QPushButton("Show Stats 📊")
+        self.dashboard_button = QPushButton("All Datasets 🌐")
+        self.dashboard_button.setToolTip("Compare selected vs. all statistics of every configured dataset, from cached metadata and saved selections")
         self.play_video_button = QPushButton("Play Video ▶️")
+        self.sample_button = QPushButton("Sample 🎯")
+        self.sample_button.setToolTip("Pick frames whose label distribution matches the full dataset")
+        self.bulk_button = QToolButton()
+        self.bulk_button.setText("Bulk ☑")
+        self.bulk_button.setToolTip("Select or deselect many frames at once")
+        self.bulk_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.bulk_button.setMenu(self.build_bulk_menu())
+        self.grid_button = QPushButton("Grid ▦")
+        self.grid_button.setToolTip("Review the visible frames as a grid of thumbnails and select many at once")
 
         self.coverage_filter_button = QPushButton("Coverage > 90%")
         self.coverage_filter_button.setCheckable(True)
+        self.skip_duplicates_button = QPushButton("Skip Duplicates ⏭")
+        self.skip_duplicates_button.setCheckable(True)
+        self.skip_duplicates_button.setToolTip("Show only one frame per run of near-identical consecutive frames")
+        self.review_button = QPushButton("Review Rare ⭐")
+        self.review_button.setCheckable(True)
+        self.review_button.setToolTip("Navigate frames by the rarity of their categories that are under-represented in the selection")
+        self.select_runs_button = QPushButton("Select Runs 🧩")
+        self.select_runs_button.setToolTip("Select one representative frame from every run of near-duplicates")
+        self.videos_button = QToolButton()
+        self.videos_button.setText("Videos 🎞")
+        self.videos_button.setToolTip("Sort and filter the videos, or select whole videos")
+        self.videos_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.videos_button.setMenu(self.build_videos_menu())
 
         self.select_button.clicked.connect(self.select_current)
         self.deselect_button.clicked.connect(self.deselect_current)
@@ -133,23 +440,39 @@ class AnnotationSelector(QMainWindow):
         self.load_button.clicked.connect(self.on_load_button_clicked) # Use a dedicated handler
         self.clear_button.clicked.connect(self.clear_selections)
         self.stats_button.clicked.connect(self.show_stats)
+        self.dashboard_button.clicked.connect(self.show_dashboard)
         self.play_video_button.clicked.connect(self.play_video)
+        self.sample_button.clicked.connect(self.sample_subset)
+        self.grid_button.clicked.connect(self.show_grid)
         self.coverage_filter_button.toggled.connect(self.toggle_coverage_filter)
+        self.skip_duplicates_button.toggled.connect(self.toggle_skip_duplicates)
+        self.review_button.toggled.connect(self.toggle_review_mode)
+        self.select_runs_button.clicked.connect(self.select_run_representatives)
 
         button_layout.addWidget(self.select_button)
         button_layout.addWidget(self.deselect_button)
+        button_layout.addWidget(self.bulk_button)
         button_layout.addWidget(self.save_button)
         button_layout.addWidget(self.load_button)
         button_layout.addWidget(self.clear_button)
         button_layout.addWidget(self.stats_button)
+        button_layout.addWidget(self.dashboard_button)
+        button_layout.addWidget(self.sample_button)
+        button_layout.addWidget(self.grid_button)
         button_layout.addWidget(self.play_video_button)
         button_layout.addWidget(self.coverage_filter_button)
+        button_layout.addWidget(self.skip_duplicates_button)
+        button_layout.addWidget(self.review_button)
+        button_layout.addWidget(self.select_runs_button)
+        button_layout.addWidget(self.videos_button)
 
         self.file_list_widget = QTreeWidget()
         self.file_list_widget.setHeaderHidden(True)
         self.file_list_widget.setMaximumHeight(150)
         self.file_list_widget.itemChanged.connect(self.on_item_changed)
         self.file_list_widget.currentItemChanged.connect(self.on_item_selected)
+        self.file_list_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.file_list_widget.customContextMenuRequested.connect(self.show_file_list_menu)
         self.file_list_widget.setCursor(Qt.CursorShape.PointingHandCursor)
         self.file_list_widget.setAttribute(Qt.WidgetAttribute.WA_Hover)
         self.file_list_widget.setStyleSheet("""
@@ -183,6 +506,7 @@ class AnnotationSelector(QMainWindow):
         right_panel_layout.setContentsMargins(0, 0, 0, 0)
         right_panel_layout.addWidget(self.label_panel)
         right_panel_layout.addWidget(self.coverage_label)
+        right_panel_layout.addWidget(self.zoom_segment_button)
         image_row.addLayout(right_panel_layout)
 
 
@@ -197,16 +521,38 @@ class AnnotationSelector(QMainWindow):
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
-        # Add loading label overlay
-        self.loading_label = QLabel("Loading dataset, please wait...", self)
-        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.loading_label.setStyleSheet("""
-            background-color: rgba(0, 0, 0, 0.7);
-            color: white;
-            font-size: 24px;
-            font-weight: bold;
+        # Add loading overlay with progress bar and cancel button
+        self.loading_overlay = QWidget(self)
+        self.loading_overlay.setObjectName("loadingOverlay")
+        self.loading_overlay.setStyleSheet("""
+            QWidget#loadingOverlay {
+                background-color: rgba(0, 0, 0, 0.7);
+            }
+            QLabel {
+                color: white;
+            }
         """)
-        self.loading_label.hide()
+        self.loading_label = QLabel("Loading dataset, please wait...")
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        self.loading_progress = QProgressBar()
+        self.loading_progress.setFixedWidth(400)
+        self.loading_progress.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_details = QLabel("")
+        self.loading_details.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_details.setStyleSheet("font-size: 14px;")
+        self.cancel_loading_button = QPushButton("Cancel")
+        self.cancel_loading_button.setFixedWidth(120)
+        self.cancel_loading_button.clicked.connect(self.cancel_loading)
+
+        overlay_layout = QVBoxLayout(self.loading_overlay)
+        overlay_layout.addStretch()
+        overlay_layout.addWidget(self.loading_label)
+        overlay_layout.addWidget(self.loading_progress, alignment=Qt.AlignmentFlag.AlignCenter)
+        overlay_layout.addWidget(self.loading_details)
+        overlay_layout.addWidget(self.cancel_loading_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        overlay_layout.addStretch()
+        self.loading_overlay.hide()
 
         self.load_selections(show_success_message=True)
         self.refresh_file_list()
@@ -237,13 +583,49 @@ class AnnotationSelector(QMainWindow):
         else:
             # User clicked a new label, show the single mask
             self.selected_label_item = item
+            self.show_single_segment(segment_index)
 
-            fname = self.state.current_filename()
-            single_mask_img = self.state.dataset.get_single_segment_visualization(fname, segment_index)
+    def show_single_segment(self, segment_index):
+        """Shows one segment in the mask view, cropped to its bounding box if zoom is active."""
+        fname = self.state.current_filename()
+        try:
+            if self.zoom_segment_button.isChecked():
+                single_mask_img = self.state.dataset.render_segment_zoom(fname, segment_index)
+            else:
+                single_mask_img = self.state.dataset.get_single_segment_visualization(fname, segment_index)
+        except (IndexError, ValueError, FileNotFoundError) as e:
+            self.statusBar().showMessage(f"Could not show segment {segment_index}: {e}", 5000)
+            return
 
-            if single_mask_img and not single_mask_img.isNull():
-                self.mask_image.setPixmap(QPixmap.fromImage(single_mask_img))
-                self.mask_image.update_scaled_pixmap()
+        if single_mask_img and not single_mask_img.isNull():
+            self.mask_image.setPixmap(QPixmap.fromImage(single_mask_img))
+            self.mask_image.update_scaled_pixmap()
+
+    def show_deep_zoom(self):
+        """Opens the original image and the mask view as shown, in synchronized zoomable views."""
+        panes = [
+            (label.name, label.source_pixmap())
+            for label in (self.original_image, self.mask_image)
+            if label.source_pixmap() is not None
+        ]
+        if panes:
+            DeepZoomDialog(self.state.current_filename(), panes, self.tile_cache, self).exec()
+
+    def clear_label_panel(self):
+        """Empties the label panel; the selected label item is deleted with it."""
+        self.selected_label_item = None
+        self.label_panel.clear()
+
+    def toggle_segment_zoom(self, checked: bool):
+        """Re-renders the isolated segment, if any, in the newly chosen mode."""
+        if self.selected_label_item is None:
+            return
+        row = self.label_panel.row(self.selected_label_item)
+        # Row 0 is the header; -1 means the item is no longer in the panel
+        if row < 1:
+            self.selected_label_item = None
+            return
+        self.show_single_segment(row - 1)
 
     def on_dataset_changed(self, dataset_name):
         """
@@ -260,13 +642,26 @@ class AnnotationSelector(QMainWindow):
             self.dataset_selector.blockSignals(False)
             return
 
-        # 1. Fast part: Update state to point to the new dataset and store the old one for error recovery
-        previous_dataset_name = self.state.current_dataset_name
+        # 1. Fast part: Update state to point to the new dataset and store the old session for error recovery
+        self._previous_session = (
+            self.state.current_dataset_name, set(self.state.selected_files), self.state.current_index
+        )
         self.state.set_active_dataset(dataset_name)
 
+        # Already loaded (e.g. visited before or preloaded) and unchanged on disk: switch instantly
+        if self.state.is_dataset_ready(dataset_name):
+            self.state.load_active_dataset_data()
+            self.on_loading_finished()
+            return
+
         # 2. Show loading indicator and disable UI
-        self.loading_label.show()
-        self.loading_label.raise_()
+        self.loading_label.setText(f"Loading {dataset_name}, please wait...")
+        self.loading_progress.setRange(0, 0)  # Busy indicator until the first progress report
+        self.loading_details.setText("Reading annotation file...")
+        self.cancel_loading_button.setEnabled(True)
+        self.loading_overlay.setGeometry(self.centralWidget().rect())
+        self.loading_overlay.show()
+        self.loading_overlay.raise_()
         self.centralWidget().setDisabled(True)
 
         # 3. Slow part: Load data in a background thread
@@ -276,21 +671,41 @@ class AnnotationSelector(QMainWindow):
 
         # Connect signals and slots
         self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.on_loading_progress)
         self.worker.finished.connect(self.on_loading_finished)
-        self.worker.error.connect(
-            lambda msg: self.on_loading_error(msg, previous_dataset_name)
-        )
+        self.worker.error.connect(self.on_loading_error)
+        self.worker.cancelled.connect(self.on_loading_cancelled)
 
         # Clean up the thread and worker once done
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker.error.connect(self.thread.quit)
-        self.worker.error.connect(self.worker.deleteLater)
+        for signal in (self.worker.finished, self.worker.error, self.worker.cancelled):
+            signal.connect(self.thread.quit)
+            signal.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.finished.connect(self.clear_thread_reference)
 
         self.thread.start()
 
+    def on_loading_progress(self, done, total, rate, eta):
+        """Updates the overlay with frames processed, throughput and the estimated time left."""
+        if total <= 0:
+            return
+        self.loading_progress.setRange(0, total)
+        self.loading_progress.setValue(done)
+        details = f"{done:,} / {total:,} frames"
+        if rate > 0:
+            details += f"  ·  {rate:,.0f} frames/s"
+        if eta >= 0 and done < total:
+            minutes, seconds = divmod(int(eta), 60)
+            details += f"  ·  ETA {minutes}:{seconds:02d}"
+        self.loading_details.setText(details)
+
+    def cancel_loading(self):
+        """Asks the loader to stop; on_loading_cancelled restores the previous dataset."""
+        if self.thread and self.thread.isRunning() and self.worker:
+            self.worker.cancel()
+            self.cancel_loading_button.setEnabled(False)
+            self.loading_details.setText("Cancelling...")
+
     def on_loading_finished(self):
         """Called via signal when the background worker is done."""
         # The order is important: load state, refresh UI list, then update display
@@ -298,27 +713,52 @@ class AnnotationSelector(QMainWindow):
         self.refresh_file_list()
         self.update_display()
 
-        self.loading_label.hide()
+        self.loading_overlay.hide()
         self.centralWidget().setDisabled(False)
+        self.maybe_verify_coverage()
 
-    def on_loading_error(self, error_message, previous_dataset_name):
+    def on_loading_error(self, error_message):
         """Called via signal if the worker encounters an error."""
-        self.loading_label.hide()
+        self.loading_overlay.hide()
         self.centralWidget().setDisabled(False)
         QMessageBox.critical(self, "Dataset Load Error", error_message)
 
-        # Revert the UI to the last known good dataset and clear the view.
+        # Revert the UI to the last known good dataset.
         # The user will have to re-select the dataset to trigger a new load.
+        self.restore_previous_session()
+
+    def on_loading_cancelled(self):
+        """Called via signal when the user cancelled the load."""
+        self.loading_overlay.hide()
+        self.centralWidget().setDisabled(False)
+        self.restore_previous_session()
+        self.statusBar().showMessage("Dataset loading cancelled.", 5000)
+
+    def restore_previous_session(self):
+        """Switches back to the dataset, selections and position from before the failed switch."""
+        previous_dataset_name, selected_files, current_index = self._previous_session
         self.dataset_selector.blockSignals(True)
         self.dataset_selector.setCurrentText(previous_dataset_name)
         self.dataset_selector.blockSignals(False)
         self.state.set_active_dataset(previous_dataset_name)
+        # The previous dataset is still loaded; if its files changed meanwhile, it is refreshed by
+        # the reload worker (once the failed load's thread is gone) rather than on the GUI thread
+        self.state.coverage_cache = self.state.dataset.coverages.copy()
+        self._reload_after_load = not self.state.is_dataset_ready(previous_dataset_name)
+        self.state.selected_files = selected_files
+        if current_index < len(self.state.dataset.file_list):
+            self.state.current_index = current_index
+        self.update_video_controls()
         self.refresh_file_list()
         self.update_display()
 
     def clear_thread_reference(self):
         """Set self.thread to None after it has been deleted."""
         self.thread = None
+        self.worker = None
+        if self._reload_after_load:
+            self._reload_after_load = False
+            self.start_background_reload()
 
     def _get_frame_key_from_item(self, item: QTreeWidgetItem) -> str:
         """
@@ -332,7 +772,8 @@ class AnnotationSelector(QMainWindow):
         if self.state.dataset.is_video_dataset:
             parent = item.parent()
             if parent:
-                video_id = parent.text(0)
+                # Folder labels carry the video's aggregates; the id is kept in the item data
+                video_id = parent.data(0, Qt.ItemDataRole.UserRole)
                 fname = item.text(0)
                 return f"{video_id}/{fname}"
         return item.text(0)
@@ -350,30 +791,21 @@ class AnnotationSelector(QMainWindow):
         current_idx = self.state.current_index
         current_frame_key = self.state.current_filename()
 
+        if self.review_queue is not None:
+            return self._next_review_index()
+
         # --- Improved Video Dataset Logic ---
         if self.state.dataset.is_video_dataset:
             if current_frame_key and '/' in current_frame_key:
-                current_video_id, _ = current_frame_key.split('/', 1)
-
-                # Build a mapping from video ID to its list of (index, frame_key)
-                video_to_frames = defaultdict(list)
-                for idx, frame_key in enumerate(file_list):
-                    video_id, _ = frame_key.split('/', 1)
-                    video_to_frames[video_id].append((idx, frame_key))
-
-                # Track whether we've passed the current video
-                passed_current = False
-
-                for video_id in sorted(video_to_frames.keys(), key=natural_sort_key):
-                    if not passed_current:
-                        if video_id == current_video_id:
-                            passed_current = True
-                        continue
-
-                    # Look for the first visible frame in the next video
-                    for idx, frame_key in video_to_frames[video_id]:
-                        if self.is_file_visible(frame_key):
-                            return idx
+                # First visible frame of the videos after the current one, in the order of the file list
+                video_index = self.state.dataset.get_video_index()
+                order = video_index.order(*self.video_sort)
+                current_code = video_index.index.video_codes[current_idx]
+                later_videos = order[int(np.flatnonzero(order == current_code)[0]) + 1:]
+                rows = video_index.rows_in_order(later_videos)
+                visible = rows[self._cached_visible_mask(video_index.index)[rows]]
+                if visible.size:
+                    return int(visible[0])
 
         # --- Fallback: next visible frame regardless of video ---
         for i in range(1, num_files + 1):
@@ -391,8 +823,9 @@ class AnnotationSelector(QMainWindow):
         if not current_fname:
             return
         self.state.selected_files.add(current_fname)
+        self.sync_check_states([current_fname])
         self.state.current_index = self._get_next_index_for_advance()
-        self.refresh_file_list()
+        self.update_file_list_selection()
         self.update_display()
 
     def deselect_current(self):
@@ -400,8 +833,9 @@ class AnnotationSelector(QMainWindow):
         if not current_fname:
             return
         self.state.selected_files.discard(current_fname)
+        self.sync_check_states([current_fname])
         self.state.current_index = self._get_next_index_for_advance()
-        self.refresh_file_list()
+        self.update_file_list_selection()
         self.update_display()
 
     def navigate_list(self, direction: int):
@@ -411,10 +845,21 @@ class AnnotationSelector(QMainWindow):
             return
 
         current_idx = self.state.current_index
+        self._navigation_direction = direction
+
+        if self.review_queue is not None:
+            self.state.current_index = self._next_review_index() if direction > 0 else self._previous_review_index()
+            self.update_display()
+            self.update_file_list_selection()
+            return
+
+        # Step through the rows in the order they are shown in the file list
+        display_rows, display_position = self._display_order()
+        current_pos = display_position[current_idx] if current_idx < num_files else 0
 
         # Search for the next valid (visible) index
         for i in range(1, num_files + 1):
-            next_idx = (current_idx + (i * direction) + num_files) % num_files
+            next_idx = int(display_rows[(current_pos + (i * direction) + num_files) % num_files])
             fname = self.state.dataset.file_list[next_idx]
 
             if self.is_file_visible(fname):
@@ -424,8 +869,32 @@ class AnnotationSelector(QMainWindow):
                 self.update_file_list_selection()
                 return
 
+    def _display_order(self):
+        """
+        (rows, positions): the file_list rows in the order of the file list widget (videos in
+        the current video sort order), and the inverse mapping from row to position.
+        """
+        index = self.state.dataset.get_frame_index()
+        key = (index, self.video_sort)
+        if self._display_order_cache is None or self._display_order_cache[0] != key:
+            if index.video_ids:
+                video_index = self.state.dataset.get_video_index()
+                rows = video_index.rows_in_order(video_index.order(*self.video_sort))
+            else:
+                rows = np.arange(index.num_frames)
+            positions = np.empty(index.num_frames, dtype=np.int64)
+            positions[rows] = np.arange(rows.size)
+            self._display_order_cache = (key, (rows, positions))
+        return self._display_order_cache[1]
+
     def is_file_visible(self, fname_to_check: str) -> bool:
         """Checks if a file should be visible based on active filters."""
+        if self.skip_duplicates_active or self.video_filter is not None:
+            # Run representatives and video filters depend on other frames, so use the vectorized mask
+            index = self.state.dataset.get_frame_index()
+            row = index.key_to_row.get(fname_to_check)
+            return row is not None and bool(self._cached_visible_mask(index)[row])
+
         if not self.high_coverage_filter_active:
             return True
 
@@ -433,6 +902,31 @@ class AnnotationSelector(QMainWindow):
         coverage = self.state.coverage_cache.get(fname_to_check)
         return coverage is not None and coverage > 90
 
+    def _filter_mask(self, index):
+        """Rows matching the coverage and video filters, including near-duplicates hidden by Skip Duplicates."""
+        if not self.high_coverage_filter_active:
+            mask = np.ones(index.num_frames, dtype=bool)
+        else:
+            mask = index.coverages > 90
+        if self.video_filter is not None and index.video_ids:
+            video_index = self.state.dataset.get_video_index()
+            mask &= video_index.frame_mask(self._video_filter_mask(video_index))
+        return mask
+
+    def _visible_mask(self, index):
+        """Vectorized counterpart of is_file_visible over the rows of a FrameIndex."""
+        mask = self._filter_mask(index)
+        if self.skip_duplicates_active and index.video_ids:
+            # Keep one visible frame per run of near-duplicates
+            mask = self.state.get_redundancy_index().representatives(mask)
+        return mask
+
+    def _cached_visible_mask(self, index):
+        key = (index, self.high_coverage_filter_active, self.skip_duplicates_active, self.video_filter)
+        if self._visible_mask_cache is None or self._visible_mask_cache[0] != key:
+            self._visible_mask_cache = (key, self._visible_mask(index))
+        return self._visible_mask_cache[1]
+
     def keyPressEvent(self, event: QKeyEvent):
         if not self.state.dataset.file_list or not self.state.current_filename():
             QMessageBox.critical(self, "Navigation Error", "No current image selected.")
@@ -452,21 +946,138 @@ class AnnotationSelector(QMainWindow):
         else:
             super().keyPressEvent(event)
 
+    @timed("display.update")
     def update_display(self):
+        """
+        Shows the current frame: from the render cache right away, otherwise the previous frame
+        stays on screen until the background render of this one completes.
+        """
         fname = self.state.current_filename()
         self.image_id_label.setText(f"Image: {fname}")
-        orig_img = self.state.get_original_image(fname)
-        mask_img = self.state.get_mask_image(fname)
-        labels = self.state.get_labels(fname)
 
         if not fname:
             QMessageBox.critical(self, "Display Error", "No file is currently selected.")
             # Clear display and return instead of crashing
             self.original_image.clear()
             self.mask_image.clear()
-            self.label_panel.clear()
+            self.clear_label_panel()
+            return
+
+        self.render_generation += 1
+        self._awaiting_prefetch = None
+        cached = self.state.get_cached_frame(fname)
+        if cached is not None:
+            self.show_frame(fname, *cached)
+        else:
+            self.clear_label_panel()
+            placeholder = QListWidgetItem("Rendering...")
+            placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.label_panel.addItem(placeholder)
+            if self.prefetcher is not None and self.prefetcher.is_pending(fname):
+                # Already being rendered ahead of time; shown by on_frame_prefetched
+                self._awaiting_prefetch = fname
+            else:
+                self.frame_renderer.request(self.render_generation, self.state.dataset, fname)
+        self.prefetch_ahead()
+
+        # Update the dedicated coverage label
+        coverage = self.state.coverage_cache.get(fname)
+        if coverage is not None:
+            self.coverage_label.setText(f"Coverage: {coverage:.2f}%")
+            self.coverage_label.show()
+        else:
+            # Hide the label if there's no coverage data to avoid showing "N/A"
+            self.coverage_label.hide()
+
+        file_list = self.state.dataset.file_list
+        if file_list:
+            current_idx = self.state.current_index
+            total = len(file_list)
+            percent = int((current_idx + 1) / total * 100)
+            self.progress_bar.setValue(percent)
+            self.progress_bar.setToolTip(f"Image {current_idx + 1} / {total}")
+        else:
+            self.progress_bar.setValue(0)
+            self.progress_bar.setToolTip("No images in dataset")
+
+    def ensure_prefetcher(self):
+        """Starts (or restarts for another dataset) the render worker processes if configured."""
+        workers = self.state.render_options.get("workers", 0)
+        if not workers or not self.state.dataset.is_loaded():
+            return None
+        # Per snapshot: a reloaded dataset is a new object
+        signature = self.state.dataset
+        if self.prefetcher is not None and self._prefetch_signature is signature:
+            return self.prefetcher
+
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+        service = RenderService(self.state.dataset, workers=workers)
+        self.prefetcher = RenderPrefetcher(service)
+        self.prefetcher.frame_ready.connect(self.on_frame_prefetched)
+        self.prefetcher.frame_failed.connect(self.on_prefetch_failed)
+        self._prefetch_signature = signature
+        return self.prefetcher
+
+    def prefetch_ahead(self):
+        """Queues the next visible frames in the current navigation direction for rendering in the workers."""
+        prefetcher = self.ensure_prefetcher()
+        if prefetcher is None:
+            return
+        count = self.state.render_options.get("prefetch", 4)
+        file_list = self.state.dataset.file_list
+        upcoming = []
+        index = self.state.current_index
+        for _ in range(min(len(file_list), 20 * count)):
+            index = (index + self._navigation_direction) % len(file_list)
+            frame_key = file_list[index]
+            if not self.is_file_visible(frame_key):
+                continue
+            if self.state.get_cached_frame(frame_key) is None:
+                upcoming.append(frame_key)
+            if len(upcoming) == count:
+                break
+        prefetcher.prefetch(upcoming)
+
+    def on_frame_prefetched(self, frame_key, frame):
+        prefetcher = self.prefetcher
+        if prefetcher is None or frame.service is not prefetcher.service:
+            # Rendered for a dataset the user switched away from
+            frame.release()
+            return
+        prefetcher.mark_delivered(frame_key)
+        try:
+            result = frame.detached()
+        finally:
+            frame.release()
+        self.state.store_rendered_frame(frame_key, result, prefetcher.service.dataset)
+
+        if self._awaiting_prefetch == frame_key and self.state.current_filename() == frame_key:
+            self._awaiting_prefetch = None
+            self.show_frame(frame_key, *result)
+
+    def on_prefetch_failed(self, frame_key, error_message):
+        if self.prefetcher is not None:
+            self.prefetcher.mark_delivered(frame_key)
+        if self._awaiting_prefetch == frame_key:
+            # Fall back to rendering the current frame in this process, which reports the error
+            self._awaiting_prefetch = None
+            self.frame_renderer.request(self.render_generation, self.state.dataset, frame_key)
+
+    def on_frame_rendered(self, generation, frame_key, result):
+        # The user has moved on since this frame was requested
+        if generation != self.render_generation:
+            return
+        self.show_frame(frame_key, *result)
+
+    def on_frame_failed(self, generation, frame_key, error_message):
+        if generation != self.render_generation:
             return
+        self.clear_label_panel()
+        QMessageBox.critical(self, "Display Error", error_message)
 
+    def show_frame(self, fname, orig_img, mask_img, labels):
+        """Puts a rendered frame on screen."""
         if orig_img is None or orig_img.isNull():
             QMessageBox.critical(self, "Display Error", f"Original image not found or is invalid for: {fname}")
             return
@@ -479,13 +1090,17 @@ class AnnotationSelector(QMainWindow):
         self.full_panoptic_mask = mask_img
         self.selected_label_item = None
 
-        self.original_image.setPixmap(QPixmap.fromImage(orig_img))
+        with timings.measure("display.to_pixmap"):
+            orig_pixmap = QPixmap.fromImage(orig_img)
+            mask_pixmap = QPixmap.fromImage(mask_img)
+
+        self.original_image.setPixmap(orig_pixmap)
         self.original_image.update_scaled_pixmap()
 
-        self.mask_image.setPixmap(QPixmap.fromImage(mask_img))
+        self.mask_image.setPixmap(mask_pixmap)
         self.mask_image.update_scaled_pixmap()
 
-        self.label_panel.clear()
+        self.clear_label_panel()
         if labels:
             # Add a header
             header_item = QListWidgetItem("Labels")
@@ -497,26 +1112,6 @@ class AnnotationSelector(QMainWindow):
 
             self.label_panel.addItems(labels)
 
-        # Update the dedicated coverage label
-        coverage = self.state.coverage_cache.get(fname)
-        if coverage is not None:
-            self.coverage_label.setText(f"Coverage: {coverage:.2f}%")
-            self.coverage_label.show()
-        else:
-            # Hide the label if there's no coverage data to avoid showing "N/A"
-            self.coverage_label.hide()
-
-        file_list = self.state.dataset.file_list
-        if file_list:
-            current_idx = self.state.current_index
-            total = len(file_list)
-            percent = int((current_idx + 1) / total * 100)
-            self.progress_bar.setValue(percent)
-            self.progress_bar.setToolTip(f"Image {current_idx + 1} / {total}")
-        else:
-            self.progress_bar.setValue(0)
-            self.progress_bar.setToolTip("No images in dataset")
-
     def refresh_file_list(self):
         self.file_list_widget.blockSignals(True)
         self.file_list_widget.clear()
@@ -525,16 +1120,15 @@ class AnnotationSelector(QMainWindow):
         is_video = getattr(self.state.dataset, "is_video_dataset", False)
 
         if is_video:
-            video_groups = defaultdict(list)
-            for frame_key in self.state.dataset.file_list:
-                video_id, fname = frame_key.split('/', 1)
-                video_groups[video_id].append((fname, frame_key))
-
-            for video_id, frame_data in sorted(video_groups.items(), key=lambda item: natural_sort_key(item[0])):
-                parent = QTreeWidgetItem(self.file_list_widget, [video_id])
+            # file_list is in natural order, so each video's frames are a contiguous, sorted slice
+            video_index = self.state.dataset.get_video_index()
+            for code in video_index.order(*self.video_sort):
+                video_id = video_index.video_ids[code]
+                parent = QTreeWidgetItem(self.file_list_widget, [self._video_label(video_index, code)])
+                parent.setData(0, Qt.ItemDataRole.UserRole, video_id)
                 parent.setFlags(parent.flags() & ~Qt.ItemFlag.ItemIsUserCheckable) # Folders are not checkable
-                for fname, frame_key in sorted(frame_data, key=lambda x: natural_sort_key(x[0])):
-                    child = QTreeWidgetItem(parent, [fname])
+                for frame_key in video_index.video_keys(code):
+                    child = QTreeWidgetItem(parent, [frame_key.split('/', 1)[1]])
                     child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
                     child.setCheckState(0, Qt.CheckState.Checked if frame_key in self.state.selected_files else Qt.CheckState.Unchecked)
                     self.frame_key_to_item_map[frame_key] = child
@@ -547,6 +1141,7 @@ class AnnotationSelector(QMainWindow):
                 self.frame_key_to_item_map[frame_key] = item
 
         self.apply_view_filters()
+        self.sync_review_queue()
 
         # Sync the highlighted item in the list with the current state
         self.update_file_list_selection()
@@ -577,6 +1172,343 @@ class AnnotationSelector(QMainWindow):
         if self.state.current_filename() and not self.is_file_visible(self.state.current_filename()):
             self.navigate_list(1)
 
+    def toggle_skip_duplicates(self, checked: bool):
+        if checked:
+            self.skip_duplicates_button.setStyleSheet("""
+                background-color: #FFA500;
+                color: white;
+                font-weight: bold;
+                border: 1px solid #D35400;
+            """)
+        else:
+            self.skip_duplicates_button.setStyleSheet("")
+
+        self.skip_duplicates_active = checked
+        self.refresh_file_list()
+        if checked:
+            redundancy = self.state.get_redundancy_index()
+            self.statusBar().showMessage(
+                f"Hiding {redundancy.duplicate_count():,} near-duplicate frames "
+                f"({redundancy.num_runs:,} runs in {len(redundancy.index.video_ids):,} videos).", 5000
+            )
+        if self.state.current_filename() and not self.is_file_visible(self.state.current_filename()):
+            self.navigate_list(1)
+
+    def select_run_representatives(self):
+        """Adds one frame from every run of near-duplicate frames (among the visible frames) to the selection."""
+        index = self.state.dataset.get_frame_index()
+        if index.num_frames == 0:
+            return
+        representatives = self.state.get_redundancy_index().representatives(self._visible_mask(index))
+        new_keys = set(index.keys_for_mask(representatives)) - self.state.selected_files
+
+        confirm = QMessageBox.question(
+            self, "Select Run Representatives",
+            f"Add {len(new_keys):,} frames to the selection?\n\n"
+            f"One frame is taken from each of the {int(representatives.sum()):,} runs of near-identical "
+            "consecutive frames among the visible frames.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+        self.state.selected_files |= new_keys
+        self.sync_check_states(new_keys)
+
+    def build_bulk_menu(self) -> QMenu:
+        menu = QMenu(self)
+        for label, shortcut, handler in [
+            ("Select All Visible", "Ctrl+A", lambda: self.bulk_select_visible("add")),
+            ("Deselect All Visible", "Ctrl+Shift+A", lambda: self.bulk_select_visible("remove")),
+            ("Invert Visible Selection", "Ctrl+I", lambda: self.bulk_select_visible("invert")),
+            ("Select All Filter Matches", None, self.bulk_select_filter_matches),
+            ("Select Every Nth Frame per Video…", None, self.bulk_select_every_nth),
+            (None, None, None),
+            ("Mark Range Start", "Ctrl+M", self.mark_range_start),
+            ("Select Range to Current Frame", "Ctrl+Shift+M", self.bulk_select_range),
+        ]:
+            if label is None:
+                menu.addSeparator()
+                continue
+            action = menu.addAction(label)
+            if shortcut:
+                action.setShortcut(QKeySequence(shortcut))
+                # Menu shortcuts only fire while the menu is open unless the action is on the window
+                self.addAction(action)
+            action.triggered.connect(handler)
+        return menu
+
+    def apply_bulk_selection(self, mask, operation: str, description: str):
+        """Applies a row mask to the selection in one vectorized step and updates only the changed check boxes."""
+        if not self.state.dataset.file_list:
+            return
+        with timings.measure("selection.bulk"):
+            changed = self.state.update_selection(mask, operation)
+            self.sync_check_states(changed)
+        self.statusBar().showMessage(f"{description}: {len(changed):,} frames changed.", 5000)
+
+    def bulk_select_visible(self, operation: str):
+        index = self.state.dataset.get_frame_index()
+        descriptions = {"add": "Selected visible frames", "remove": "Deselected visible frames", "invert": "Inverted visible frames"}
+        self.apply_bulk_selection(self._cached_visible_mask(index), operation, descriptions[operation])
+
+    def bulk_select_filter_matches(self):
+        """Selects every frame matching the coverage and video filters, including near-duplicates that Skip Duplicates hides."""
+        index = self.state.dataset.get_frame_index()
+        self.apply_bulk_selection(self._filter_mask(index), "add", "Selected filter matches")
+
+    def bulk_select_every_nth(self):
+        index = self.state.dataset.get_frame_index()
+        if index.num_frames == 0:
+            return
+        scope = " of each video" if index.video_ids else ""
+        step, ok = QInputDialog.getInt(
+            self, "Select Every Nth Frame", f"Select every Nth visible frame{scope}, starting with the first:",
+            value=10, min=1, max=max(index.num_frames, 1)
+        )
+        if not ok:
+            return
+        # For image datasets all rows share one video code, so this strides through the whole list
+        ranks = index.rank_within_video(self._cached_visible_mask(index))
+        self.apply_bulk_selection((ranks >= 0) & (ranks % step == 0), "add", f"Selected every {step}th frame")
+
+    def mark_range_start(self):
+        self.range_anchor = self.state.current_filename() or None
+        if self.range_anchor:
+            self.statusBar().showMessage(f"Range start: {self.range_anchor}", 5000)
+
+    def bulk_select_range(self):
+        """Selects the visible frames between the marked range start and the current frame, in file list order."""
+        index = self.state.dataset.get_frame_index()
+        anchor_row = index.key_to_row.get(self.range_anchor) if self.range_anchor else None
+        if anchor_row is None or not self.state.current_filename():
+            QMessageBox.information(self, "Select Range", "Mark the first frame of the range with Ctrl+M first.")
+            return
+        rows, positions = self._display_order()
+        first, last = sorted((positions[anchor_row], positions[self.state.current_index]))
+        mask = np.zeros(index.num_frames, dtype=bool)
+        mask[rows[first:last + 1]] = True
+        self.apply_bulk_selection(mask & self._cached_visible_mask(index), "add", "Selected range")
+
+    VIDEO_SORTS = [
+        ("Name", "name"),
+        ("Frame count", "frames"),
+        ("Mean coverage", "mean_coverage"),
+        ("Min coverage", "min_coverage"),
+        ("Total annotated area", "total_area"),
+    ]
+    VIDEO_FILTERS = [
+        ("All videos", None),
+        ("Mean coverage > 90%", ("mean_coverage", 90)),
+        ("Mean coverage > 75%", ("mean_coverage", 75)),
+    ]
+
+    def build_videos_menu(self) -> QMenu:
+        menu = QMenu(self)
+
+        sort_menu = menu.addMenu("Sort videos by")
+        sort_group = QActionGroup(self)
+        for label, key in self.VIDEO_SORTS:
+            action = sort_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(key == self.video_sort[0])
+            action.triggered.connect(lambda _, key=key: self.set_video_sort(key, self.video_sort[1]))
+            sort_group.addAction(action)
+        sort_menu.addSeparator()
+        descending = sort_menu.addAction("Descending")
+        descending.setCheckable(True)
+        descending.toggled.connect(lambda checked: self.set_video_sort(self.video_sort[0], checked))
+
+        filter_menu = menu.addMenu("Show videos")
+        self.video_filter_actions = {}
+        filter_group = QActionGroup(self)
+        for label, video_filter in self.VIDEO_FILTERS:
+            action = filter_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(video_filter == self.video_filter)
+            action.triggered.connect(lambda _, video_filter=video_filter: self.set_video_filter(video_filter))
+            filter_group.addAction(action)
+            self.video_filter_actions[video_filter] = action
+        category_action = filter_menu.addAction("Containing category…")
+        category_action.setCheckable(True)
+        category_action.triggered.connect(self.filter_videos_by_category)
+        filter_group.addAction(category_action)
+        self.video_filter_actions["category"] = category_action
+
+        menu.addSeparator()
+        menu.addAction("Select Current Video").triggered.connect(lambda: self.set_current_video_selected(True))
+        menu.addAction("Deselect Current Video").triggered.connect(lambda: self.set_current_video_selected(False))
+        return menu
+
+    def _video_label(self, video_index, code) -> str:
+        return (f"{video_index.video_ids[code]}  ({video_index.frame_counts[code]} frames, "
+                f"mean {video_index.mean_coverage[code]:.0f}%, min {video_index.min_coverage[code]:.0f}%)")
+
+    def _video_filter_mask(self, video_index):
+        """Boolean mask over the videos passing the video filter."""
+        kind, value = self.video_filter
+        if kind == "mean_coverage":
+            return video_index.mean_coverage > value
+        return video_index.videos_with_category(value)
+
+    def set_video_sort(self, key: str, descending: bool):
+        self.video_sort = (key, descending)
+        self.refresh_file_list()
+
+    def set_video_filter(self, video_filter):
+        self.video_filter = video_filter
+        # Keep the menu in sync when the filter is set from code or a dialog was cancelled
+        kind = "category" if video_filter is not None and video_filter[0] == "category" else video_filter
+        self.video_filter_actions[kind].setChecked(True)
+        self.refresh_file_list()
+        if video_filter is not None and self.state.dataset.file_list:
+            video_index = self.state.dataset.get_video_index()
+            shown = int(self._video_filter_mask(video_index).sum())
+            self.statusBar().showMessage(f"Showing {shown:,} of {video_index.num_videos:,} videos.", 5000)
+        if self.state.current_filename() and not self.is_file_visible(self.state.current_filename()):
+            self.navigate_list(1)
+
+    def filter_videos_by_category(self):
+        dataset = self.state.dataset
+        names = [dataset._get_label_name(cat_id) for cat_id in dataset.all_labels]
+        name, ok = QInputDialog.getItem(self, "Filter Videos", "Show only videos containing:", names, 0, False)
+        if not ok or not names:
+            self.set_video_filter(self.video_filter)
+            return
+        self.set_video_filter(("category", dataset.all_labels[names.index(name)]))
+
+    def show_file_list_menu(self, position):
+        """Context menu of the file list: whole-video selection for video datasets."""
+        item = self.file_list_widget.itemAt(position)
+        if item is None or not self.state.dataset.is_video_dataset:
+            return
+        folder = item if item.parent() is None else item.parent()
+        video_id = folder.data(0, Qt.ItemDataRole.UserRole)
+        menu = QMenu(self)
+        menu.addAction(f"Select Whole Video ({folder.childCount()} frames)").triggered.connect(
+            lambda: self.set_video_selected(video_id, True))
+        menu.addAction("Deselect Whole Video").triggered.connect(lambda: self.set_video_selected(video_id, False))
+        menu.exec(self.file_list_widget.viewport().mapToGlobal(position))
+
+    def set_current_video_selected(self, selected: bool):
+        current_fname = self.state.current_filename()
+        if current_fname and self.state.dataset.is_video_dataset:
+            self.set_video_selected(current_fname.split('/', 1)[0], selected)
+
+    def set_video_selected(self, video_id: str, selected: bool):
+        """Adds or removes all frames of a video in one set operation."""
+        video_index = self.state.dataset.get_video_index()
+        code = video_index.code_of.get(video_id)
+        if code is None:
+            return
+        video_mask = np.zeros(video_index.num_videos, dtype=bool)
+        video_mask[code] = True
+        self.apply_bulk_selection(video_index.frame_mask(video_mask), "add" if selected else "remove",
+                                  f"{'Selected' if selected else 'Deselected'} {video_id}")
+
+    def sync_check_states(self, frame_keys):
+        """
+        Updates the check boxes of frame_keys from state.selected_files after a batch change.
+        itemChanged is blocked, so this costs one pass instead of a handler call per frame.
+        """
+        selected_files = self.state.selected_files
+        self.file_list_widget.blockSignals(True)
+        self.file_list_widget.setUpdatesEnabled(False)
+        try:
+            for frame_key in frame_keys:
+                item = self.frame_key_to_item_map.get(frame_key)
+                if item is not None:
+                    item.setCheckState(0, Qt.CheckState.Checked if frame_key in selected_files else Qt.CheckState.Unchecked)
+        finally:
+            self.file_list_widget.setUpdatesEnabled(True)
+            self.file_list_widget.blockSignals(False)
+        self.count_label.setText(f"Selected: {len(selected_files)} / {len(self.state.dataset.file_list)}")
+        self.notify_review_queue(frame_keys)
+
+    def toggle_review_mode(self, checked: bool):
+        """Starts or stops navigating by the ReviewQueue over the currently visible frames."""
+        if not checked:
+            self.review_button.setStyleSheet("")
+            self.review_queue = None
+            self.review_history = []
+            return
+
+        index = self.state.dataset.get_frame_index()
+        selected = len(self.state.selected_files)
+        target, ok = QInputDialog.getInt(
+            self, "Review Rare Categories",
+            "Target subset size in frames.\nCategories count as under-represented until the selection\n"
+            "holds their share of a subset of this size:",
+            value=min(max(2 * selected, 500), max(index.num_frames, 1)), min=1, max=max(index.num_frames, 1)
+        )
+        if not ok or index.num_frames == 0:
+            self.review_button.setChecked(False)
+            return
+
+        self.review_button.setStyleSheet("""
+            background-color: #FFA500;
+            color: white;
+            font-weight: bold;
+            border: 1px solid #D35400;
+        """)
+        with timings.measure("review.build_queue"):
+            self.review_queue = ReviewQueue(
+                self.state.dataset, index.mask_for_keys(self.state.selected_files), target, self._cached_visible_mask(index)
+            )
+        self.review_history = []
+        self.navigate_list(1)
+
+    def _next_review_index(self):
+        """Row of the next frame of the review queue; stays on the current frame when the queue is empty."""
+        result = self.review_queue.pop()
+        if result is None:
+            self.statusBar().showMessage("Review queue is empty: no visible frame has an under-represented category.", 5000)
+            return self.state.current_index
+        row, score = result
+        self.review_history.append(row)
+        names = ", ".join(self.state.dataset._get_label_name(cat_id) for cat_id in self.review_queue.top_categories(row))
+        self.statusBar().showMessage(
+            f"Review score {score:.2f} ({names}); {self.review_queue.remaining():,} frames left in the queue.", 10000
+        )
+        return row
+
+    def _previous_review_index(self):
+        """Row of the previously reviewed frame."""
+        if len(self.review_history) > 1:
+            self.review_history.pop()
+        return self.review_history[-1] if self.review_history else self.state.current_index
+
+    def notify_review_queue(self, frame_keys):
+        """Passes selection changes of frame_keys on to the review queue, if active."""
+        if self.review_queue is None:
+            return
+        index = self.review_queue.index
+        rows = index.rows_for_keys(frame_keys)
+        selected_files = self.state.selected_files
+        selected = np.fromiter((index.frame_keys[row] in selected_files for row in rows), dtype=bool, count=len(rows))
+        self.review_queue.update_selection(rows, selected)
+
+    def sync_review_queue(self):
+        """After a selection change anywhere (load, clear) or a reload; a reload ends review mode."""
+        if self.review_queue is None:
+            return
+        index = self.state.dataset.get_frame_index()
+        if self.review_queue.index is not index:
+            self.review_button.setChecked(False)
+            return
+        self.review_queue.sync_selection(index.mask_for_keys(self.state.selected_files))
+
+    def update_video_controls(self):
+        """Shows the controls that only apply to video datasets."""
+        is_video = getattr(self.state.dataset, "is_video_dataset", False)
+        self.play_video_button.setVisible(is_video)
+        self.select_runs_button.setVisible(is_video)
+        self.skip_duplicates_button.setVisible(is_video)
+        self.videos_button.setVisible(is_video)
+        if not is_video and self.video_filter is not None:
+            self.set_video_filter(None)
+        if not is_video and self.skip_duplicates_button.isChecked():
+            self.skip_duplicates_button.setChecked(False)
+
     def apply_view_filters(self):
         """Hides or shows items in the file list based on active filters."""
         iterator = QTreeWidgetItemIterator(self.file_list_widget)
@@ -630,6 +1562,7 @@ class AnnotationSelector(QMainWindow):
         else:
             self.state.selected_files.discard(frame_key)
         self.count_label.setText(f"Selected: {len(self.state.selected_files)} / {len(self.state.dataset.file_list)}")
+        self.notify_review_queue([frame_key])
 
     def show_stats(self):
         if hasattr(self.state.dataset, 'get_goal_histograms'):
@@ -638,12 +1571,102 @@ class AnnotationSelector(QMainWindow):
         else:
             QMessageBox.information(self, "Not Supported", "This dataset does not support histogram statistics.")
 
+    def show_dashboard(self):
+        """
+        Computes the selection statistics of all configured datasets in the background and shows
+        them side by side. Other datasets are neither loaded nor activated: their statistics come
+        from the metadata cache and their selections from the saved selection files.
+        """
+        if self.dashboard_thread and self.dashboard_thread.isRunning():
+            self.statusBar().showMessage("The dataset dashboard is already being computed.", 3000)
+            return
+
+        # The active dataset is compared with its current (possibly unsaved) selection
+        selections = {self.state.current_dataset_name: set(self.state.selected_files)}
+        self.dashboard_thread = QThread()
+        self.dashboard_worker = DashboardBuilder(self.state, selections)
+        self.dashboard_worker.moveToThread(self.dashboard_thread)
+
+        self.dashboard_thread.started.connect(self.dashboard_worker.run)
+        self.dashboard_worker.progress.connect(self.on_dashboard_progress)
+        self.dashboard_worker.finished.connect(self.on_dashboard_finished)
+        for signal in (self.dashboard_worker.finished, self.dashboard_worker.cancelled):
+            signal.connect(self.dashboard_thread.quit)
+            signal.connect(self.dashboard_worker.deleteLater)
+        self.dashboard_thread.finished.connect(self.dashboard_thread.deleteLater)
+        self.dashboard_thread.finished.connect(self.clear_dashboard_thread_reference)
+
+        self.dashboard_button.setEnabled(False)
+        self.statusBar().showMessage("Computing statistics of all datasets...")
+        self.dashboard_thread.start()
+
+    def on_dashboard_progress(self, done, total):
+        self.statusBar().showMessage(f"Computing statistics of all datasets: {done} / {total}")
+
+    def on_dashboard_finished(self, results):
+        self.statusBar().clearMessage()
+        dialog = DatasetDashboardDialog(results, self)
+        dialog.exec()
+
+    def clear_dashboard_thread_reference(self):
+        self.dashboard_thread = None
+        self.dashboard_worker = None
+        self.dashboard_button.setEnabled(True)
+
+    def sample_subset(self):
+        """Replaces the selection with frames whose label distribution matches the target."""
+        index = self.state.dataset.get_frame_index()
+        if index.num_frames == 0:
+            return
+        visible = self._visible_mask(index)
+
+        dialog = SamplerDialog(index.num_frames, int(visible.sum()), len(self.state.selected_files))
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        options = dialog.values()
+
+        target = None
+        if options["uniform_target"]:
+            target = {cat_id: 1.0 for cat_id in self.state.dataset.all_labels}
+        sampler = DistributionSampler(index, area_weight=options["area_weight"], target=target)
+
+        seed = index.mask_for_keys(self.state.selected_files) if options["seed_from_selection"] else None
+        candidates = visible if options["visible_only"] else None
+        before = sampler.divergence(index.mask_for_keys(self.state.selected_files))
+        result = sampler.sample(options["k"], seed=seed, candidates=candidates)
+
+        previous = self.state.selected_files
+        self.state.selected_files = set(index.keys_for_mask(result))
+        self.sync_check_states(previous ^ self.state.selected_files)
+        QMessageBox.information(
+            self, "Sampled",
+            f"Selected {int(result.sum())} frames.\n\n"
+            f"Distance to target distribution: {before:.4f} → {sampler.divergence(result):.4f}\n"
+            "(0 is a perfect match)"
+        )
+
+    def show_grid(self):
+        """Opens the thumbnail grid over the visible frames; jumps to a frame if one was opened from it."""
+        index = self.state.dataset.get_frame_index()
+        frame_keys = index.keys_for_mask(self._visible_mask(index))
+        if not frame_keys:
+            QMessageBox.information(self, "Grid", "No frames are visible with the current filters.")
+            return
+
+        previous = set(self.state.selected_files)
+        dialog = ThumbnailGridDialog(self.state.dataset, frame_keys, self.state.selected_files, self.thumbnail_cache, self)
+        dialog.exec()
+
+        if dialog.activated_frame_key is not None:
+            self.state.current_index = index.key_to_row[dialog.activated_frame_key]
+            self.update_display()
+        self.sync_check_states(previous ^ self.state.selected_files)
+        self.update_file_list_selection()
+
     def selection_file_path(self):
-        dataset_name = self.dataset_selector.currentText()
-        safe_name = dataset_name.replace(" ", "_").lower()
-        folder = "selected_annotations"
-        os.makedirs(folder, exist_ok=True)
-        return os.path.join(folder, f"selected_{safe_name}.json")
+        path = selection_file_path(self.dataset_selector.currentText())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
 
     # Saving and Loading Logic
     def save_selection(self):
@@ -662,14 +1685,8 @@ class AnnotationSelector(QMainWindow):
         # The frame_key format works for both video and image datasets.
         # We just save the list of unique frame_keys.
         # We now save a dictionary to include the last viewed file for resuming sessions.
-        data_to_save = {
-            "selected_files": sorted(list(self.state.selected_files)),
-            "last_viewed": self.state.current_filename()
-        }
-
         try:
-            with open(path, "w") as f:
-                json.dump(data_to_save, f, indent=2)
+            write_selection_file(path, self.state.selected_files, self.state.current_filename())
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Could not save selections to:\n{path}\n\nError: {e}")
             return
@@ -688,46 +1705,29 @@ class AnnotationSelector(QMainWindow):
     def load_selections(self, show_success_message: bool = False):
         path = self.selection_file_path()
         try:
-            with open(path, "r") as f:
-                loaded_data = json.load(f)
-
-                last_viewed_file = None
-                loaded_files_list = []
-
-                if isinstance(loaded_data, dict):
-                    # New format: {"selected_files": [...], "last_viewed": "..."}
-                    loaded_files_list = loaded_data.get("selected_files", [])
-                    last_viewed_file = loaded_data.get("last_viewed")
-                    if not isinstance(loaded_files_list, list):
-                         raise ValueError("The 'selected_files' key must contain a list.")
-                elif isinstance(loaded_data, list):
-                    # Old format (backward compatibility): [...]
-                    loaded_files_list = loaded_data
-                else:
-                    raise ValueError("Unsupported selection file format. Expected a list or a dictionary.")
-
-                loaded_files = set(loaded_files_list)
-
-                available_files = set(self.state.dataset.file_list)
-                matched_files = loaded_files.intersection(available_files)
-
-                if loaded_files and not matched_files:
-                    QMessageBox.warning(self, "Load Warning",
-                        f"None of the {len(loaded_files)} selections in {os.path.basename(path)} "
-                        f"match the current dataset: {self.dataset_selector.currentText()}"
-                    )
-
-                self.state.selected_files = matched_files
-                if show_success_message:
-                    QMessageBox.information(self, "Loaded", f"Loaded {len(matched_files)} selections from:\n{path}")
-
-                # Resume from last viewed file if it exists in the current dataset
-                if last_viewed_file and last_viewed_file in available_files:
-                    try:
-                        self.state.current_index = self.state.dataset.file_list.index(last_viewed_file)
-                    except ValueError:
-                        # This should not happen due to the 'in' check, but for safety.
-                        pass # Keep index at 0
+            loaded_files_list, last_viewed_file = read_selection_file(path)
+            loaded_files = set(loaded_files_list)
+
+            available_files = set(self.state.dataset.file_list)
+            matched_files = loaded_files.intersection(available_files)
+
+            if loaded_files and not matched_files:
+                QMessageBox.warning(self, "Load Warning",
+                    f"None of the {len(loaded_files)} selections in {os.path.basename(path)} "
+                    f"match the current dataset: {self.dataset_selector.currentText()}"
+                )
+
+            self.state.selected_files = matched_files
+            if show_success_message:
+                QMessageBox.information(self, "Loaded", f"Loaded {len(matched_files)} selections from:\n{path}")
+
+            # Resume from last viewed file if it exists in the current dataset
+            if last_viewed_file and last_viewed_file in available_files:
+                try:
+                    self.state.current_index = self.state.dataset.file_list.index(last_viewed_file)
+                except ValueError:
+                    # This should not happen due to the 'in' check, but for safety.
+                    pass # Keep index at 0
 
         except FileNotFoundError:
             os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -737,7 +1737,7 @@ class AnnotationSelector(QMainWindow):
             QMessageBox.critical(self, "Load Error", f"Could not load or parse selection file:\n{path}\n\nError: {e}\n\nStarting with empty selection.")
             self.state.selected_files.clear() # Start fresh on error
 
-        self.play_video_button.setVisible(getattr(self.state.dataset, "is_video_dataset", False))
+        self.update_video_controls()
 
 
     def clear_selections(self):
@@ -792,15 +1792,34 @@ class AnnotationSelector(QMainWindow):
 
         <b>Selection:</b><br>
         - Press <b>Enter</b> or click the <b>Select ✓</b> / <b>Deselect ✗</b> buttons.<br>
-        - Use the checkboxes in the file list for manual selection.<br><br>
+        - Use the checkboxes in the file list for manual selection.<br>
+        - <b>Bulk ☑</b> selects, deselects or inverts all visible frames (<b>Ctrl+A</b> / <b>Ctrl+Shift+A</b> / <b>Ctrl+I</b>), every Nth frame of each video, or all frames matching the filters (including hidden near-duplicates).<br>
+        - To select a range, press <b>Ctrl+M</b> on its first frame, move to its last frame and press <b>Ctrl+Shift+M</b>.<br><br>
 
         <b>Images & Masks:</b><br>
-        - Click on the main image or mask to open an enlarged view.<br>
-        - In the right-hand label panel, click a label to isolate its corresponding mask. Click the same label again to restore the full view.<br><br>
+        - Click on the main image or mask to open both in a zoom view: scroll to zoom, drag to pan, <b>0</b> fits, <b>1</b> shows actual pixels. The two views move together.<br>
+        - In the right-hand label panel, click a label to isolate its corresponding mask. Click the same label again to restore the full view.<br>
+        - With <b>Zoom to Segment 🔍</b> active, an isolated label is shown cropped to its segment, which makes small segments visible.<br><br>
 
         <b>Video Datasets:</b><br>
         - For video datasets, files are grouped by video ID in the list.<br>
-        - The <b>Play Video ▶️</b> button will appear and can be used to play the current clip.<br><br>
+        - Each video shows its frame count and mean/min coverage. <b>Videos 🎞</b> sorts the videos by these aggregates and filters them by mean coverage or by a category they contain.<br>
+        - Right-click a video (or one of its frames) to select or deselect the whole video in one step.<br>
+        - The <b>Play Video ▶️</b> button will appear and can be used to play the current clip.<br>
+        - <b>Skip Duplicates ⏭</b> shows only one frame per run of near-identical consecutive frames, so the arrow keys jump over them.<br>
+        - <b>Select Runs 🧩</b> adds one representative frame of every run to the selection.<br><br>
+
+        <b>Rare Category Review:</b><br>
+        - <b>Review Rare ⭐</b> makes <b>→</b>, <b>Enter</b> and the Select/Deselect buttons move through the visible frames by rarity: frames with categories that are rare in the dataset and still under-represented in the selection come first.<br>
+        - The order adapts as you select frames; <b>←</b> goes back through the frames already reviewed. The status bar shows each frame's score and its most valuable categories.<br><br>
+
+        <b>Reloading:</b><br>
+        - <b>⟳</b> or <b>F5</b> picks up changes of the annotation file and masks in the background; only changed frames are processed. <b>Ctrl+F5</b> rebuilds all metadata.<br>
+        - You can keep working meanwhile; selections and the current frame are kept when the new data is swapped in.<br><br>
+
+        <b>Switching Datasets:</b><br>
+        - While a dataset loads, the overlay shows progress and the estimated time left.<br>
+        - Press <b>Cancel</b> to abort the load and return to the previous dataset.<br><br>
 
         <b>Saving & Loading:</b><br>
         - <b>Save 💾</b> stores your selections to a JSON file.<br>
@@ -808,7 +1827,14 @@ class AnnotationSelector(QMainWindow):
         - <b>Clear ✖</b> resets all selections for the current dataset.<br>
         - Selections are saved to: <code>selected_annotations/selected_{dataset_name}.json</code><br><br>
 
+        <b>Debugging:</b><br>
+        - <b>Ctrl+Shift+T</b> shows per-stage timings (p50/p95); <b>Ctrl+Shift+P</b> starts/stops cProfile (results in <code>profiles/</code>).<br>
+        - <b>Ctrl+Shift+V</b> checks the coverages computed from annotation areas against the masks in the background.<br><br>
+
         <b>Statistics:</b><br>
         - <b>Show Stats 📊</b> opens a dialog comparing statistics between your selected images and the entire dataset.<br>
+        - <b>All Datasets 🌐</b> compares selected vs. all category shares, coverage and masks per frame of every configured dataset at once, with categories matched by name. Other datasets are not loaded: they need a <code>metadata_dir</code> and one previous load, and their saved selection files are used.<br>
+        - <b>Grid ▦</b> shows thumbnails of the visible frames. Highlight several (Ctrl/Shift-click, Ctrl+A) and press <b>Space</b>, <b>S</b> or <b>D</b> to toggle, select or deselect them; double-click a thumbnail to open that frame.<br>
+        - <b>Sample 🎯</b> picks K frames (optionally keeping the current selection) whose label frequencies and areas best match the full dataset.<br>
         """
         QMessageBox.information(self, "How to Use", help_text)
\ No newline at end of file
@@ -0,0 +1,141 @@
+import numpy as np
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QLabel, QComboBox, QHeaderView, QSplitter, QWidget
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from datasets.dataset_summary import align_categories
+
+
+class DatasetDashboardDialog(QDialog):
+    """
+    Selection vs. full statistics of all configured datasets side by side (see
+    AppState.compare_selection). Categories are matched across datasets by name; each
+    dataset shows a category's share of its segments (or area) in the whole dataset and in
+    the selection, and the difference. "All datasets" pools the totals of the datasets.
+    """
+
+    SUMMARY_COLUMNS = ["Dataset", "Frames", "Selected", "Coverage All (%)", "Coverage Sel (%)",
+                       "Masks/Frame All", "Masks/Frame Sel", "Categories Sel / All", "Source"]
+    METRICS = [("Segments", "count"), ("Area", "area")]
+
+    def __init__(self, results, parent=None):
+        """results: [(dataset name, SelectionComparison or None, sources)] as emitted by DashboardBuilder."""
+        super().__init__(parent)
+        self.setWindowTitle("All Datasets: Selected vs All")
+        self.resize(1400, 900)
+        self.results = results
+        self.comparisons = [comparison for _, comparison, _ in results if comparison is not None]
+
+        self.summary_table = self._table(self.SUMMARY_COLUMNS)
+        self.fill_summary()
+
+        self.metric_combo = QComboBox()
+        for label, _ in self.METRICS:
+            self.metric_combo.addItem(label)
+        self.metric_combo.currentIndexChanged.connect(self.fill_categories)
+        self.category_table = self._table([])
+        self.category_table.setSortingEnabled(True)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Category share of:"))
+        controls.addWidget(self.metric_combo)
+        controls.addStretch()
+        controls.addWidget(QLabel("Δ = Selected − All, in percentage points. Categories are matched by name."))
+
+        categories_widget = QWidget()
+        categories = QVBoxLayout(categories_widget)
+        categories.setContentsMargins(0, 0, 0, 0)
+        categories.addLayout(controls)
+        categories.addWidget(self.category_table)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.summary_table)
+        splitter.addWidget(categories_widget)
+        splitter.setSizes([220, 680])
+
+        layout = QVBoxLayout()
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+        self.fill_categories()
+
+    @staticmethod
+    def _table(columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        return table
+
+    @staticmethod
+    def _number(value, decimals=2):
+        """Item sorting numerically."""
+        item = QTableWidgetItem()
+        item.setData(Qt.ItemDataRole.DisplayRole, round(float(value), decimals) if decimals else int(value))
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return item
+
+    def fill_summary(self):
+        self.summary_table.setRowCount(len(self.results))
+        for row, (name, comparison, source) in enumerate(self.results):
+            self.summary_table.setItem(row, 0, QTableWidgetItem(name))
+            if comparison is None:
+                item = QTableWidgetItem(f"No statistics: {source}")
+                item.setForeground(QColor("#C0392B"))
+                self.summary_table.setItem(row, len(self.SUMMARY_COLUMNS) - 1, item)
+                continue
+            if comparison.unknown_keys:
+                source += f", {comparison.unknown_keys:,} selected frames not in the dataset"
+            values = [
+                (comparison.num_frames, 0), (comparison.num_selected, 0),
+                (comparison.mean_coverage, 1), (comparison.selected_mean_coverage, 1),
+                (comparison.mean_masks, 2), (comparison.selected_mean_masks, 2),
+            ]
+            for column, (value, decimals) in enumerate(values, start=1):
+                self.summary_table.setItem(row, column, self._number(value, decimals))
+            covered = f"{np.count_nonzero(comparison.selected_counts)} / {np.count_nonzero(comparison.full_counts)}"
+            self.summary_table.setItem(row, 7, QTableWidgetItem(covered))
+            self.summary_table.setItem(row, 8, QTableWidgetItem(source))
+
+    def fill_categories(self):
+        metric = self.METRICS[self.metric_combo.currentIndex()][1]
+        names, full, selected = align_categories(self.comparisons, metric)
+        # Pooled totals of all datasets come first
+        if len(self.comparisons) > 1:
+            full = np.column_stack([full.sum(axis=1), full])
+            selected = np.column_stack([selected.sum(axis=1), selected])
+            groups = ["All datasets"] + [comparison.name for comparison in self.comparisons]
+        else:
+            groups = [comparison.name for comparison in self.comparisons]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            full_share = np.nan_to_num(100 * full / full.sum(axis=0))
+            selected_share = np.nan_to_num(100 * selected / selected.sum(axis=0))
+
+        columns = ["Category"]
+        for group in groups:
+            columns += [f"{group} All (%)", f"{group} Sel (%)", f"{group} Δ"]
+
+        table = self.category_table
+        table.setSortingEnabled(False)
+        table.clear()
+        table.setColumnCount(len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setRowCount(len(names))
+        for row, name in enumerate(names):
+            table.setItem(row, 0, QTableWidgetItem(name))
+            for group in range(len(groups)):
+                column = 1 + 3 * group
+                table.setItem(row, column, self._number(full_share[row, group]))
+                table.setItem(row, column + 1, self._number(selected_share[row, group]))
+                delta = self._number(selected_share[row, group] - full_share[row, group])
+                if full[row, group] == 0:
+                    # The dataset does not have this category
+                    for item in (table.item(row, column), table.item(row, column + 1), delta):
+                        item.setForeground(QColor("#999999"))
+                table.setItem(row, column + 2, delta)
+        table.setSortingEnabled(True)
+        if groups:
+            # Most over-represented categories of the first group on top
+            table.sortItems(3, Qt.SortOrder.DescendingOrder)
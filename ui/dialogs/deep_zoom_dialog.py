@@ -0,0 +1,74 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QCheckBox
+from PyQt6.QtGui import QShortcut, QKeySequence
+from ui.widgets.deep_zoom_view import DeepZoomView, TileCache
+
+
+class DeepZoomDialog(QDialog):
+    """
+    Original image and overlay side by side in zoomable, pannable tiled views. While
+    "Synchronize" is checked, zooming or panning one view moves the other to the same spot;
+    this needs both pixmaps to have the same size (not the case for a zoomed-in segment).
+    """
+
+    def __init__(self, title: str, panes, cache: TileCache, parent=None):
+        """panes is a list of (caption, QPixmap)."""
+        super().__init__(parent)
+        self.setWindowTitle(f"Zoom: {title}")
+        self.resize(1600, 900)
+
+        self.views = [DeepZoomView(pixmap, cache) for _, pixmap in panes]
+        sizes = {(pixmap.width(), pixmap.height()) for _, pixmap in panes}
+        self._syncing = False
+
+        views_layout = QHBoxLayout()
+        for (caption, _), view in zip(panes, self.views):
+            column = QVBoxLayout()
+            column.addWidget(QLabel(caption))
+            column.addWidget(view)
+            views_layout.addLayout(column)
+            view.view_changed.connect(lambda view=view: self.on_view_changed(view))
+
+        self.sync_checkbox = QCheckBox("Synchronize")
+        self.sync_checkbox.setChecked(len(sizes) == 1)
+        self.sync_checkbox.setEnabled(len(sizes) == 1 and len(self.views) > 1)
+        self.zoom_label = QLabel()
+        fit_button = QPushButton("Fit (0)")
+        fit_button.clicked.connect(self.fit)
+        actual_button = QPushButton("1:1 (1)")
+        actual_button.clicked.connect(lambda: self.views[0].zoom_to(1.0))
+
+        controls = QHBoxLayout()
+        controls.addWidget(fit_button)
+        controls.addWidget(actual_button)
+        controls.addWidget(self.sync_checkbox)
+        controls.addStretch()
+        controls.addWidget(self.zoom_label)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(views_layout)
+        layout.addLayout(controls)
+
+        QShortcut(QKeySequence("0"), self).activated.connect(self.fit)
+        QShortcut(QKeySequence("1"), self).activated.connect(lambda: self.views[0].zoom_to(1.0))
+        QShortcut(QKeySequence("+"), self).activated.connect(lambda: self.views[0].zoom_to(self.views[0].zoom() * DeepZoomView.ZOOM_STEP))
+        QShortcut(QKeySequence("-"), self).activated.connect(lambda: self.views[0].zoom_to(self.views[0].zoom() / DeepZoomView.ZOOM_STEP))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.fit()
+
+    def fit(self):
+        for view in self.views:
+            view.fit()
+
+    def on_view_changed(self, source: DeepZoomView):
+        self.zoom_label.setText(f"Zoom: {source.zoom() * 100:.0f}%")
+        if self._syncing or not self.sync_checkbox.isChecked():
+            return
+        self._syncing = True
+        try:
+            for view in self.views:
+                if view is not source:
+                    view.follow(source)
+        finally:
+            self._syncing = False
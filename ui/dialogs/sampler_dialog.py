@@ -0,0 +1,64 @@
+from PyQt6.QtWidgets import (
+    QDialog, QFormLayout, QVBoxLayout, QSpinBox, QDoubleSpinBox, QCheckBox, QComboBox, QDialogButtonBox, QLabel
+)
+
+
+class SamplerDialog(QDialog):
+    """Asks for the parameters of the distribution-matching sampler."""
+
+    TARGET_GOAL = "Full dataset distribution"
+    TARGET_UNIFORM = "Uniform over categories"
+
+    def __init__(self, total_frames: int, visible_frames: int, selected_frames: int):
+        super().__init__()
+        self.setWindowTitle("Sample Subset Matching Distribution")
+        self.setMinimumWidth(420)
+
+        self.k_spinbox = QSpinBox()
+        self.k_spinbox.setRange(1, max(total_frames, 1))
+        self.k_spinbox.setValue(min(max(selected_frames, 100), max(total_frames, 1)))
+
+        self.target_selector = QComboBox()
+        self.target_selector.addItems([self.TARGET_GOAL, self.TARGET_UNIFORM])
+
+        self.area_weight_spinbox = QDoubleSpinBox()
+        self.area_weight_spinbox.setRange(0.0, 1.0)
+        self.area_weight_spinbox.setSingleStep(0.1)
+        self.area_weight_spinbox.setValue(0.5)
+        self.area_weight_spinbox.setToolTip("0 matches only category frequencies, 1 only category areas.")
+
+        self.seed_checkbox = QCheckBox(f"Keep current selection ({selected_frames} frames)")
+        self.seed_checkbox.setChecked(selected_frames > 0)
+        self.seed_checkbox.setEnabled(selected_frames > 0)
+
+        self.visible_only_checkbox = QCheckBox(f"Only add currently visible frames ({visible_frames})")
+        self.visible_only_checkbox.setChecked(visible_frames < total_frames)
+
+        form = QFormLayout()
+        form.addRow("Frames to select (K):", self.k_spinbox)
+        form.addRow("Target:", self.target_selector)
+        form.addRow("Area weight:", self.area_weight_spinbox)
+        form.addRow(self.seed_checkbox)
+        form.addRow(self.visible_only_checkbox)
+
+        info = QLabel("The current selection will be replaced by the sampled frames.")
+        info.setWordWrap(True)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(info)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def values(self):
+        return {
+            "k": self.k_spinbox.value(),
+            "uniform_target": self.target_selector.currentText() == self.TARGET_UNIFORM,
+            "area_weight": self.area_weight_spinbox.value(),
+            "seed_from_selection": self.seed_checkbox.isChecked(),
+            "visible_only": self.visible_only_checkbox.isChecked(),
+        }
@@ -0,0 +1,114 @@
+from PyQt6.QtWidgets import QDialog, QListView, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QAbstractItemView
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QKeyEvent
+from ui.widgets.thumbnail_grid import FrameGridModel
+
+
+class ThumbnailGridDialog(QDialog):
+    """
+    Grid of overlay thumbnails for many frames at once. Highlight frames with the mouse
+    (Ctrl/Shift for ranges) or keyboard, then select or deselect them in one go.
+    Double-clicking (or Enter) closes the grid and jumps to that frame.
+    """
+
+    THUMBNAIL_SIZE = 160
+
+    def __init__(self, dataset, frame_keys, selected_files, cache, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Grid: {dataset.name} ({len(frame_keys):,} frames)")
+        self.resize(1200, 800)
+        self.activated_frame_key = None
+
+        self.model = FrameGridModel(dataset, frame_keys, selected_files, cache, self.THUMBNAIL_SIZE, self)
+
+        self.view = QListView()
+        self.view.setViewMode(QListView.ViewMode.IconMode)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.view.setMovement(QListView.Movement.Static)
+        # Uniform sizes and batched layout keep scrolling fast with 100k+ rows
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.view.setBatchSize(2000)
+        self.view.setIconSize(QSize(self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE * 3 // 4))
+        self.view.setGridSize(QSize(self.THUMBNAIL_SIZE + 16, self.THUMBNAIL_SIZE * 3 // 4 + 36))
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.view.setModel(self.model)
+        self.view.doubleClicked.connect(self.on_double_clicked)
+        self.view.installEventFilter(self)
+
+        # Renders queued for cells that scrolled away are dropped on every scroll step
+        self.view.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+
+        self.count_label = QLabel()
+        select_button = QPushButton("Select Highlighted ✓")
+        select_button.clicked.connect(lambda: self.set_highlighted_selected(True))
+        deselect_button = QPushButton("Deselect Highlighted ✗")
+        deselect_button.clicked.connect(lambda: self.set_highlighted_selected(False))
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.count_label)
+        buttons.addStretch()
+        buttons.addWidget(select_button)
+        buttons.addWidget(deselect_button)
+        buttons.addWidget(close_button)
+
+        hint = QLabel("Space: toggle highlighted · S / D: select / deselect highlighted · Ctrl+A: highlight all · Enter: open frame")
+        hint.setStyleSheet("color: gray;")
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.view)
+        layout.addWidget(hint)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.model.dataChanged.connect(self.update_count)
+        self.update_count()
+
+    def update_count(self, *args):
+        self.count_label.setText(f"Selected: {len(self.model.selected_files):,}")
+
+    def highlighted_rows(self):
+        return sorted(index.row() for index in self.view.selectionModel().selectedIndexes())
+
+    def set_highlighted_selected(self, selected):
+        self.model.set_selected(self.highlighted_rows(), selected)
+
+    def toggle_highlighted(self):
+        rows = self.highlighted_rows()
+        if not rows:
+            return
+        # Toggle as a group: select all unless all of them are selected already
+        all_selected = all(self.model.frame_keys[row] in self.model.selected_files for row in rows)
+        self.model.set_selected(rows, not all_selected)
+
+    def eventFilter(self, obj, event):
+        if obj is self.view and isinstance(event, QKeyEvent) and event.type() == QKeyEvent.Type.KeyPress:
+            key = event.key()
+            if key == Qt.Key.Key_Space:
+                self.toggle_highlighted()
+                return True
+            if key == Qt.Key.Key_S:
+                self.set_highlighted_selected(True)
+                return True
+            if key == Qt.Key.Key_D:
+                self.set_highlighted_selected(False)
+                return True
+            if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and self.view.currentIndex().isValid():
+                self.on_double_clicked(self.view.currentIndex())
+                return True
+        return super().eventFilter(obj, event)
+
+    def on_scrolled(self):
+        self.model.drop_pending()
+        # Repaint everything so that on-screen cells whose renders were dropped request them again
+        self.view.viewport().update()
+
+    def on_double_clicked(self, index):
+        self.activated_frame_key = self.model.frame_keys[index.row()]
+        self.accept()
+
+    def done(self, result):
+        self.model.shutdown()
+        super().done(result)
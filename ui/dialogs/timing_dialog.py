@@ -0,0 +1,100 @@
+import os
+import time
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel, QHeaderView, QMessageBox
+)
+from PyQt6.QtCore import QTimer, Qt
+from utils.profiling import timings, profiler, PROFILE_DIR
+from utils.lru import memory_summary
+
+
+class TimingDialog(QDialog):
+    """Debug panel showing p50/p95 durations of the instrumented processing stages."""
+
+    COLUMNS = ["Stage", "Count", "p50 (ms)", "p95 (ms)", "Mean (ms)", "Max (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Stage Timings")
+        self.resize(700, 450)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+        self.profiler_label = QLabel()
+        # Sizes of the bounded caches (rendered frames, visualizer state, thumbnails)
+        self.memory_label = QLabel()
+        self.memory_label.setWordWrap(True)
+
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        save_button = QPushButton("Save JSON 💾")
+        save_button.clicked.connect(self.save_json)
+        self.profiler_button = QPushButton()
+        self.profiler_button.clicked.connect(self.toggle_profiler)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.profiler_label)
+        buttons.addStretch()
+        buttons.addWidget(self.profiler_button)
+        buttons.addWidget(reset_button)
+        buttons.addWidget(save_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addWidget(self.memory_label)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        # Keep the numbers live while the panel is open
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+        self.refresh()
+
+    def refresh(self):
+        summary = timings.summary()
+        self.table.setRowCount(len(summary))
+        for row, (stage, stats) in enumerate(summary.items()):
+            values = [stage, stats["count"], stats["p50_ms"], stats["p95_ms"], stats["mean_ms"], stats["max_ms"]]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value if isinstance(value, str) else f"{value:,}" if column == 1 else f"{value:.2f}")
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        caches = [
+            f"{name}: {stats['items']:,} items, {stats['bytes'] / 2**20:.1f} / {stats['max_bytes'] / 2**20:.0f} MB"
+            for name, stats in memory_summary().items()
+        ]
+        self.memory_label.setText("Caches — " + " · ".join(caches) if caches else "")
+
+        running = profiler.is_running()
+        self.profiler_label.setText("cProfile: recording…" if running else "cProfile: off")
+        self.profiler_button.setText("Stop Profiler ⏹" if running else "Start Profiler ⏺")
+
+    def reset(self):
+        timings.reset()
+        self.refresh()
+
+    def save_json(self):
+        path = os.path.join(PROFILE_DIR, f"timings_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            timings.dump_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Save Error", f"Could not save timings to:\n{path}\n\nError: {e}")
+            return
+        QMessageBox.information(self, "Saved", f"Saved stage timings to:\n{path}")
+
+    def toggle_profiler(self):
+        path = profiler.toggle()
+        if path:
+            QMessageBox.information(self, "Profile Saved", f"cProfile results written to:\n{path}")
+        self.refresh()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
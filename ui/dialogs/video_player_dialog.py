@@ -1,4 +1,3 @@
-import os
 from PyQt6.QtWidgets import QDialog, QLabel, QVBoxLayout
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QImage, QPixmap
@@ -20,16 +19,12 @@ class VideoPlayerDialog(QDialog):
         self.setLayout(layout)
 
         # Get frames belonging to this video using the new frame_key format
+        # (works the same for image directories and packed shards)
         self.frames = []
-        video_image_dir = os.path.join(dataset.image_dir, video_id)
         for frame_key in dataset.file_list:
             # For video datasets, frame_key is "video_id/fname.ext"
-            if frame_key.startswith(f"{video_id}/"):
-                fname = frame_key.split('/', 1)[1]
-                base_name, _ = os.path.splitext(fname)
-                image_path = os.path.join(video_image_dir, f"{base_name}.jpg")
-                if os.path.exists(image_path):
-                    self.frames.append(fname)
+            if frame_key.startswith(f"{video_id}/") and dataset.has_image(frame_key):
+                self.frames.append(frame_key)
         self.frames.sort()
         self.index = 0
 
@@ -43,12 +38,13 @@ class VideoPlayerDialog(QDialog):
             self.timer.stop()
             return
 
-        fname = self.frames[self.index]
-        base_name, _ = os.path.splitext(fname)
-        path = os.path.join(self.dataset.image_dir, self.video_id, f"{base_name}.jpg")
+        frame_key = self.frames[self.index]
+        try:
+            image = QImage.fromData(self.dataset.read_image_bytes(frame_key))
+        except OSError:
+            image = None
 
-        if os.path.exists(path):
-            image = QImage(path)
+        if image is not None and not image.isNull():
             self.image_label.setPixmap(QPixmap.fromImage(image).scaled(
                 self.image_label.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
             ))
@@ -1,9 +1,13 @@
-from PyQt6.QtWidgets import QLabel, QSizePolicy, QDialog, QScrollArea, QVBoxLayout
+from PyQt6.QtWidgets import QLabel, QSizePolicy
 from PyQt6.QtGui import QPixmap, QMouseEvent
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, pyqtSignal
+from utils.profiling import timed
 
 
 class ClickableLabel(QLabel):
+    # Emitted on a left click while a pixmap is shown, e.g. to open the zoom view
+    clicked = pyqtSignal()
+
     def __init__(self, name=""):
         super().__init__()
         self.name = name
@@ -23,6 +27,7 @@ class ClickableLabel(QLabel):
         self.update_scaled_pixmap()
 
 
+    @timed("display.scale_pixmap")
     def update_scaled_pixmap(self):
         if not self._pixmap or self._pixmap.isNull():
             return
@@ -42,26 +47,10 @@ class ClickableLabel(QLabel):
         )
         super().setPixmap(scaled_pixmap)
 
+    def source_pixmap(self) -> QPixmap:
+        """The full-resolution pixmap last set, before scaling to the label."""
+        return self._pixmap
+
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton and self._pixmap:
-            self.show_enlarged(self._pixmap)
-
-    def show_enlarged(self, pixmap: QPixmap):
-        dialog = QDialog()
-        dialog.setWindowTitle(f"Enlarged View: {self.name}")
-
-        label = QLabel()
-        label.setPixmap(pixmap.scaled(
-            1200, 1000,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        ))
-
-        scroll = QScrollArea()
-        scroll.setWidget(label)
-
-        layout = QVBoxLayout()
-        layout.addWidget(scroll)
-        dialog.setLayout(layout)
-        dialog.resize(1200, 1000)
-        dialog.exec()
\ No newline at end of file
+            self.clicked.emit()
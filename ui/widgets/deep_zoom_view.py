@@ -0,0 +1,136 @@
+import math
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt6.QtCore import Qt, QRect, QRectF, pyqtSignal
+from PyQt6.QtGui import QPixmap, QPainter, QColor
+from utils.lru import LRUCache
+from utils.profiling import timings
+from ui.widgets.thumbnail_grid import pixmap_size
+
+# Source tiles are TILE_SIZE pixels at their own pyramid level
+TILE_SIZE = 512
+
+
+class TileCache(LRUCache):
+    """Least recently used QPixmap tiles keyed by (source pixmap cacheKey, level, column, row), bounded in bytes."""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        super().__init__("zoom_tiles", max_bytes, pixmap_size)
+
+
+class TiledPixmapItem(QGraphicsItem):
+    """
+    Draws a large pixmap as a pyramid of tiles: level k is the pixmap downscaled by 2**k, cut
+    into TILE_SIZE tiles. Each paint only draws the tiles in the exposed area, at the finest
+    level not finer than the screen resolution, so zooming never scales the whole image.
+    """
+
+    def __init__(self, pixmap: QPixmap, cache: TileCache):
+        super().__init__()
+        self.pixmap = pixmap
+        self.cache = cache
+        self.source_key = pixmap.cacheKey()
+        self.max_level = max(0, math.ceil(math.log2(max(pixmap.width(), pixmap.height(), 1) / TILE_SIZE)))
+        # Needed for option.exposedRect
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self.pixmap.width(), self.pixmap.height())
+
+    def level_for(self, level_of_detail: float) -> int:
+        if level_of_detail >= 1:
+            return 0
+        return min(self.max_level, int(math.floor(math.log2(1 / level_of_detail))))
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
+        level_of_detail = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = self.level_for(level_of_detail)
+        span = TILE_SIZE << level  # source pixels covered by one tile
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        if exposed.isEmpty():
+            return
+
+        # Magnified pixels are drawn as blocks, so mask boundaries stay sharp
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, level_of_detail < 1)
+        image_rect = QRect(0, 0, self.pixmap.width(), self.pixmap.height())
+        for row in range(int(exposed.top()) // span, math.ceil(exposed.bottom() / span)):
+            for column in range(int(exposed.left()) // span, math.ceil(exposed.right() / span)):
+                source = QRect(column * span, row * span, span, span).intersected(image_rect)
+                if source.isEmpty():
+                    continue
+                tile = self.tile(level, column, row, source)
+                painter.drawPixmap(QRectF(source), tile, QRectF(tile.rect()))
+
+    def tile(self, level: int, column: int, row: int, source: QRect) -> QPixmap:
+        key = (self.source_key, level, column, row)
+        tile = self.cache.get(key)
+        if tile is None:
+            with timings.measure("zoom.tile"):
+                tile = self.pixmap.copy(source)
+                if level:
+                    tile = tile.scaled(
+                        max(1, source.width() >> level), max(1, source.height() >> level),
+                        Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+                    )
+            self.cache.put(key, tile)
+        return tile
+
+
+class DeepZoomView(QGraphicsView):
+    """
+    Zoomable (mouse wheel, anchored under the cursor) and pannable (drag) view of one tiled
+    pixmap. view_changed is emitted whenever the zoom or scroll position changes, so views
+    of images with the same size can follow each other (see follow).
+    """
+
+    view_changed = pyqtSignal()
+
+    ZOOM_STEP = 1.25
+    MAX_ZOOM = 32.0
+
+    def __init__(self, pixmap: QPixmap, cache: TileCache, parent=None):
+        super().__init__(parent)
+        self.item = TiledPixmapItem(pixmap, cache)
+        self.setScene(QGraphicsScene(self))
+        self.scene().addItem(self.item)
+        self.scene().setSceneRect(self.item.boundingRect())
+
+        self.setBackgroundBrush(QColor(40, 40, 40))
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        self.horizontalScrollBar().valueChanged.connect(self.view_changed)
+        self.verticalScrollBar().valueChanged.connect(self.view_changed)
+
+    def zoom(self) -> float:
+        return self.transform().m11()
+
+    def fit_zoom(self) -> float:
+        rect = self.item.boundingRect()
+        viewport = self.viewport().rect()
+        return min(viewport.width() / max(rect.width(), 1), viewport.height() / max(rect.height(), 1))
+
+    def fit(self):
+        self.fitInView(self.item, Qt.AspectRatioMode.KeepAspectRatio)
+        self.view_changed.emit()
+
+    def zoom_to(self, zoom: float):
+        # Never zoom out further than fitting the whole image
+        zoom = max(min(self.fit_zoom(), 1.0), min(self.MAX_ZOOM, zoom))
+        factor = zoom / self.zoom()
+        self.scale(factor, factor)
+        self.view_changed.emit()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom_to(self.zoom() * self.ZOOM_STEP ** steps)
+        event.accept()
+
+    def follow(self, other: "DeepZoomView"):
+        """Takes over the zoom and scroll position of other."""
+        self.setTransform(other.transform())
+        self.horizontalScrollBar().setValue(other.horizontalScrollBar().value())
+        self.verticalScrollBar().setValue(other.verticalScrollBar().value())
@@ -0,0 +1,139 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap, QColor
+from utils.lru import LRUCache
+
+
+def pixmap_size(pixmap):
+    return pixmap.width() * pixmap.height() * 4
+
+
+class ThumbnailCache(LRUCache):
+    """Least recently used QPixmap thumbnails keyed by (dataset name, frame_key), bounded in bytes."""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        super().__init__("thumbnails", max_bytes, pixmap_size)
+
+
+class ThumbnailSignals(QObject):
+    # frame_key, rendered thumbnail (null QImage on failure)
+    done = pyqtSignal(str, QImage)
+
+
+class ThumbnailTask(QRunnable):
+    """Renders one thumbnail on the thread pool. The result is delivered to the GUI thread via a signal."""
+
+    def __init__(self, dataset, frame_key, max_size, signals):
+        super().__init__()
+        self.dataset = dataset
+        self.frame_key = frame_key
+        self.max_size = max_size
+        self.signals = signals
+
+    def run(self):
+        try:
+            array = self.dataset.render_thumbnail(self.frame_key, self.max_size)
+            image = QImage(array.data, array.shape[1], array.shape[0], array.strides[0], QImage.Format.Format_RGB888).copy()
+        except Exception as e:
+            print(f"Warning: Could not render thumbnail for {self.frame_key}. Error: {e}")
+            image = QImage()
+        self.signals.done.emit(self.frame_key, image)
+
+
+class FrameGridModel(QAbstractListModel):
+    """
+    One row per frame_key. Thumbnails are requested lazily from data(), which views only call
+    for cells they paint, so only on-screen frames are ever rendered. Check states mirror
+    the shared selected_files set.
+    """
+
+    def __init__(self, dataset, frame_keys, selected_files, cache, thumbnail_size=160, parent=None):
+        super().__init__(parent)
+        self.dataset = dataset
+        self.frame_keys = frame_keys
+        self.row_of = {frame_key: row for row, frame_key in enumerate(frame_keys)}
+        self.selected_files = selected_files
+        self.cache = cache
+        self.thumbnail_size = thumbnail_size
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() // 2))
+        self.signals = ThumbnailSignals()
+        self.signals.done.connect(self.on_thumbnail_ready)
+        self._pending = set()
+        # Frames whose thumbnail could not be rendered; not requested again while this model lives
+        # (a grid opened later, e.g. after fixing the files, tries them again)
+        self._failed = set()
+
+        self.placeholder = QPixmap(thumbnail_size, thumbnail_size * 3 // 4)
+        self.placeholder.fill(QColor("#d0d0d0"))
+        self.failed_placeholder = QPixmap(thumbnail_size, thumbnail_size * 3 // 4)
+        self.failed_placeholder.fill(QColor("#e6b0aa"))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.frame_keys)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        frame_key = self.frame_keys[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return frame_key.rsplit('/', 1)[-1]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{frame_key} (thumbnail could not be rendered)" if frame_key in self._failed else frame_key
+        if role == Qt.ItemDataRole.DecorationRole:
+            if frame_key in self._failed:
+                return self.failed_placeholder
+            pixmap = self.cache.get((self.dataset.name, frame_key))
+            if pixmap is None:
+                self.request(frame_key)
+                return self.placeholder
+            return pixmap
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if frame_key in self.selected_files else Qt.CheckState.Unchecked
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not index.isValid():
+            return False
+        self.set_selected([index.row()], Qt.CheckState(value) == Qt.CheckState.Checked)
+        return True
+
+    def set_selected(self, rows, selected):
+        """Adds or removes the frames of the given rows from the selection in one batch."""
+        if not rows:
+            return
+        keys = [self.frame_keys[row] for row in rows]
+        if selected:
+            self.selected_files.update(keys)
+        else:
+            self.selected_files.difference_update(keys)
+        self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [Qt.ItemDataRole.CheckStateRole])
+
+    def request(self, frame_key):
+        if frame_key in self._pending:
+            return
+        self._pending.add(frame_key)
+        self.pool.start(ThumbnailTask(self.dataset, frame_key, self.thumbnail_size, self.signals))
+
+    def drop_pending(self):
+        """Forgets queued renders (e.g. for cells scrolled out of view); visible cells request again when painted."""
+        self.pool.clear()
+        self._pending.clear()
+
+    def on_thumbnail_ready(self, frame_key, image):
+        self._pending.discard(frame_key)
+        if image.isNull():
+            self._failed.add(frame_key)
+        else:
+            self.cache.put((self.dataset.name, frame_key), QPixmap.fromImage(image))
+        row = self.row_of.get(frame_key)
+        if row is not None:
+            model_index = self.index(row)
+            self.dataChanged.emit(model_index, model_index, [Qt.ItemDataRole.DecorationRole])
+
+    def shutdown(self):
+        self.pool.clear()
+        self.pool.waitForDone()
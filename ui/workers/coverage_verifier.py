@@ -0,0 +1,33 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class CoverageVerifier(QObject):
+    """
+    Worker object that checks a dataset's annotation-derived coverages against its decoded
+    masks in a background thread (PanopticDataset.verify_coverages).
+    """
+    # frames checked, total frames
+    progress = pyqtSignal(int, int)
+    # dataset name, {frame_key: (annotated, decoded)}
+    finished = pyqtSignal(str, object)
+    cancelled = pyqtSignal()
+
+    def __init__(self, dataset, tolerance=0.5):
+        super().__init__()
+        self.dataset = dataset
+        self.tolerance = tolerance
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        mismatches = self.dataset.verify_coverages(
+            tolerance=self.tolerance,
+            progress_callback=self.progress.emit,
+            should_cancel=lambda: self._cancel_requested,
+        )
+        if self._cancel_requested:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(self.dataset.name, mismatches)
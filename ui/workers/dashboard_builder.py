@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt6.QtCore import QObject, pyqtSignal
+from utils.state import AppState
+from utils.profiling import timings
+
+
+class DashboardBuilder(QObject):
+    """
+    Worker object that compares the selections of all configured datasets with their full
+    statistics (AppState.compare_selection) in parallel, in a background thread.
+    """
+    # datasets done, total datasets
+    progress = pyqtSignal(int, int)
+    # [(dataset name, SelectionComparison or None, sources)] in configuration order
+    finished = pyqtSignal(object)
+    cancelled = pyqtSignal()
+
+    MAX_WORKERS = 8
+
+    def __init__(self, state: AppState, selections):
+        """selections maps dataset names to selected frame keys that replace their saved selection file (e.g. the active one)."""
+        super().__init__()
+        self.state = state
+        self.selections = selections
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Skips the datasets not started yet; the ones in progress finish first."""
+        self._cancel_requested = True
+
+    def _compare(self, name):
+        if self._cancel_requested:
+            return None, "cancelled"
+        try:
+            return self.state.compare_selection(name, self.selections.get(name))
+        except Exception as e:
+            print(f"Warning: Could not compute statistics of {name}. Error: {e}")
+            return None, f"failed: {e}"
+
+    def run(self):
+        names = list(self.state.datasets)
+        results = {}
+        with timings.measure("dashboard.build"):
+            with ThreadPoolExecutor(max_workers=max(1, min(self.MAX_WORKERS, len(names)))) as pool:
+                futures = {pool.submit(self._compare, name): name for name in names}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    self.progress.emit(done, len(names))
+                    if self._cancel_requested:
+                        pool.shutdown(wait=True, cancel_futures=True)
+                        break
+        if self._cancel_requested:
+            self.cancelled.emit()
+        else:
+            self.finished.emit([(name, *results[name]) for name in names])
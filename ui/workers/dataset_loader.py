@@ -1,5 +1,7 @@
+import time
 from PyQt6.QtCore import QObject, pyqtSignal
 from utils.state import AppState
+from datasets.base_dataset import LoadCancelled
 
 class DatasetLoader(QObject):
     """
@@ -7,15 +9,36 @@ class DatasetLoader(QObject):
     """
     finished = pyqtSignal()
     error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    # frames processed, total frames, throughput (frames/s), estimated seconds remaining (-1 if unknown)
+    progress = pyqtSignal(int, int, float, float)
 
     def __init__(self, state: AppState):
         super().__init__()
         self.state = state
+        self._cancel_requested = False
+        self._start_time = None
+
+    def cancel(self):
+        """Requests a cooperative stop. Called from the GUI thread; the load stops at its next check."""
+        self._cancel_requested = True
+
+    def is_cancel_requested(self):
+        return self._cancel_requested
+
+    def report_progress(self, done, total):
+        elapsed = time.perf_counter() - self._start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else -1.0
+        self.progress.emit(done, total, rate, eta)
 
     def run(self):
         """The long-running task."""
+        self._start_time = time.perf_counter()
         try:
-            self.state.load_active_dataset_data()
+            self.state.load_active_dataset_data(self.report_progress, self.is_cancel_requested)
             self.finished.emit()
+        except LoadCancelled:
+            self.cancelled.emit()
         except Exception as e:
-            self.error.emit(f"An error occurred while loading dataset: {e}")
\ No newline at end of file
+            self.error.emit(f"An error occurred while loading dataset: {e}")
@@ -0,0 +1,45 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from utils.state import AppState
+from datasets.base_dataset import LoadCancelled
+
+
+class DatasetPreloader(QObject):
+    """
+    Worker object that loads the given datasets one after another in a background thread,
+    so that switching to them later is instant.
+    """
+    dataset_loaded = pyqtSignal(str)
+    # dataset name, snapshot of the active dataset for AppState.publish_snapshot in the GUI thread
+    snapshot_ready = pyqtSignal(str, object)
+    error = pyqtSignal(str, str)
+    finished = pyqtSignal()
+
+    def __init__(self, state: AppState, dataset_names):
+        super().__init__()
+        self.state = state
+        self.dataset_names = list(dataset_names)
+        self._stop_requested = False
+
+    def stop(self):
+        """Aborts the dataset currently being loaded and skips the remaining ones."""
+        self._stop_requested = True
+
+    def run(self):
+        for name in self.dataset_names:
+            if self._stop_requested or not self.state.can_preload_more():
+                break
+            try:
+                if name == self.state.current_dataset_name:
+                    # The GUI reads the active dataset, so only the GUI thread may swap it
+                    if self.state.is_dataset_ready(name):
+                        continue
+                    snapshot = self.state.build_snapshot(name, should_cancel=lambda: self._stop_requested)
+                    self.snapshot_ready.emit(name, snapshot)
+                    continue
+                self.state.load_dataset(name, should_cancel=lambda: self._stop_requested)
+                self.dataset_loaded.emit(name)
+            except LoadCancelled:
+                break
+            except Exception as e:
+                self.error.emit(name, f"An error occurred while preloading dataset: {e}")
+        self.finished.emit()
@@ -0,0 +1,60 @@
+import threading
+from PyQt6.QtCore import QObject, Qt, pyqtSignal, pyqtSlot
+from utils.state import AppState
+
+
+class FrameRenderer(QObject):
+    """
+    Worker object rendering frames (PanopticDataset.load_image) in a background thread.
+
+    Requests are coalesced: only the most recent one is kept, so holding an arrow key never
+    queues more than one render behind the one in progress. Every request carries the
+    caller's generation number, echoed back with the result, so the GUI can discard
+    results for frames it has already moved past.
+    """
+    # generation, frame_key, (original QImage, mask QImage, labels)
+    rendered = pyqtSignal(int, str, object)
+    # generation, frame_key, error message
+    failed = pyqtSignal(int, str, str)
+    _wake = pyqtSignal()
+
+    def __init__(self, state: AppState):
+        super().__init__()
+        self.state = state
+        self._lock = threading.Lock()
+        self._pending = None
+        self._scheduled = False
+        # Emitted from the GUI thread and delivered in the worker's thread once moved there. The
+        # slot must be a pyqtSlot: a plain method would be called through a proxy living in the
+        # GUI thread, i.e. every render would block the GUI.
+        self._wake.connect(self._process, Qt.ConnectionType.QueuedConnection)
+
+    def request(self, generation, dataset, frame_key):
+        """Asks for frame_key to be rendered, replacing any request that has not started yet."""
+        with self._lock:
+            self._pending = (generation, dataset, frame_key)
+            wake = not self._scheduled
+            self._scheduled = True
+        if wake:
+            self._wake.emit()
+
+    @pyqtSlot()
+    def _process(self):
+        while True:
+            with self._lock:
+                request = self._pending
+                self._pending = None
+                if request is None:
+                    self._scheduled = False
+                    return
+
+            generation, dataset, frame_key = request
+            try:
+                result = self.state.render_frame(frame_key, dataset)
+            except FileNotFoundError as e:
+                self.failed.emit(generation, frame_key, f"Image or mask not found for: {frame_key}\n\n{e}")
+                continue
+            except Exception as e:
+                self.failed.emit(generation, frame_key, f"Could not render {frame_key}: {e}")
+                continue
+            self.rendered.emit(generation, frame_key, result)
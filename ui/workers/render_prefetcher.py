@@ -0,0 +1,49 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from datasets.render_service import RenderService
+
+
+class RenderPrefetcher(QObject):
+    """
+    Renders upcoming frames ahead of navigation in a RenderService's worker processes and
+    delivers them to the GUI thread. The receiver owns each delivered RenderedFrame and must
+    release() it.
+    """
+    # frame_key, RenderedFrame
+    frame_ready = pyqtSignal(str, object)
+    # frame_key, error message
+    frame_failed = pyqtSignal(str, str)
+
+    def __init__(self, service: RenderService):
+        super().__init__()
+        self.service = service
+        # Frames submitted and not yet delivered; only touched in the GUI thread
+        self._pending = set()
+
+    def is_pending(self, frame_key):
+        return frame_key in self._pending
+
+    def mark_delivered(self, frame_key):
+        self._pending.discard(frame_key)
+
+    def prefetch(self, frame_keys):
+        for frame_key in frame_keys:
+            if frame_key in self._pending:
+                continue
+            future = self.service.submit(frame_key, block=False)
+            if future is None:
+                break  # All slots are busy; the next navigation step tries again
+            self._pending.add(frame_key)
+            future.add_done_callback(lambda f, frame_key=frame_key: self._on_done(frame_key, f))
+
+    def _on_done(self, frame_key, future):
+        # Runs in the executor's thread; the signals are queued to the GUI thread
+        try:
+            frame = future.result()
+        except Exception as e:
+            self.frame_failed.emit(frame_key, str(e))
+            return
+        self.frame_ready.emit(frame_key, frame)
+
+    def shutdown(self):
+        self.service.shutdown()
+        self._pending.clear()
@@ -0,0 +1,44 @@
+import time
+from PyQt6.QtCore import QObject, pyqtSignal
+from utils.state import AppState
+from datasets.base_dataset import LoadCancelled
+
+
+class SnapshotBuilder(QObject):
+    """
+    Worker object that reloads a dataset into a new snapshot in a background thread
+    (AppState.build_snapshot) while the GUI keeps working on the published one.
+    """
+    # dataset name, new snapshot for AppState.publish_snapshot
+    finished = pyqtSignal(str, object)
+    error = pyqtSignal(str, str)
+    cancelled = pyqtSignal()
+    # frames processed, total frames, throughput (frames/s)
+    progress = pyqtSignal(int, int, float)
+
+    def __init__(self, state: AppState, dataset_name, full=False):
+        super().__init__()
+        self.state = state
+        self.dataset_name = dataset_name
+        self.full = full
+        self._cancel_requested = False
+        self._start_time = None
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def report_progress(self, done, total):
+        elapsed = time.perf_counter() - self._start_time
+        self.progress.emit(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+    def run(self):
+        self._start_time = time.perf_counter()
+        try:
+            snapshot = self.state.build_snapshot(
+                self.dataset_name, self.full, self.report_progress, lambda: self._cancel_requested
+            )
+            self.finished.emit(self.dataset_name, snapshot)
+        except LoadCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.error.emit(self.dataset_name, f"An error occurred while reloading dataset: {e}")
@@ -1,4 +1,11 @@
-# Optional convenience exports
-from .state import AppState
-
+# Optional convenience exports.
+# AppState is imported lazily so that lightweight tools (e.g. selection_ops.py) can use
+# utils.selections without pulling in PyQt6/detectron2 through the dataset classes.
 __all__ = ["AppState", "resize_image"]
+
+
+def __getattr__(name):
+    if name == "AppState":
+        from .state import AppState
+        return AppState
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
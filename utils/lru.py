@@ -0,0 +1,100 @@
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+# All live caches by name, so their memory can be reported in one place (see memory_summary)
+_registry = weakref.WeakValueDictionary()
+
+
+class LRUCache:
+    """
+    Thread-safe least recently used cache bounded by the total estimated size of its values.
+
+    sizeof(value) estimates the bytes held by a value. The most recently inserted entry is
+    always kept, even if it alone exceeds max_bytes.
+    """
+
+    def __init__(self, name, max_bytes, sizeof=sys.getsizeof):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return default
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._items[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._items) > 1:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    # Dictionary-style access, so an LRUCache can replace a plain dict cache
+    __setitem__ = put
+
+    def __getitem__(self, key):
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._items.pop(key, None)
+            if entry is None:
+                return default
+            self.total_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def __getstate__(self):
+        # Pickles (e.g. for worker processes) as an empty cache with the same budget
+        state = self.__dict__.copy()
+        state["_items"] = OrderedDict()
+        state["total_bytes"] = 0
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        _registry[self.name] = self
+
+    def stats(self):
+        return {"items": len(self._items), "bytes": self.total_bytes, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+
+_missing = object()
+
+
+def memory_summary():
+    """{cache name: stats()} for every live LRUCache."""
+    return {name: cache.stats() for name, cache in sorted(_registry.items())}
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import cProfile
+import pstats
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+import numpy as np
+
+PROFILE_DIR = "profiles"
+
+
+class StageTimings:
+    """
+    Collects wall-clock durations of named processing stages (e.g. "load_image.visualizer").
+    Only the most recent max_samples durations per stage are kept, so recording is cheap
+    and memory stays bounded however long the session runs.
+    """
+
+    def __init__(self, max_samples=2048):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.max_samples)
+                self._counts[stage] = 0
+            samples.append(seconds)
+            self._counts[stage] += 1
+
+    @contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def summary(self):
+        """Returns {stage: {count, p50_ms, p95_ms, mean_ms, max_ms}} over the retained samples."""
+        with self._lock:
+            snapshot = {stage: (np.array(samples), self._counts[stage]) for stage, samples in self._samples.items()}
+
+        result = {}
+        for stage, (samples, count) in sorted(snapshot.items()):
+            if samples.size == 0:
+                continue
+            p50, p95 = np.percentile(samples, [50, 95]) * 1000
+            result[stage] = {
+                "count": count,
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "mean_ms": round(float(samples.mean() * 1000), 3),
+                "max_ms": round(float(samples.max() * 1000), 3),
+            }
+        return result
+
+    def dump_json(self, path):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+# Process-wide collector used by the timing hooks in the datasets and the UI
+timings = StageTimings()
+
+
+def timed(stage):
+    """Decorator recording the duration of every call under the given stage name."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timings.measure(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Profiler:
+    """Starts and stops cProfile on demand and writes .prof files (readable with pstats or snakeviz)."""
+
+    def __init__(self, output_dir=PROFILE_DIR):
+        self.output_dir = output_dir
+        self._profile = None
+
+    def is_running(self):
+        return self._profile is not None
+
+    def start(self):
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        """Stops profiling and writes the results. Returns the path of the .prof file."""
+        if self._profile is None:
+            return None
+        self._profile.disable()
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+        self._profile.dump_stats(path)
+
+        # A human readable summary next to the binary dump
+        with open(os.path.splitext(path)[0] + ".txt", "w") as f:
+            stats = pstats.Stats(self._profile, stream=f)
+            stats.sort_stats("cumulative").print_stats(50)
+
+        self._profile = None
+        return path
+
+    def toggle(self):
+        """Starts profiling, or stops it and returns the written path."""
+        if self.is_running():
+            return self.stop()
+        self.start()
+        return None
+
+
+profiler = Profiler()
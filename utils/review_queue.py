@@ -0,0 +1,155 @@
+import heapq
+import numpy as np
+
+# Scores are patched incrementally, so values within this of each other count as equal
+EPSILON = 1e-12
+
+
+class ReviewQueue:
+    """
+    Frames in the order in which reviewing them most helps rare categories that are still
+    under-represented in the selection.
+
+    Category c has weight rarity[c] * deficit[c]:
+
+        rarity[c]   -log of c's share of the dataset's segments (goal_freqs)
+        deficit[c]  how far the selection's segment count of c (as in get_current_stats) is
+                    below c's goal share of a target subset of target_frames frames, from 1
+                    (absent) to 0 (reached)
+
+    A frame's score is the sum of the weights of the categories it contains. A category's
+    weight only depends on its own count, so a selection change only touches the categories
+    of the changed frames and the scores of frames containing them.
+
+    The queue is a heap with lazy invalidation rather than a sorted file_list: entries are
+    checked against the current score when they reach the top. Entries whose score dropped
+    are pushed back with the new score; rows whose score rose are pushed again right away,
+    and their outdated entries are dropped when popped.
+    """
+
+    def __init__(self, dataset, selected_mask, target_frames, candidates=None):
+        """
+        selected_mask: current selection over the rows of dataset.get_frame_index().
+        candidates: rows that may be queued (e.g. the visible frames), all if None.
+        """
+        index = dataset.get_frame_index()
+        self.index = index
+        num_frames, num_categories = index.num_frames, index.num_categories
+
+        # goal_freqs is aligned with all_labels, which are the index's category columns
+        goal = np.asarray(dataset.goal_freqs, dtype=np.float64)
+        goal_total = goal.sum()
+        goal_share = goal / goal_total if goal_total > 0 else goal
+        with np.errstate(divide="ignore"):
+            self.rarity = np.where(goal_share > 0, -np.log(np.where(goal_share > 0, goal_share, 1.0)), 0.0)
+        # Segments of each category in a subset of target_frames frames matching the dataset
+        self.target_counts = goal * (target_frames / max(num_frames, 1))
+
+        # Entries by frame (their stored order) and by category, as CSR-style offsets
+        self.frame_start = np.searchsorted(index.entry_frame, np.arange(num_frames + 1))
+        self.category_order = np.argsort(index.entry_cat, kind="stable")
+        self.category_start = np.searchsorted(index.entry_cat[self.category_order], np.arange(num_categories + 1))
+
+        self.selected = np.asarray(selected_mask, dtype=bool).copy()
+        self.selected_counts = index.category_totals(self.selected, values="count")
+        self.weights = self._weights(np.arange(num_categories))
+        self.scores = np.bincount(index.entry_frame, weights=self.weights[index.entry_cat], minlength=num_frames)
+
+        self.candidates = np.ones(num_frames, dtype=bool) if candidates is None else candidates.copy()
+        self.reviewed = np.zeros(num_frames, dtype=bool)
+        self._rebuild_heap()
+
+    def _weights(self, categories):
+        targets = self.target_counts[categories]
+        deficit = np.clip(1.0 - self.selected_counts[categories] / np.where(targets > 0, targets, 1.0), 0.0, 1.0)
+        return self.rarity[categories] * np.where(targets > 0, deficit, 0.0)
+
+    def _eligible(self, rows):
+        return self.candidates[rows] & ~self.selected[rows] & ~self.reviewed[rows] & (self.scores[rows] > EPSILON)
+
+    def _rebuild_heap(self):
+        rows = np.arange(self.index.num_frames)
+        rows = rows[self._eligible(rows)]
+        self._heap = list(zip((-self.scores[rows]).tolist(), rows.tolist()))
+        heapq.heapify(self._heap)
+
+    @staticmethod
+    def _ranges(starts, ends):
+        """Concatenation of the integer ranges [starts[i], ends[i])."""
+        counts = ends - starts
+        offsets = starts - (np.cumsum(counts) - counts)
+        return np.arange(int(counts.sum()), dtype=np.int64) + np.repeat(offsets, counts)
+
+    def update_selection(self, rows, selected):
+        """Records that the frames at rows are now selected (selected[i] True) or not."""
+        rows = np.asarray(rows, dtype=np.int64)
+        selected = np.asarray(selected, dtype=bool)
+        changed = selected != self.selected[rows]
+        rows, selected = rows[changed], selected[changed]
+        if rows.size == 0:
+            return
+        self.selected[rows] = selected
+
+        index = self.index
+        entries = self._ranges(self.frame_start[rows], self.frame_start[rows + 1])
+        signs = np.repeat(np.where(selected, 1.0, -1.0), self.frame_start[rows + 1] - self.frame_start[rows])
+        count_delta = np.bincount(index.entry_cat[entries], weights=index.entry_count[entries] * signs,
+                                  minlength=index.num_categories)
+        categories = np.flatnonzero(count_delta)
+        self.selected_counts[categories] += count_delta[categories]
+
+        new_weights = self._weights(categories)
+        weight_delta = np.zeros(index.num_categories, dtype=np.float64)
+        weight_delta[categories] = new_weights - self.weights[categories]
+        self.weights[categories] = new_weights
+
+        moved = np.flatnonzero(weight_delta)
+        risen = np.zeros(0, dtype=np.int64)
+        if moved.size:
+            entries = self.category_order[self._ranges(self.category_start[moved], self.category_start[moved + 1])]
+            score_delta = np.bincount(index.entry_frame[entries], weights=weight_delta[index.entry_cat[entries]],
+                                      minlength=index.num_frames)
+            self.scores += score_delta
+            risen = np.flatnonzero(score_delta > EPSILON)
+
+        # Deselected frames that were never reviewed return to the queue
+        push = np.union1d(risen, rows[~selected])
+        push = push[self._eligible(push)]
+        if push.size > len(self._heap) // 4:
+            self._rebuild_heap()
+        else:
+            for row in push.tolist():
+                heapq.heappush(self._heap, (-self.scores[row], row))
+
+    def sync_selection(self, selected_mask):
+        """Brings the queue up to date with a selection that may have changed anywhere."""
+        rows = np.flatnonzero(selected_mask != self.selected)
+        self.update_selection(rows, selected_mask[rows])
+
+    def pop(self):
+        """(row, score) of the highest-scoring frame not yet reviewed or selected, or None if none is left. Marks it reviewed."""
+        heap = self._heap
+        while heap:
+            negative_score, row = heap[0]
+            score = self.scores[row]
+            if self.selected[row] or self.reviewed[row] or not self.candidates[row] or score <= EPSILON:
+                heapq.heappop(heap)
+                continue
+            if abs(-negative_score - score) > EPSILON:
+                # Outdated entry: reinsert with the current score
+                heapq.heapreplace(heap, (-score, row))
+                continue
+            heapq.heappop(heap)
+            self.reviewed[row] = True
+            return row, float(score)
+        return None
+
+    def remaining(self):
+        return int(np.count_nonzero(self.candidates & ~self.selected & ~self.reviewed & (self.scores > EPSILON)))
+
+    def top_categories(self, row, count=3):
+        """Category ids contributing most to a frame's score."""
+        entries = np.arange(self.frame_start[row], self.frame_start[row + 1])
+        columns = self.index.entry_cat[entries]
+        columns = columns[np.argsort(-self.weights[columns], kind="stable")[:count]]
+        return [int(self.index.category_ids[c]) for c in columns if self.weights[c] > 0]
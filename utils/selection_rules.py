@@ -0,0 +1,124 @@
+import numpy as np
+
+
+def resolve_category(dataset, token):
+    """
+    Resolves a category given as an id ("7") or a name ("person", case-insensitive)
+    to its category id. Raises ValueError if it does not exist in the dataset.
+    """
+    token = str(token).strip()
+    if token.lstrip("-").isdigit() and int(token) in dataset.categories:
+        return int(token)
+    for cat_id, cat in dataset.categories.items():
+        if cat.get("name", "").lower() == token.lower():
+            return cat_id
+    raise ValueError(f"Unknown category '{token}' for dataset '{dataset.name}'.")
+
+
+class SelectionRules:
+    """
+    A set of simple selection rules evaluated over a FrameIndex in vectorized form.
+    All rules are combined with AND; the per-video cap is applied last.
+
+    small_segments holds (category id, max pixels) pairs: frames must contain a segment of that
+    category smaller than max pixels. These rules need the dataset's SegmentIndex.
+    """
+
+    PER_VIDEO_STRATEGIES = ("first", "uniform")
+
+    def __init__(self, min_coverage=None, max_coverage=None,
+                 require_all=(), require_any=(), exclude=(),
+                 min_segments=None, max_segments=None, small_segments=(),
+                 per_video=None, per_video_strategy="first"):
+        if per_video_strategy not in self.PER_VIDEO_STRATEGIES:
+            raise ValueError(f"Unknown per-video strategy '{per_video_strategy}'.")
+        if per_video is not None and per_video < 0:
+            raise ValueError("The per-video cap must not be negative.")
+
+        self.min_coverage = min_coverage
+        self.max_coverage = max_coverage
+        self.require_all = list(require_all)
+        self.require_any = list(require_any)
+        self.exclude = list(exclude)
+        self.min_segments = min_segments
+        self.max_segments = max_segments
+        self.small_segments = list(small_segments)
+        self.per_video = per_video
+        self.per_video_strategy = per_video_strategy
+
+    def evaluate(self, index, candidates=None, segments=None):
+        """
+        Returns a boolean mask over index rows of the frames matching all rules.
+        If candidates is given, only those rows are considered. segments is the SegmentIndex
+        for small_segments rules.
+        """
+        mask = np.ones(index.num_frames, dtype=bool) if candidates is None else candidates.copy()
+
+        if self.min_coverage is not None:
+            mask &= index.coverages >= self.min_coverage
+        if self.max_coverage is not None:
+            mask &= index.coverages <= self.max_coverage
+        if self.min_segments is not None:
+            mask &= index.mask_counts >= self.min_segments
+        if self.max_segments is not None:
+            mask &= index.mask_counts <= self.max_segments
+
+        for cat_id in self.require_all:
+            mask &= index.frames_with_category(cat_id)
+        if self.require_any:
+            any_mask = np.zeros(index.num_frames, dtype=bool)
+            for cat_id in self.require_any:
+                any_mask |= index.frames_with_category(cat_id)
+            mask &= any_mask
+        for cat_id in self.exclude:
+            mask &= ~index.frames_with_category(cat_id)
+        if self.small_segments:
+            if segments is None or segments.index is not index:
+                raise ValueError("Small-segment rules need the SegmentIndex of the same frames.")
+            for cat_id, max_area in self.small_segments:
+                mask &= segments.frames_with_small_segment(cat_id, max_area)
+
+        if self.per_video is not None:
+            mask &= self._per_video_cap(index, mask)
+        return mask
+
+    def _per_video_cap(self, index, mask):
+        """Keeps at most per_video of the matching frames of each video (or of the whole image dataset)."""
+        ranks = index.rank_within_video(mask)
+        if self.per_video_strategy == "first":
+            return (ranks >= 0) & (ranks < self.per_video)
+
+        # "uniform": spread the kept frames evenly over each video's matching frames.
+        # A frame is kept when floor(rank * K / n) steps up compared to the previous rank.
+        sizes = index.video_sizes(mask)[index.video_codes]
+        sizes = np.maximum(sizes, 1)
+        k = np.minimum(self.per_video, sizes)
+        bucket = (ranks * k) // sizes
+        previous_bucket = ((ranks - 1) * k) // sizes
+        return (ranks == 0) & (k > 0) | (ranks > 0) & (bucket != previous_bucket)
+
+    def describe(self, dataset=None):
+        """Human readable summary of the active rules."""
+        def name(cat_id):
+            return dataset._get_label_name(cat_id) if dataset is not None else str(cat_id)
+
+        parts = []
+        if self.min_coverage is not None:
+            parts.append(f"coverage >= {self.min_coverage}%")
+        if self.max_coverage is not None:
+            parts.append(f"coverage <= {self.max_coverage}%")
+        if self.min_segments is not None:
+            parts.append(f"segments >= {self.min_segments}")
+        if self.max_segments is not None:
+            parts.append(f"segments <= {self.max_segments}")
+        if self.require_all:
+            parts.append("contains all of [" + ", ".join(name(c) for c in self.require_all) + "]")
+        if self.require_any:
+            parts.append("contains any of [" + ", ".join(name(c) for c in self.require_any) + "]")
+        if self.exclude:
+            parts.append("contains none of [" + ", ".join(name(c) for c in self.exclude) + "]")
+        for cat_id, max_area in self.small_segments:
+            parts.append(f"has a {name(cat_id)} segment < {max_area} px")
+        if self.per_video is not None:
+            parts.append(f"at most {self.per_video} per video ({self.per_video_strategy})")
+        return " AND ".join(parts) if parts else "all frames"
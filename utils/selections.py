@@ -0,0 +1,180 @@
+import os
+import json
+import zlib
+import struct
+import hashlib
+import numpy as np
+
+SELECTION_DIR = "selected_annotations"
+BITMAP_EXTENSION = ".selbm"
+BITMAP_MAGIC = b"ANNSELBM"
+BITMAP_VERSION = 1
+
+
+def selection_file_path(dataset_name, folder=SELECTION_DIR, extension=".json"):
+    """Returns the path of the selection file for a dataset, e.g. selected_vipseg_val.json."""
+    safe_name = dataset_name.replace(" ", "_").lower()
+    return os.path.join(folder, f"selected_{safe_name}{extension}")
+
+
+def read_selection_file(path):
+    """
+    Reads a JSON selection file and returns (selected_files, last_viewed).
+    Supports both the dictionary format written by the GUI and the old plain list format.
+    """
+    with open(path, "r") as f:
+        loaded_data = json.load(f)
+
+    last_viewed = None
+    if isinstance(loaded_data, dict):
+        # New format: {"selected_files": [...], "last_viewed": "..."}
+        selected_files = loaded_data.get("selected_files", [])
+        last_viewed = loaded_data.get("last_viewed")
+        if not isinstance(selected_files, list):
+            raise ValueError("The 'selected_files' key must contain a list.")
+    elif isinstance(loaded_data, list):
+        # Old format (backward compatibility): [...]
+        selected_files = loaded_data
+    else:
+        raise ValueError("Unsupported selection file format. Expected a list or a dictionary.")
+
+    return selected_files, last_viewed
+
+
+def write_selection_file(path, selected_files, last_viewed=None):
+    """Writes selections in the dictionary format read by read_selection_file."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    data_to_save = {
+        "selected_files": sorted(selected_files),
+        "last_viewed": last_viewed
+    }
+    with open(path, "w") as f:
+        json.dump(data_to_save, f, indent=2)
+
+
+def frame_order_fingerprint(file_list):
+    """Hash of the dataset's frame ordering. Bitmaps are only comparable if their fingerprints match."""
+    digest = hashlib.sha1()
+    for frame_key in file_list:
+        digest.update(frame_key.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class SelectionBitmap:
+    """
+    A selection stored as one bit per frame over the dataset's stable frame ordering
+    (the naturally sorted file_list used by AppState).
+
+    Bits are kept packed (8 frames per byte) so set operations run directly on the
+    packed bytes. On disk the packed bits are zlib-compressed behind a small JSON header.
+    """
+
+    def __init__(self, packed, num_frames, fingerprint, dataset_name=""):
+        self.packed = np.asarray(packed, dtype=np.uint8)
+        self.num_frames = num_frames
+        self.fingerprint = fingerprint
+        self.dataset_name = dataset_name
+
+        expected_bytes = (num_frames + 7) // 8
+        if self.packed.size != expected_bytes:
+            raise ValueError(f"Bitmap has {self.packed.size} bytes, expected {expected_bytes} for {num_frames} frames.")
+
+    @classmethod
+    def from_mask(cls, mask, fingerprint, dataset_name=""):
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.packbits(mask, bitorder="little"), mask.size, fingerprint, dataset_name)
+
+    @classmethod
+    def from_keys(cls, file_list, selected_files, dataset_name=""):
+        """
+        Builds a bitmap from frame keys. Keys that are not part of file_list are ignored,
+        exactly like load_selections ignores them. Returns (bitmap, number_of_ignored_keys).
+        """
+        positions = {frame_key: i for i, frame_key in enumerate(file_list)}
+        indices = [positions[k] for k in selected_files if k in positions]
+        mask = np.zeros(len(file_list), dtype=bool)
+        mask[np.asarray(indices, dtype=np.int64)] = True
+        bitmap = cls.from_mask(mask, frame_order_fingerprint(file_list), dataset_name)
+        return bitmap, len(set(selected_files)) - int(mask.sum())
+
+    def to_mask(self):
+        return np.unpackbits(self.packed, count=self.num_frames, bitorder="little").astype(bool)
+
+    def to_indices(self):
+        return np.flatnonzero(self.to_mask())
+
+    def to_keys(self, file_list):
+        if frame_order_fingerprint(file_list) != self.fingerprint:
+            raise ValueError(
+                f"Bitmap was built for a different frame ordering of '{self.dataset_name}'. "
+                "The dataset or its annotation file has changed since the bitmap was written."
+            )
+        return [file_list[i] for i in self.to_indices()]
+
+    def count(self):
+        return int(np.unpackbits(self.packed).sum())
+
+    def _check_compatible(self, other):
+        if self.fingerprint != other.fingerprint or self.num_frames != other.num_frames:
+            raise ValueError(
+                f"Cannot combine bitmaps of '{self.dataset_name}' and '{other.dataset_name}': "
+                "they were built over different frame orderings."
+            )
+
+    def _combine(self, other, op):
+        self._check_compatible(other)
+        return SelectionBitmap(op(self.packed, other.packed), self.num_frames, self.fingerprint, self.dataset_name)
+
+    def union(self, other):
+        return self._combine(other, np.bitwise_or)
+
+    def intersection(self, other):
+        return self._combine(other, np.bitwise_and)
+
+    def difference(self, other):
+        return self._combine(other, lambda a, b: np.bitwise_and(a, np.bitwise_not(b)))
+
+    def save(self, path):
+        header = json.dumps({
+            "version": BITMAP_VERSION,
+            "dataset": self.dataset_name,
+            "num_frames": self.num_frames,
+            "fingerprint": self.fingerprint,
+            "count": self.count(),
+        }).encode("utf-8")
+        payload = zlib.compress(self.packed.tobytes(), 6)
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(BITMAP_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(payload)
+
+    @staticmethod
+    def read_header(path):
+        """Reads only the header of a bitmap file (dataset, num_frames, fingerprint, count)."""
+        with open(path, "rb") as f:
+            return SelectionBitmap._read_header(f, path)
+
+    @staticmethod
+    def _read_header(f, path):
+        if f.read(len(BITMAP_MAGIC)) != BITMAP_MAGIC:
+            raise ValueError(f"'{path}' is not a selection bitmap file.")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        if header.get("version") != BITMAP_VERSION:
+            raise ValueError(f"Unsupported bitmap version {header.get('version')} in '{path}'.")
+        return header
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            header = cls._read_header(f, path)
+            packed = np.frombuffer(zlib.decompress(f.read()), dtype=np.uint8)
+        return cls(packed, header["num_frames"], header["fingerprint"], header.get("dataset", ""))
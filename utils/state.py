@@ -1,5 +1,13 @@
 from datasets.panoptic_dataset import PanopticDataset
+from datasets.base_dataset import LoadCancelled
+from datasets.dataset_summary import DatasetSummary
+from datasets.remote_dataset import RemoteDataset, MetadataClient, DEFAULT_ADDRESS, read_authkey
+from utils.lru import LRUCache
+from utils.selections import selection_file_path, read_selection_file
+from collections import OrderedDict
+import threading
 import json
+import os
 import re
 
 def natural_sort_key(s):
@@ -8,8 +16,47 @@ def natural_sort_key(s):
     """
     return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', s)]
 
+def rendered_frame_size(frame):
+    """Bytes held by a cached (original QImage, mask QImage, labels) entry."""
+    original, mask, labels = frame
+    return original.sizeInBytes() + mask.sizeInBytes() + 100 * len(labels)
+
+def sort_frame_keys(file_list, is_video_dataset):
+    """
+    Sorts frame keys in place into the stable, natural order used by the UI.
+    Selection bitmaps are defined over this ordering.
+    """
+    if is_video_dataset:
+        # For video datasets, the frame_key is "video_id/fname".
+        # We sort based on the video_id, then the filename.
+        file_list.sort(key=lambda frame_key: (
+            natural_sort_key(frame_key.split('/')[0]),      # Sort by video_id
+            natural_sort_key(frame_key.split('/', 1)[1])  # Then by filename
+        ))
+    else:
+        # For image datasets, just sort by filename
+        file_list.sort(key=natural_sort_key)
+
 class AppState:
-    def __init__(self):
+    def __init__(self, initial_dataset=None):
+        # Optional "cache" section of config.json:
+        #   "preload": load all datasets in the background at startup
+        #   "max_loaded_datasets": keep at most this many datasets in memory
+        #   "max_memory_mb": keep the estimated metadata memory of loaded datasets below this
+        #   "image_cache_mb": budget for rendered frames of the active dataset (default 512)
+        #   "render_state_mb": per-dataset budget for the visualizer state of rendered frames
+        self.cache_options = {}
+        # Optional "redundancy" section of config.json: options of BaseDataset.get_redundancy_index
+        # ("area_threshold", "image_hash", "hash_threshold", "max_run_length")
+        self.redundancy_options = {}
+        # Optional "render" section of config.json:
+        #   "workers": render processes used to prefetch upcoming frames (0 disables prefetching)
+        #   "prefetch": number of upcoming frames to render ahead of navigation
+        self.render_options = {}
+        # Optional "server" section of config.json: with "enabled", metadata and renders come
+        # from a serve_metadata.py process at "address" (authenticated with "authkey" or the
+        # secret in "authkey_file", see read_authkey)
+        self.metadata_client = None
         self.datasets = self._load_datasets_from_config()
 
         if not self.datasets:
@@ -19,9 +66,19 @@ class AppState:
                 "and add your dataset paths."
             )
         
-        self.image_cache = {}
+        self.image_cache = LRUCache(
+            "image_cache", self.cache_options.get("image_cache_mb", 512) * 1024 * 1024, rendered_frame_size
+        )
+        # Frames are rendered in a worker thread while the GUI reads the cache
+        self._image_cache_lock = threading.Lock()
         self.coverage_cache = {}
-        initial_dataset_name = list(self.datasets.keys())[0]
+        self.dataset = None
+        self.current_dataset_name = None
+        # Loaded datasets, least recently used first
+        self._loaded_lru = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self.datasets}
+        initial_dataset_name = initial_dataset or list(self.datasets.keys())[0]
         # Set initial dataset and load its data (blocking)
         self.change_dataset(initial_dataset_name)
 
@@ -30,9 +87,23 @@ class AppState:
         try:
             with open("config.json") as f:
                 config = json.load(f)
-            
+
+            server_config = config.get("server", {})
+            if server_config.get("enabled"):
+                self.metadata_client = MetadataClient(
+                    server_config.get("address", DEFAULT_ADDRESS), read_authkey(server_config)
+                )
             for name, params in config.get("datasets", {}).items():
-                datasets[name] = PanopticDataset(name=name, **params)
+                if self.metadata_client is not None:
+                    datasets[name] = RemoteDataset(name, self.metadata_client, **params)
+                else:
+                    datasets[name] = PanopticDataset(name=name, **params)
+            self.cache_options = config.get("cache", {})
+            if "render_state_mb" in self.cache_options:
+                for dataset in datasets.values():
+                    dataset.render_state.max_bytes = self.cache_options["render_state_mb"] * 1024 * 1024
+            self.redundancy_options = config.get("redundancy", {})
+            self.render_options = config.get("render", {})
 
         except FileNotFoundError:
             print("Warning: config.json not found. Please create it from config.json. template and add your dataset paths.")
@@ -48,6 +119,29 @@ class AppState:
 
         return self.dataset.file_list[self.current_index]
 
+    def update_selection(self, mask, operation="add"):
+        """
+        Applies a boolean mask over the active dataset's FrameIndex rows to selected_files in one
+        step: "add" selects, "remove" deselects and "invert" toggles the frames in mask.
+        Returns the frame keys whose selection changed.
+        """
+        index = self.dataset.get_frame_index()
+        current = index.mask_for_keys(self.selected_files)
+        if operation == "add":
+            updated = current | mask
+        elif operation == "remove":
+            updated = current & ~mask
+        elif operation == "invert":
+            updated = current ^ mask
+        else:
+            raise ValueError(f"Unknown selection operation '{operation}'.")
+
+        added = index.keys_for_mask(updated & ~current)
+        removed = index.keys_for_mask(current & ~updated)
+        self.selected_files.update(added)
+        self.selected_files.difference_update(removed)
+        return added + removed
+
     def get_goal_stats(self):
         return self.dataset.get_goal_stats()
 
@@ -78,42 +172,246 @@ class AppState:
         self.current_index = 0
         self.selected_files = set()
         if hasattr(self, 'image_cache'):
-            self.image_cache.clear()
+            with self._image_cache_lock:
+                self.image_cache.clear()
         self.coverage_cache.clear()
 
-    def load_active_dataset_data(self):
+    def load_active_dataset_data(self, progress_callback=None, should_cancel=None):
         """
-        Loads data for the currently active dataset from disk.
+        Loads data for the currently active dataset from disk, unless it is already loaded and up to date.
         This is a slow, blocking operation that should be run in a background thread.
+        See PanopticDataset.load for the progress and cancellation callbacks.
         """
         if self.dataset:
-            self.dataset.load()
-            # Ensure the file list is always in a predictable, natural order
-            if hasattr(self.dataset, 'file_list') and self.dataset.file_list:
-                # For video datasets, sort by video ID first, then by frame filename
-                # to match the order in the UI's tree view.
-                if self.dataset.is_video_dataset:
-                    # For video datasets, the frame_key is "video_id/fname".
-                    # We sort based on the video_id, then the filename.
-                    self.dataset.file_list.sort(key=lambda frame_key: (
-                        natural_sort_key(frame_key.split('/')[0]),      # Sort by video_id
-                        natural_sort_key(frame_key.split('/', 1)[1])  # Then by filename
-                    ))
-                else:
-                    # For image datasets, just sort by filename
-                    self.dataset.file_list.sort(key=natural_sort_key)
-            
+            self.load_dataset(self.current_dataset_name, progress_callback, should_cancel)
+
             # Pre-populate the coverage cache for instantaneous filtering.
             # This is very fast as the dataset already calculated these values during its .load() method.
             if hasattr(self.dataset, 'coverages'):
                 self.coverage_cache = self.dataset.coverages.copy()
 
+    def apply_decoded_coverages(self, dataset_name, mismatches):
+        """Replaces annotation-derived coverages with the decoded ones found by PanopticDataset.verify_coverages."""
+        dataset = self.datasets[dataset_name]
+        # The coverages now come from the masks, so refresh() has to check those for changes
+        versions = dataset.mask_file_versions(list(mismatches))
+        for frame_key, (_, decoded) in mismatches.items():
+            dataset.coverages[frame_key] = decoded
+            dataset.annotated_coverage_keys.discard(frame_key)
+            dataset.mask_versions.setdefault(frame_key, versions[frame_key])
+            if dataset is self.dataset:
+                self.coverage_cache[frame_key] = decoded
+        dataset.invalidate_frame_index()
+
+    def is_dataset_ready(self, dataset_name):
+        """True if the dataset is loaded and its source files did not change since."""
+        dataset = self.datasets[dataset_name]
+        return dataset.is_loaded() and not dataset.is_stale()
+
+    def load_dataset(self, dataset_name, progress_callback=None, should_cancel=None):
+        """
+        Loads any configured dataset (not necessarily the active one) unless it is already
+        loaded and not stale. Safe to call from several threads: concurrent loads of the
+        same dataset wait for each other. Returns True if the dataset was (re)loaded.
+        Raises LoadCancelled if should_cancel() returns True before the load completes.
+
+        The new snapshot is published right away, so from a worker thread this must not be used
+        for the active dataset: use build_snapshot() in the worker and publish_snapshot() in the
+        GUI thread instead.
+        """
+        lock = self._load_locks[dataset_name]
+        # Another thread (e.g. the preloader) may be loading this dataset; wait, but stay cancellable
+        while not lock.acquire(timeout=0.1):
+            if should_cancel is not None and should_cancel():
+                raise LoadCancelled(dataset_name)
+        try:
+            if self.is_dataset_ready(dataset_name):
+                self._touch_loaded(dataset_name)
+                return False
+            dataset = self.datasets[dataset_name]
+            if dataset.is_loaded():
+                print(f"{dataset_name} changed on disk since it was loaded, refreshing.")
+            snapshot = self._build_snapshot(dataset, False, progress_callback, should_cancel)
+            self.publish_snapshot(dataset_name, snapshot)
+        finally:
+            lock.release()
+
+        if snapshot.is_loaded():
+            self._evict_loaded_datasets()
+        return True
+
+    def build_snapshot(self, dataset_name, full=False, progress_callback=None, should_cancel=None):
+        """
+        Loads a dataset into a new snapshot without touching the published one, which stays usable
+        (e.g. by the GUI) meanwhile. Loaded datasets are refreshed incrementally unless full is set.
+        Hand the result to publish_snapshot(). Safe to call from a worker thread.
+        """
+        lock = self._load_locks[dataset_name]
+        while not lock.acquire(timeout=0.1):
+            if should_cancel is not None and should_cancel():
+                raise LoadCancelled(dataset_name)
+        try:
+            return self._build_snapshot(self.datasets[dataset_name], full, progress_callback, should_cancel)
+        finally:
+            lock.release()
+
+    def _build_snapshot(self, dataset, full, progress_callback, should_cancel):
+        snapshot = dataset.snapshot()
+        if dataset.is_loaded() and not full:
+            # Only new, removed and changed frames are processed again
+            snapshot.refresh(progress_callback, should_cancel)
+        else:
+            snapshot.load(progress_callback, should_cancel)
+        # Ensure the file list is always in a predictable, natural order
+        if snapshot.file_list:
+            # For video datasets, sort by video ID first, then by frame filename
+            # to match the order in the UI's tree view.
+            sort_frame_keys(snapshot.file_list, snapshot.is_video_dataset)
+            snapshot.invalidate_frame_index()
+            # Near-duplicate runs and per-video aggregates are built here, off the GUI thread
+            if snapshot.is_video_dataset:
+                snapshot.get_redundancy_index(**self.redundancy_options)
+                snapshot.get_video_index()
+            # Lets the cross-dataset dashboard read this dataset's statistics without loading it
+            snapshot.store_summary()
+        return snapshot
+
+    def publish_snapshot(self, dataset_name, snapshot):
+        """
+        Replaces a dataset by a snapshot from build_snapshot() in one step. If it is the active
+        dataset, selections and the current frame carry over by frame key; call this from the
+        thread that reads the state (the GUI thread) in that case.
+        """
+        previous = self.datasets[dataset_name]
+        if snapshot.is_loaded():
+            # Published snapshots count as loaded datasets for the cache limits
+            self._touch_loaded(dataset_name)
+        if previous is not self.dataset:
+            self.datasets[dataset_name] = snapshot
+            return
+
+        current_key = self.current_filename()
+        key_to_row = snapshot.get_frame_index().key_to_row
+        self.datasets[dataset_name] = snapshot
+        self.dataset = snapshot
+        self.selected_files = {frame_key for frame_key in self.selected_files if frame_key in key_to_row}
+        self.current_index = key_to_row.get(current_key, min(self.current_index, max(len(snapshot.file_list) - 1, 0)))
+        self.coverage_cache = snapshot.coverages.copy()
+        # Frames may have changed; renders of the previous snapshot are not reused
+        with self._image_cache_lock:
+            self.image_cache.clear()
+
+    def compare_selection(self, dataset_name, selected_files=None):
+        """
+        Compares a selection of any configured dataset with the whole dataset without loading it
+        or changing the active dataset: statistics come from the loaded dataset if it is up to
+        date, else from the DatasetSummary in its metadata cache. selected_files defaults to the
+        dataset's saved selection file. Safe to call from worker threads.
+
+        Returns (SelectionComparison or None if no statistics are available, description of the sources).
+        """
+        dataset = self.datasets[dataset_name]
+        if self.is_dataset_ready(dataset_name):
+            summary, source = DatasetSummary(dataset), "loaded"
+        else:
+            summary, source = dataset.cached_summary(), "metadata cache"
+        if summary is None:
+            return None, "not loaded and not in the metadata cache (needs 'metadata_dir' and one load)"
+
+        if selected_files is None:
+            path = selection_file_path(dataset_name)
+            selected_files = []
+            if not os.path.exists(path):
+                source += ", no saved selection"
+            else:
+                try:
+                    selected_files, _ = read_selection_file(path)
+                    source += ", saved selection"
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Could not read selection file {path}. Error: {e}")
+                    source += ", unreadable selection file"
+        else:
+            source += ", current selection"
+        return summary.compare(selected_files), source
+
+    def get_redundancy_index(self):
+        """Near-duplicate runs of the active dataset, with the options from config.json."""
+        return self.dataset.get_redundancy_index(**self.redundancy_options)
+
+    def can_preload_more(self):
+        """False once preloading another dataset would exceed the configured count cap."""
+        max_loaded = self.cache_options.get("max_loaded_datasets")
+        with self._lru_lock:
+            return max_loaded is None or len(self._loaded_lru) < max_loaded
+
+    def _touch_loaded(self, dataset_name):
+        with self._lru_lock:
+            self._loaded_lru[dataset_name] = True
+            self._loaded_lru.move_to_end(dataset_name)
+
+    def _evict_loaded_datasets(self):
+        """Unloads least recently used datasets (never the active one) until the configured caps hold."""
+        max_loaded = self.cache_options.get("max_loaded_datasets")
+        max_memory_mb = self.cache_options.get("max_memory_mb")
+        if max_loaded is None and max_memory_mb is None:
+            return
+
+        with self._lru_lock:
+            loaded = list(self._loaded_lru)
+        memory = {name: self.datasets[name].estimate_memory_bytes() for name in loaded} if max_memory_mb is not None else {}
+
+        for name in list(loaded):
+            too_many = max_loaded is not None and len(loaded) > max_loaded
+            too_big = max_memory_mb is not None and sum(memory[n] for n in loaded) > max_memory_mb * 1024 * 1024
+            if not (too_many or too_big):
+                break
+            if name == self.current_dataset_name:
+                continue
+            # Skip datasets that are being loaded right now
+            if not self._load_locks[name].acquire(blocking=False):
+                continue
+            try:
+                self.datasets[name].reset()
+            finally:
+                self._load_locks[name].release()
+            with self._lru_lock:
+                self._loaded_lru.pop(name, None)
+            loaded.remove(name)
+            print(f"Unloaded {name} to stay within the dataset cache limits.")
+
+    def get_cached_frame(self, fname):
+        """(original, mask, labels) of an already rendered frame of the active dataset, or None."""
+        with self._image_cache_lock:
+            return self.image_cache.get(fname)
+
+    def render_frame(self, fname, dataset=None):
+        """
+        Renders a frame (or returns it from the cache). Safe to call from a worker thread:
+        dataset pins the dataset the request was made for, and results are only cached
+        if it is still the active one.
+        """
+        dataset = dataset or self.dataset
+        if dataset is self.dataset:
+            cached = self.get_cached_frame(fname)
+            if cached is not None:
+                return cached
+
+        result = dataset.load_image(fname)
+        with self._image_cache_lock:
+            if dataset is self.dataset:
+                self.image_cache[fname] = result
+        return result
+
+    def store_rendered_frame(self, fname, frame, dataset):
+        """Caches a frame rendered elsewhere (e.g. by the render worker processes) if dataset is still active."""
+        with self._image_cache_lock:
+            if dataset is self.dataset:
+                self.image_cache[fname] = frame
+
     def _load_and_cache_image(self, fname):
         if not fname:
             return None, None, [], None
-        if fname not in self.image_cache:
-            self.image_cache[fname] = self.dataset.load_image(fname)
-        return self.image_cache[fname]
+        return self.render_frame(fname)
 
     def get_original_image(self, fname=None):
         fname = fname or self.current_filename()
@@ -0,0 +1,137 @@
+import numpy as np
+
+
+class DistributionSampler:
+    """
+    Picks a subset of frames whose category frequency/area distribution matches a target.
+
+    Each frame is a sparse vector over 2*C features: its per-category segment counts and
+    areas, each normalized by the dataset totals and weighted by (1 - area_weight) and
+    area_weight. For a subset of K frames the target vector is K/N times the full-dataset
+    vector (the goal distribution) or a user-given category distribution with the same mass.
+
+    The sampler minimizes ||sum(x_i) - target||^2 greedily. Adding frame x to the running
+    sum c changes the objective by ||x||^2 - 2 x.(target - c), so every step scores all
+    candidates with one sparse mat-vec and adds the best batch of them. Batches shrink as
+    the selection fills up, so the cost is a few dozen passes over the non-zero entries.
+    """
+
+    def __init__(self, index, area_weight=0.5, target=None):
+        """
+        index: FrameIndex of the dataset.
+        area_weight: 0 matches only frequencies, 1 only areas.
+        target: optional {category_id: weight} distribution to match instead of the full dataset's.
+        """
+        if not 0.0 <= area_weight <= 1.0:
+            raise ValueError("area_weight must be between 0 and 1.")
+
+        self.index = index
+        self.area_weight = area_weight
+
+        goal_counts = index.category_totals(values="count")
+        goal_areas = index.category_totals(values="area")
+        count_scale = (1.0 - area_weight) / goal_counts.sum() if goal_counts.sum() > 0 else 0.0
+        area_scale = area_weight / goal_areas.sum() if goal_areas.sum() > 0 else 0.0
+
+        # Per-entry feature values, in the same order as index.entry_frame/entry_cat
+        self.entry_count_value = index.entry_count * count_scale
+        self.entry_area_value = index.entry_area * area_scale
+
+        self.goal_count_vector = goal_counts * count_scale
+        self.goal_area_vector = goal_areas * area_scale
+        if target:
+            weights = np.zeros(index.num_categories, dtype=np.float64)
+            for cat_id, weight in target.items():
+                column = index.category_columns([cat_id])[0]
+                if column < 0:
+                    raise ValueError(f"Target category {cat_id} does not occur in the dataset.")
+                weights[column] = weight
+            if weights.sum() <= 0:
+                raise ValueError("Target distribution must have a positive total weight.")
+            shares = weights / weights.sum()
+            self.goal_count_vector = shares * self.goal_count_vector.sum()
+            self.goal_area_vector = shares * self.goal_area_vector.sum()
+
+        # ||x_i||^2 for every frame
+        self.frame_sq_norm = np.bincount(
+            index.entry_frame,
+            weights=self.entry_count_value ** 2 + self.entry_area_value ** 2,
+            minlength=index.num_frames
+        )
+
+    def _feature_sums(self, mask):
+        count_sum = np.bincount(self.index.entry_cat, weights=self.entry_count_value * mask[self.index.entry_frame],
+                                minlength=self.index.num_categories)
+        area_sum = np.bincount(self.index.entry_cat, weights=self.entry_area_value * mask[self.index.entry_frame],
+                               minlength=self.index.num_categories)
+        return count_sum, area_sum
+
+    def divergence(self, mask):
+        """
+        Total variation distance between the subset's category distributions and the target,
+        averaged over the frequency and area parts (weighted by area_weight). 0 is a perfect match.
+        """
+        count_sum, area_sum = self._feature_sums(mask)
+
+        def tv(values, goal):
+            if values.sum() <= 0 or goal.sum() <= 0:
+                return 1.0 if goal.sum() > 0 else 0.0
+            return 0.5 * np.abs(values / values.sum() - goal / goal.sum()).sum()
+
+        return float((1.0 - self.area_weight) * tv(count_sum, self.goal_count_vector)
+                     + self.area_weight * tv(area_sum, self.goal_area_vector))
+
+    def sample(self, k, seed=None, candidates=None, batch_fraction=0.1):
+        """
+        Returns a boolean mask over index rows with k frames selected.
+
+        seed: optional boolean mask of frames that are always kept (e.g. the current selection).
+              If it already holds k or more frames it is returned unchanged.
+        candidates: optional boolean mask restricting which frames may be added.
+        batch_fraction: share of the remaining frames added per greedy step (smaller is more exact).
+        """
+        n = self.index.num_frames
+        selected = np.zeros(n, dtype=bool) if seed is None else seed.copy()
+        available = np.ones(n, dtype=bool) if candidates is None else candidates.copy()
+        available &= ~selected
+
+        k = min(k, int(selected.sum() + available.sum()))
+        target_scale = k / n if n else 0.0
+        target_count = self.goal_count_vector * target_scale
+        target_area = self.goal_area_vector * target_scale
+        count_sum, area_sum = self._feature_sums(selected)
+
+        entry_frame = self.index.entry_frame
+        entry_cat = self.index.entry_cat
+
+        remaining = k - int(selected.sum())
+        while remaining > 0:
+            count_gap = target_count - count_sum
+            area_gap = target_area - area_sum
+            gain = np.bincount(
+                entry_frame,
+                weights=self.entry_count_value * count_gap[entry_cat] + self.entry_area_value * area_gap[entry_cat],
+                minlength=n
+            )
+            score = 2.0 * gain - self.frame_sq_norm
+            score[~available] = -np.inf
+
+            batch = max(1, min(remaining, int(remaining * batch_fraction)))
+            if batch < available.sum():
+                chosen = np.argpartition(-score, batch - 1)[:batch]
+            else:
+                chosen = np.flatnonzero(available)[:batch]
+            chosen = chosen[available[chosen]]
+            if chosen.size == 0:
+                break
+
+            selected[chosen] = True
+            available[chosen] = False
+            chosen_mask = np.zeros(n, dtype=bool)
+            chosen_mask[chosen] = True
+            added_count, added_area = self._feature_sums(chosen_mask)
+            count_sum += added_count
+            area_sum += added_area
+            remaining -= chosen.size
+
+        return selected